@@ -0,0 +1,194 @@
+"""
+Cached file catalogs of the InkML dataset directories (CROHME, MathWriting+).
+
+Listing and sorting a split directory on every call is slow for the large
+splits (143 K files in MathWriting+ Train), so each directory gets a
+catalog in data/catalogs/:
+
+  {"version": 1, "directory": "MathWriting+/Train", "suffix": ".inkml",
+   "mtime_ns": <directory mtime>,
+   "files": [{"name": "000a.inkml", "size": 2345, "mtime_ns": ..., "hash": "<blake2b>"}, ...]}
+
+The catalog is trusted while the directory mtime is unchanged (adding,
+removing or renaming files changes it), so a lookup is one stat plus, once
+per process, reading the catalog. Otherwise the directory is scanned again
+and only new or changed files are hashed, on a process pool. Files edited in
+place do not touch the directory mtime: pass refresh=True (to get_catalog,
+catalog_files or the file managers) to re-stat them. If data/catalogs/ is
+not writable, the catalog is only kept in memory for the process.
+
+catalog_files() returns the sorted paths of one or more directories, or a
+deterministic sample of them (sample_n, seed) drawn from the catalog.
+"""
+
+import hashlib
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+CATALOG_DIR = DATA_DIR / "catalogs"
+CATALOG_VERSION = 1
+
+_DIGEST_SIZE = 16
+_READ_SIZE = 1 << 20
+
+# directory → Catalog, reused while the directory mtime is unchanged
+_loaded: dict = {}
+
+
+class Catalog:
+    """Files of one directory, sorted by name, with size, mtime and content hash."""
+
+    def __init__(self, directory: Path, suffix: str, mtime_ns: int, files: list):
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.mtime_ns = mtime_ns
+        self.files = files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __repr__(self):
+        return f"Catalog({str(self.directory)!r}, {len(self.files)} files)"
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.files)
+
+    def paths(self) -> list[str]:
+        directory = str(self.directory)
+        return [os.path.join(directory, entry["name"]) for entry in self.files]
+
+    def to_dict(self) -> dict:
+        try:
+            directory = self.directory.relative_to(DATA_DIR).as_posix()
+        except ValueError:
+            directory = str(self.directory)
+        return {"version": CATALOG_VERSION, "directory": directory, "suffix": self.suffix,
+                "mtime_ns": self.mtime_ns, "files": self.files}
+
+
+def file_hash(path) -> str:
+    """Hex blake2b digest of a file's content."""
+    hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(path, "rb") as f:
+        while chunk := f.read(_READ_SIZE):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _hash_files(paths: list[str], workers: int) -> list[str]:
+    if workers == 0 or len(paths) <= 1:
+        return [file_hash(p) for p in paths]
+    n_workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(file_hash, paths, chunksize=max(1, len(paths) // (4 * n_workers))))
+
+
+def _catalog_path(directory: Path, suffix: str) -> Path:
+    try:
+        key = directory.relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        key = directory.as_posix().strip("/")
+    return CATALOG_DIR / (key.replace("/", "__") + suffix.replace(".", "_") + ".json")
+
+
+def _read_catalog(path: Path, directory: Path, suffix: str) -> Catalog | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(d, dict) or d.get("version") != CATALOG_VERSION or d.get("suffix") != suffix:
+        return None
+    return Catalog(directory, suffix, d["mtime_ns"], d["files"])
+
+
+def _write_catalog(catalog: Catalog, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(catalog.to_dict(), f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _scan(directory: Path, suffix: str, dir_mtime_ns: int, stored: Catalog | None, workers: int) -> Catalog:
+    """Re-list a directory, hashing only files that are new or changed since `stored`."""
+    known = {entry["name"]: entry for entry in stored.files} if stored is not None else {}
+    entries, stale = [], []
+    with os.scandir(directory) as it:
+        for dirent in it:
+            if not dirent.name.endswith(suffix) or not dirent.is_file():
+                continue
+            st = dirent.stat()
+            entry = known.get(dirent.name)
+            if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+                entry = {"name": dirent.name, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": None}
+                stale.append(entry)
+            entries.append(entry)
+    hashes = _hash_files([os.path.join(directory, entry["name"]) for entry in stale], workers)
+    for entry, digest in zip(stale, hashes):
+        entry["hash"] = digest
+    entries.sort(key=lambda entry: entry["name"])
+    return Catalog(directory, suffix, dir_mtime_ns, entries)
+
+
+def get_catalog(directory, suffix: str = ".inkml", workers: int = None, refresh: bool = False) -> Catalog:
+    """
+    Up-to-date catalog of the `suffix` files directly inside a directory.
+
+    Parameters
+    ----------
+    directory: Split directory.
+    suffix:    File name suffix of the catalogued files.
+    workers:   Worker processes for hashing (None: CPU count, 0: in this process).
+    refresh:   Re-stat every file even if the directory mtime is unchanged.
+
+    Raises FileNotFoundError if the directory does not exist.
+    """
+    directory = Path(directory).resolve()
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Directory not found: {directory}")
+    dir_mtime_ns = directory.stat().st_mtime_ns
+
+    key = (str(directory), suffix)
+    catalog = _loaded.get(key)
+    catalog_path = _catalog_path(directory, suffix)
+    if catalog is None:
+        catalog = _read_catalog(catalog_path, directory, suffix)
+    if catalog is None or catalog.mtime_ns != dir_mtime_ns or refresh:
+        catalog = _scan(directory, suffix, dir_mtime_ns, catalog, workers)
+        try:
+            _write_catalog(catalog, catalog_path)
+        except OSError:
+            pass  # read-only or shared data/: keep the catalog in memory only
+    _loaded[key] = catalog
+    return catalog
+
+
+def sample_indices(total: int, sample_n: int, seed: int = 0) -> list[int]:
+    """Sorted indices of a deterministic sample of sample_n out of total items."""
+    if sample_n >= total:
+        return list(range(total))
+    return sorted(random.Random(seed).sample(range(total), sample_n))
+
+
+def catalog_files(directories, suffix: str = ".inkml", sample_n: int = None, seed: int = 0,
+                  refresh: bool = False) -> list[str]:
+    """
+    Paths of the catalogued files of several directories, directory by
+    directory and sorted by name within each.
+
+    With sample_n, a sample of that many paths drawn with random.Random(seed)
+    over all directories, kept in catalog order; the same catalogs and seed
+    always give the same sample. refresh re-stats every file (see get_catalog).
+    """
+    files = []
+    for directory in directories:
+        files.extend(get_catalog(directory, suffix, refresh=refresh).paths())
+    if sample_n is None:
+        return files
+    return [files[i] for i in sample_indices(len(files), sample_n, seed)]
@@ -2,6 +2,8 @@
 
 import os
 
+from datasets.catalog import catalog_files
+
 
 # data/ folder lives one level above datasets/ (at project root)
 _project_root = os.path.dirname(os.path.dirname(__file__))
@@ -34,61 +36,66 @@ warning_str = '\033[93m' + "Warning:" + '\033[0m'
 
 class CrohmeFileManager:
     @staticmethod
-    def get_train_files():
+    def get_train_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
         print(f"[CrohmeFileManager] {warning_str} Loading all train files. Some files are broken. Use get_real_train_files() to get better results.")
-        return CrohmeFileManager.get_artificial_train_files() + CrohmeFileManager.get_real_train_files()
+        print(f"[CrohmeFileManager] {warning_str} Loading artificial train files. Most of them are broken.")
+        return CrohmeFileManager.get_files_from_paths(artificial_train_paths + real_train_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_artificial_train_files():
+    def get_artificial_train_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
         print(f"[CrohmeFileManager] {warning_str} Loading artificial train files. Most of them are broken.")
-        return CrohmeFileManager.get_files_from_paths(artificial_train_paths)
+        return CrohmeFileManager.get_files_from_paths(artificial_train_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_artificial_train_files_2019():
+    def get_artificial_train_files_2019(sample_n: int = None, seed: int = 0, refresh: bool = False):
         print(f"[CrohmeFileManager] {warning_str} Loading artificial train files. Most of them are broken.")
-        return CrohmeFileManager.get_files_from_paths([artificial_train_paths[0]])
+        return CrohmeFileManager.get_files_from_paths([artificial_train_paths[0]], sample_n, seed, refresh)
 
     @staticmethod
-    def get_artificial_train_files_2023():
+    def get_artificial_train_files_2023(sample_n: int = None, seed: int = 0, refresh: bool = False):
         print(f"[CrohmeFileManager] {warning_str} Loading artificial train files. Most of them are broken.")
-        return CrohmeFileManager.get_files_from_paths([artificial_train_paths[1]])
+        return CrohmeFileManager.get_files_from_paths([artificial_train_paths[1]], sample_n, seed, refresh)
 
     @staticmethod
-    def get_syntatic_train_files():
+    def get_syntatic_train_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
         """ Those files are labeled inaccurately but the trace groups are correct. It can be used for segmentation """
         print(f"[CrohmeFileManager] {warning_str} Loading syntatic train files. They have no relation graph.")
-        return CrohmeFileManager.get_files_from_paths(syntatic_artificial_train_paths)
+        return CrohmeFileManager.get_files_from_paths(syntatic_artificial_train_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_real_train_files():
+    def get_real_train_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
         """ Those files are labeled accurately """
-        return CrohmeFileManager.get_files_from_paths(real_train_paths)
+        return CrohmeFileManager.get_files_from_paths(real_train_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_val_files():
-        return CrohmeFileManager.get_files_from_paths(val_paths)
+    def get_val_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
+        return CrohmeFileManager.get_files_from_paths(val_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_test_files():
-        return CrohmeFileManager.get_files_from_paths(test_paths)
+    def get_test_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
+        return CrohmeFileManager.get_files_from_paths(test_paths, sample_n, seed, refresh)
 
     @staticmethod
-    def get_2016test_files():
-        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "val", 'CROHME2016_test')])
+    def get_2016test_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
+        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "val", 'CROHME2016_test')], sample_n, seed, refresh)
 
     @staticmethod
-    def get_2019test_files():
-        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "test", "CROHME2019_test")])
+    def get_2019test_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
+        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "test", "CROHME2019_test")], sample_n, seed, refresh)
 
     @staticmethod
-    def get_2023test_files():
-        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "test", "CROHME2023_test")])
+    def get_2023test_files(sample_n: int = None, seed: int = 0, refresh: bool = False):
+        return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "test", "CROHME2023_test")], sample_n, seed, refresh)
 
     @staticmethod
-    def get_files_from_paths(paths):
-        files = []
+    def get_files_from_paths(paths, sample_n: int = None, seed: int = 0, refresh: bool = False):
+        """
+        .inkml files of the given directories from their cached catalogs
+        (datasets/catalog.py), sorted by name within each directory. With
+        sample_n, a deterministic sample of that many files for the seed.
+        refresh re-stats files that may have been edited in place.
+        """
         for path in paths:
             if not os.path.isdir(path):
                 raise FileNotFoundError(f"Path {path} does not exist")
-            files += [os.path.join(path, file) for file in os.listdir(path) if file.endswith('.inkml')]
-        return files
+        return catalog_files(paths, sample_n=sample_n, seed=seed, refresh=refresh)
@@ -34,6 +34,63 @@ from ink.nodes.row_node import RowNode
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 
+def _stroke_splits(pen_up: np.ndarray) -> np.ndarray:
+    """Split indices of the physical strokes: a stroke ends at each pen_up == 1."""
+    return np.flatnonzero(pen_up[:-1] == 1) + 1
+
+
+def _majority_labels(char_lab: np.ndarray, seg_ids: np.ndarray) -> np.ndarray:
+    """
+    Most frequent char label of every segment, ties going to the label seen
+    first in the segment (as Counter.most_common).
+    """
+    # (segment, label) groups; the stable sort keeps points in order within them
+    order = np.lexsort((char_lab, seg_ids))
+    s, c = seg_ids[order], char_lab[order]
+    starts = np.ones(len(order), dtype=bool)
+    starts[1:] = (s[1:] != s[:-1]) | (c[1:] != c[:-1])
+    counts = np.bincount(np.cumsum(starts) - 1)
+    first, group_seg, group_lab = order[starts], s[starts], c[starts]
+
+    # per segment: highest count, then earliest first point
+    best = np.lexsort((first, -counts, group_seg))
+    head = np.ones(len(best), dtype=bool)
+    head[1:] = group_seg[best][1:] != group_seg[best][:-1]
+    return group_lab[best[head]]
+
+
+def _sample_to_row(stroke_data: np.ndarray, char_lab: np.ndarray, alphabet: list) -> RowNode | None:
+    """RowNode of one sample, or None if it has no points."""
+    n = len(stroke_data)
+    if n == 0:
+        return None
+
+    # Reconstruct absolute coordinates
+    x = np.cumsum(stroke_data[:, 0].astype(float))
+    y = np.cumsum(stroke_data[:, 1].astype(float))
+
+    # Group into physical strokes by pen_up flag (1 = pen lifted after this point)
+    splits = _stroke_splits(stroke_data[:, 2])
+    seg_ids = np.zeros(n, dtype=np.int64)
+    seg_ids[splits] = 1
+    np.cumsum(seg_ids, out=seg_ids)
+
+    # A character = consecutive strokes sharing the same majority char_label
+    majority = _majority_labels(np.asarray(char_lab[:n]).astype(np.int64), seg_ids)
+    run_starts = np.flatnonzero(np.r_[True, majority[1:] != majority[:-1]])
+    run_ends = np.r_[run_starts[1:], len(majority)]
+
+    bounds = [0, *splits.tolist(), n]
+    x, y = x.tolist(), y.tolist()
+    symbols = []
+    for a, b in zip(run_starts.tolist(), run_ends.tolist()):
+        char_idx = int(majority[a])
+        char_label = alphabet[char_idx] if char_idx < len(alphabet) else ''
+        traces = [Trace(x[bounds[k]:bounds[k + 1]], y[bounds[k]:bounds[k + 1]], inkml_id=k) for k in range(a, b)]
+        symbols.append(SymbolNode(trace_group=TraceGroup(traces=traces, label=char_label)))
+    return RowNode(children=symbols)
+
+
 def _npz_to_row_nodes(npz_path) -> list[RowNode]:
     d = np.load(str(npz_path), allow_pickle=True)
     strokes_arr = d['strokes']        # object array
@@ -41,66 +98,10 @@ def _npz_to_row_nodes(npz_path) -> list[RowNode]:
     alphabet = list(d['alphabet'])
 
     rows = []
-    for sample_idx in range(len(strokes_arr)):
-        stroke_data = strokes_arr[sample_idx]   # (N, 3): dx, dy, pen_up
-        char_lab = char_labels_arr[sample_idx]  # (N,) int32
-
-        if len(stroke_data) == 0:
-            continue
-
-        # Reconstruct absolute coordinates
-        dx = stroke_data[:, 0].astype(float)
-        dy = stroke_data[:, 1].astype(float)
-        x = np.cumsum(dx)
-        y = np.cumsum(dy)
-        pen_up = stroke_data[:, 2]  # 1 = pen lifted after this point
-
-        # Group into physical strokes by pen_up flag
-        stroke_segs: list[tuple[list, list, list]] = []  # (x_pts, y_pts, char_ids)
-        seg_x, seg_y, seg_c = [], [], []
-        for i in range(len(x)):
-            seg_x.append(float(x[i]))
-            seg_y.append(float(y[i]))
-            seg_c.append(int(char_lab[i]))
-            if pen_up[i] == 1 or i == len(x) - 1:
-                if seg_x:
-                    stroke_segs.append((seg_x, seg_y, seg_c))
-                seg_x, seg_y, seg_c = [], [], []
-
-        # Group strokes into characters by dominant char label
-        # A character = consecutive strokes sharing the same majority char_label
-        char_to_strokes: dict[tuple, list] = {}
-        # Use (char_idx, occurrence) to handle repeated chars; track by run
-        char_runs: list[tuple[int, list]] = []
-        for sx, sy, sc in stroke_segs:
-            if not sc:
-                continue
-            # majority vote
-            from collections import Counter
-            majority = Counter(sc).most_common(1)[0][0]
-            if char_runs and char_runs[-1][0] == majority:
-                char_runs[-1][1].append((sx, sy))
-            else:
-                char_runs.append((majority, [(sx, sy)]))
-
-        if not char_runs:
-            continue
-
-        symbols = []
-        trace_id = 0
-        for char_idx, strk_list in char_runs:
-            char_label = alphabet[char_idx] if char_idx < len(alphabet) else ''
-            traces = []
-            for sx, sy in strk_list:
-                traces.append(Trace(sx, sy, inkml_id=trace_id))
-                trace_id += 1
-            if traces:
-                tg = TraceGroup(traces=traces, label=char_label)
-                symbols.append(SymbolNode(trace_group=tg))
-
-        if symbols:
-            rows.append(RowNode(children=symbols))
-
+    for stroke_data, char_lab in zip(strokes_arr, char_labels_arr):
+        row = _sample_to_row(stroke_data, char_lab, alphabet)
+        if row is not None:
+            rows.append(row)
     return rows
 
 
@@ -7,13 +7,19 @@ We extract Word-level traceView groups and return one RowNode per word.
 The trace format uses multi-channel differential encoding (X, Y, T, F) as
 defined in the W3C InkML spec, section 7.  First point is absolute; subsequent
 points use first-difference (') and second-difference (") notation.
+All traces of a page are tokenised with one regex each and decoded together
+with NumPy.
 """
 
 import re
 import sys
 import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import xml.etree.ElementTree as ET
@@ -28,127 +34,221 @@ from ink.nodes.row_node import RowNode
 # Trace decoder (multi-channel differential IAMonDo format)
 # ---------------------------------------------------------------------------
 
-def _decode_trace(trace_str: str, total_channels: int = 4, x_idx: int = 0, y_idx: int = 1):
-    """Decode a multi-channel differential InkML trace string → list of (x,y)."""
-    tokens = re.findall(r"['\"]?-?\d+(?:\.\d+)?", trace_str.replace('\n', ' '))
-
-    values = [0.0] * total_channels
-    deltas = [0.0] * total_channels
-    results = []
-    ch = 0
-    first = True
-
-    for tok in tokens:
-        if tok.startswith('"'):
-            d2 = float(tok[1:])
-            d = deltas[ch] + d2
-            values[ch] += d
-            deltas[ch] = d
-        elif tok.startswith("'"):
-            d = float(tok[1:])
-            values[ch] += d
-            deltas[ch] = d
-        else:
-            val = float(tok)
-            if first:
-                values[ch] = val
-                deltas[ch] = 0.0
-            else:
-                values[ch] += val
-                deltas[ch] = val
+# one token per channel value: optional ' / " prefix, then the number
+_TOKEN = re.compile(r"['\"]?-?\d+(?:\.\d+)?")
+_UNQUOTE = str.maketrans("'\"", "  ")
+_QUOTE, _DOUBLE_QUOTE = ord("'"), ord('"')
+
+
+def _segmented_accumulate(values: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """
+    Running sums restarting wherever start is set (start[0] must be set).
+
+    Each segment is one row of a zero-padded block summed with
+    np.add.accumulate, so the additions happen left to right as in a Python
+    loop and the floats round identically. Segments are grouped by length
+    (powers of two), so the padding at most doubles a block.
+    """
+    bounds = np.flatnonzero(start)
+    lengths = np.diff(np.append(bounds, len(values)))
+    out = np.empty_like(values)
+    buckets = np.ceil(np.log2(lengths)).astype(np.int64)
+    for bucket in np.unique(buckets).tolist():
+        rows = np.flatnonzero(buckets == bucket)
+        columns = np.arange(lengths[rows].max())
+        index = bounds[rows, None] + columns
+        valid = columns < lengths[rows, None]
+        block = np.where(valid, values[np.where(valid, index, 0)], 0.0)
+        np.add.accumulate(block, axis=1, out=block)
+        out[index[valid]] = block[valid]
+    return out
+
+
+def _decode_channel(values, kinds, first) -> np.ndarray:
+    """
+    Absolute values of one channel (points of all traces, trace-major).
 
-        ch += 1
-        if ch == total_channels:
-            ch = 0
-            first = False
-            results.append((values[x_idx], values[y_idx]))
+    Per trace, value and velocity start at 0.0: a plain first value is
+    absolute, later plain and ' values set the velocity, " values add to it,
+    and every point adds the velocity to the value.
+    """
+    absolute = first & (kinds == 0)
+    # "0.0 +" is the addition to the initial state (it turns -0.0 into 0.0)
+    steps = np.where(absolute, 0.0, np.where(first & (kinds == 2), 0.0 + values, values))
+    velocity = _segmented_accumulate(steps, first | (kinds != 2))
+    return _segmented_accumulate(np.where(first, np.where(absolute, values, 0.0 + velocity), velocity), first)
 
-    return results
+
+def _decode_traces(texts: list[str], total_channels: int = 4, x_idx: int = 0, y_idx: int = 1):
+    """Decode multi-channel differential InkML trace strings → list of (x list, y list)."""
+    tokens = [_TOKEN.findall(text) for text in texts]
+    counts = np.array([len(t) for t in tokens], dtype=np.int64)
+    flat = [token for trace_tokens in tokens for token in trace_tokens]
+    if not flat:
+        return [([], []) for _ in texts]
+    joined = " ".join(flat)
+    values = np.array(joined.translate(_UNQUOTE).split(), dtype=np.float64)
+    # kind of every token from its first byte: 0 plain, 1 first difference ', 2 second difference "
+    q = np.frombuffer(joined.encode("utf-8"), dtype=np.uint8)
+    prefix = q[np.concatenate(([0], np.flatnonzero(q == ord(" ")) + 1))]
+    kinds = ((prefix == _QUOTE) + 2 * (prefix == _DOUBLE_QUOTE)).astype(np.int8)
+
+    trace_of = np.repeat(np.arange(len(texts)), counts)
+    within = np.arange(len(values)) - (np.cumsum(counts) - counts)[trace_of]
+    rows = counts // total_channels
+    row, channel = within // total_channels, within % total_channels
+    complete = row < rows[trace_of]  # tokens of an unfinished last point are dropped
+
+    decoded = []
+    for c in (x_idx, y_idx):
+        sel = complete & (channel == c)
+        decoded.append(_decode_channel(values[sel], kinds[sel], row[sel] == 0) if sel.any() else np.zeros(0))
+    xs, ys = decoded[0].tolist(), decoded[1].tolist()
+    ends = np.cumsum(rows).tolist()
+    return [(xs[a:b], ys[a:b]) for a, b in zip([0] + ends, ends)]
+
+
+def _decode_trace(trace_str: str, total_channels: int = 4, x_idx: int = 0, y_idx: int = 1):
+    """Decode a multi-channel differential InkML trace string → list of (x,y)."""
+    x, y = _decode_traces([trace_str], total_channels, x_idx, y_idx)[0]
+    return list(zip(x, y))
 
 
 # ---------------------------------------------------------------------------
 # XML parser for IAMonDo page-level InkML
 # ---------------------------------------------------------------------------
 
-def _load_iamondb_file(path) -> list[RowNode]:
-    """Parse one IAMonDo InkML file → list of RowNode (one per Word segment)."""
-    tree = ET.parse(str(path))
-    root = tree.getroot()
+def _local(tag: str) -> str:
+    return tag.split('}')[-1] if '}' in tag else tag
 
-    # Collect all traces by id
-    traces_by_id: dict[str, list[tuple[float, float]]] = {}
+
+def _read_iamondb_words(path) -> list[tuple[str, list]]:
+    """Parse one IAMonDo InkML file → [(transcription, [(x list, y list), ...])] per Word."""
+    root = ET.parse(str(path)).getroot()
+
+    # Trace texts by id; only traces referenced by a word are decoded
+    texts_by_id: dict[str, str] = {}
     XML_NS = '{http://www.w3.org/XML/1998/namespace}'
     for elem in root.iter():
-        tag = elem.tag.split('}')[-1] if '}' in elem.tag else elem.tag
-        if tag == 'trace':
+        if _local(elem.tag) == 'trace':
             tid = (elem.get(f'{XML_NS}id') or elem.get('id')
                    or elem.get('{http://www.w3.org/2003/InkML}id') or '')
             if tid and elem.text:
-                pts = _decode_trace(elem.text.strip())
-                if pts:
-                    traces_by_id[tid] = pts
+                texts_by_id[tid] = elem.text
 
-    def _extract_word_rows(node, depth=0) -> list[RowNode]:
-        """Recursively walk traceView tree, emit RowNode at Word level."""
-        tag = node.tag.split('}')[-1] if '}' in node.tag else node.tag
-        if tag not in ('traceView', 'ink'):
-            return []
+    # Walk the traceView tree in document order, collecting Word segments
+    words = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if _local(node.tag) not in ('traceView', 'ink'):
+            continue
 
-        # Determine annotation type
         ann_type = ''
         transcript = ''
         for child in node:
-            child_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            if child_tag == 'annotation':
+            if _local(child.tag) == 'annotation':
                 if child.get('type') == 'type':
                     ann_type = (child.text or '').strip()
                 elif child.get('type') == 'transcription':
                     transcript = (child.text or '').strip()
 
-        # Word → collect all child trace refs and build RowNode
-        if ann_type == 'Word':
-            trace_refs = []
-            for child in node:
-                child_tag = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-                if child_tag == 'traceView':
-                    ref = child.get('traceDataRef', '')
-                    if ref.startswith('#'):
-                        ref = ref[1:]
-                    if ref in traces_by_id:
-                        trace_refs.append(ref)
-
-            if not trace_refs:
-                return []
-
-            # Build a single SymbolNode with all traces for the word
-            traces = []
-            for i, ref in enumerate(trace_refs):
-                pts = traces_by_id[ref]
-                x = [p[0] for p in pts]
-                y = [p[1] for p in pts]
-                traces.append(Trace(x, y, inkml_id=i))
-
-            tg = TraceGroup(traces=traces, label=transcript or '')
-            return [RowNode(children=[SymbolNode(trace_group=tg)])]
-
-        # Otherwise recurse
-        rows = []
+        if ann_type != 'Word':
+            stack.extend(reversed(node))
+            continue
+        refs = []
         for child in node:
-            rows.extend(_extract_word_rows(child, depth + 1))
-        return rows
+            if _local(child.tag) == 'traceView':
+                ref = child.get('traceDataRef', '')
+                if ref.startswith('#'):
+                    ref = ref[1:]
+                if ref in texts_by_id:
+                    refs.append(ref)
+        words.append((transcript, refs))
+
+    needed = list(dict.fromkeys(ref for _, refs in words for ref in refs))
+    strokes = dict(zip(needed, _decode_traces([texts_by_id[ref] for ref in needed])))
+    result = []
+    for transcript, refs in words:
+        word_strokes = [strokes[ref] for ref in refs if strokes[ref][0]]
+        if word_strokes:
+            result.append((transcript, word_strokes))
+    return result
+
+
+def _word_row(transcript: str, strokes: list) -> RowNode:
+    """One word as a RowNode holding a single SymbolNode with all its traces."""
+    traces = [Trace(x, y, inkml_id=i) for i, (x, y) in enumerate(strokes)]
+    tg = TraceGroup(traces=traces, label=transcript or '')
+    return RowNode(children=[SymbolNode(trace_group=tg)])
+
+
+def _load_iamondb_file(path) -> list[RowNode]:
+    """Parse one IAMonDo InkML file → list of RowNode (one per Word segment)."""
+    return [_word_row(transcript, strokes) for transcript, strokes in _read_iamondb_words(path)]
+
+
+def _read_page(path) -> tuple:
+    """(path, words, error message) of one page, for the process pool."""
+    try:
+        return path, _read_iamondb_words(path), None
+    except Exception as e:
+        return path, [], f"{type(e).__name__}: {e}"
+
+
+def _pages(paths, workers: int, ordered: bool):
+    """_read_page() over paths with at most 2 × workers pages in flight."""
+    if workers == 0:
+        yield from map(_read_page, paths)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque() if ordered else set()
+        for path in paths:
+            future = pool.submit(_read_page, path)
+            if ordered:
+                pending.append(future)
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            else:
+                pending.add(future)
+                if len(pending) >= window:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    yield from (f.result() for f in done)
+        for future in (pending if ordered else as_completed(pending)):
+            yield future.result()
+
+
+def iter_iamondb_words(paths, workers: int = None, errors: dict = None, ordered: bool = True):
+    """
+    Yield one RowNode per IAMonDo Word segment, page by page.
+
+    Pages are parsed on `workers` processes (None: CPU count, 0: in this
+    process) with a bounded number of pages in flight, so memory stays flat
+    over the whole corpus. Pages come in path order unless ordered=False,
+    which yields each page as soon as it is done.
 
-    return _extract_word_rows(root)
+    Files that fail to parse are skipped and reported (one line per file and
+    a count at the end); pass a dict as `errors` to also collect
+    {path: "ExceptionType: message"} for them.
+    """
+    failed = 0
+    for path, words, error in _pages(paths, workers, ordered):
+        if error is not None:
+            failed += 1
+            print(f"[iamondb_loader] Skipping {path}: {error}")
+            if errors is not None:
+                errors[str(path)] = error
+            continue
+        for transcript, strokes in words:
+            yield _word_row(transcript, strokes)
+    if failed:
+        print(f"[iamondb_loader] {failed} file(s) failed to parse and were skipped")
 
 
-def load_iamondb_files(paths) -> list[RowNode]:
-    """Load all IAMonDo InkML files → flat list of RowNode."""
-    all_rows = []
-    for p in paths:
-        try:
-            all_rows.extend(_load_iamondb_file(p))
-        except Exception:
-            pass
-    return all_rows
+def load_iamondb_files(paths, workers: int = None, errors: dict = None) -> list[RowNode]:
+    """Load all IAMonDo InkML files → flat list of RowNode (see iter_iamondb_words)."""
+    return list(iter_iamondb_words(paths, workers=workers, errors=errors))
 
 
 def get_iamondb_files() -> list[Path]:
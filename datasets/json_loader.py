@@ -8,11 +8,18 @@ Each JSON file contains samples keyed as sample0, sample1, ..., each with:
 
 Each sample becomes one RowNode whose children are SymbolNodes (one per character).
 Character strokes are identified by index ranges into the flat point list.
+
+iter_json_dataset parses the files on a process pool, a bounded number at a
+time, and yields the samples in sorted file order; load_json_dataset parses
+them in this process unless given workers.
 """
 
 import json
 import os
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -21,6 +28,10 @@ from ink.traces.trace import Trace
 from ink.traces.trace_group import TraceGroup
 from ink.nodes.symbol_node import SymbolNode
 from ink.nodes.row_node import RowNode
+from inktree.encode import encode_graph_sample
+
+_get_x = itemgetter("x")
+_get_y = itemgetter("y")
 
 
 def _extract_flat_xy(sample: dict) -> tuple[list, list]:
@@ -28,6 +39,11 @@ def _extract_flat_xy(sample: dict) -> tuple[list, list]:
     for key in ("word_stroke", "points"):
         ws = sample.get(key)
         if isinstance(ws, list) and ws and isinstance(ws[0], dict) and "x" in ws[0]:
+            try:
+                # every point a dict with x and y: convert in bulk
+                return list(map(float, map(_get_x, ws))), list(map(float, map(_get_y, ws)))
+            except (KeyError, TypeError):
+                pass
             xs = [float(p["x"]) for p in ws if "x" in p]
             ys = [float(p["y"]) for p in ws if "y" in p]
             return xs, ys
@@ -118,59 +134,118 @@ def get_json_files(root_dir: str | Path) -> list[Path]:
     return sorted(root.rglob("*.json"))
 
 
+def count_json_file(json_path: str | Path) -> int:
+    """Count raw samples in one JSON file (sample0/sample1/... entries)."""
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            obj = json.load(f)
+    except Exception:
+        return 0
+    if not isinstance(obj, dict):
+        return 0
+    sample_keys = [k for k in obj if isinstance(k, str) and k.startswith("sample")]
+    return len(sample_keys) if sample_keys else 1
+
+
 def count_json_samples(root_dir: str | Path) -> int:
     """Count raw samples in JSON files (sample0/sample1/... entries)."""
-    total = 0
-    for json_path in get_json_files(root_dir):
+    return sum(count_json_file(json_path) for json_path in get_json_files(root_dir))
+
+
+def _load_json_file(json_path) -> list[RowNode]:
+    """RowNodes of the samples of one JSON file (sample0, sample1, ... in order)."""
+    try:
+        with open(json_path, encoding="utf-8") as f:
+            obj = json.load(f)
+    except Exception:
+        return []
+    if not isinstance(obj, dict):
+        return []
+
+    sample_keys = sorted(
+        [k for k in obj if k.startswith("sample")],
+        key=lambda k: int(k[6:]) if k[6:].isdigit() else 0,
+    )
+    if not sample_keys:
+        sample_keys = [""]  # treat whole dict as a single sample
+
+    rows = []
+    for key in sample_keys:
+        sample = obj[key] if key else obj
+        if not isinstance(sample, dict):
+            continue
         try:
-            with open(json_path, encoding="utf-8") as f:
-                obj = json.load(f)
+            row = _sample_to_row_node(sample)
+            if row is not None:
+                rows.append(row)
         except Exception:
-            continue
-        if not isinstance(obj, dict):
-            continue
-        sample_keys = [k for k in obj if isinstance(k, str) and k.startswith("sample")]
-        total += len(sample_keys) if sample_keys else 1
-    return total
+            pass
+    return rows
 
 
-def load_json_dataset(root_dir: str | Path, max_samples: int = None) -> list[RowNode]:
+def _read_json_file(args) -> list:
+    json_path, as_dict = args
+    rows = _load_json_file(json_path)
+    return [encode_graph_sample(row) for row in rows] if as_dict else rows
+
+
+def _files(paths, as_dict: bool, workers: int):
+    """_read_json_file() over paths in order, with at most 2 × workers files in flight."""
+    if workers == 0:
+        yield from (_read_json_file((path, as_dict)) for path in paths)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        for path in paths:
+            pending.append(pool.submit(_read_json_file, (path, as_dict)))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # stopped early (max_samples): files not started yet are not read
+        pool.shutdown(cancel_futures=True)
+
+
+def iter_json_dataset(root_dir: str | Path, max_samples: int = None, workers: int = None,
+                      as_dict: bool = False):
+    """
+    Yield the samples of all JSON files under root_dir, in sorted file order.
+
+    Parameters
+    ----------
+    root_dir    : root directory containing (nested) JSON files
+    max_samples : if not None, stop after this many successfully loaded graphs;
+                  files beyond the ones in flight at that point are not read
+    workers     : worker processes (None: CPU count, 0: in this process)
+    as_dict     : yield InkTree sample dicts (encode_graph_sample) instead of
+                  RowNodes, which are cheaper to send back from the workers
+    """
+    if max_samples is not None and max_samples <= 0:
+        return
+    count = 0
+    files = _files(get_json_files(root_dir), as_dict, workers)
+    try:
+        for rows in files:
+            for row in rows:
+                yield row
+                count += 1
+                if max_samples is not None and count >= max_samples:
+                    return
+    finally:
+        files.close()
+
+
+def load_json_dataset(root_dir: str | Path, max_samples: int = None, workers: int = 0) -> list[RowNode]:
     """Load all JSON samples under root_dir into RowNode graphs.
 
     Parameters
     ----------
     root_dir    : root directory containing (nested) JSON files
     max_samples : if not None, stop after this many successfully loaded graphs
+    workers     : worker processes (0, the default: in this process; None:
+                  CPU count)
     """
-    rows: list[RowNode] = []
-    for json_path in get_json_files(root_dir):
-        if max_samples is not None and len(rows) >= max_samples:
-            break
-        try:
-            with open(json_path, encoding="utf-8") as f:
-                obj = json.load(f)
-        except Exception:
-            continue
-
-        # Extract sample0, sample1, ... in order
-        sample_keys = sorted(
-            [k for k in obj if k.startswith("sample")],
-            key=lambda k: int(k[6:]) if k[6:].isdigit() else 0,
-        )
-        if not sample_keys and isinstance(obj, dict):
-            sample_keys = [""]  # treat whole dict as a single sample
-
-        for key in sample_keys:
-            if max_samples is not None and len(rows) >= max_samples:
-                break
-            sample = obj[key] if key else obj
-            if not isinstance(sample, dict):
-                continue
-            try:
-                row = _sample_to_row_node(sample)
-                if row is not None:
-                    rows.append(row)
-            except Exception:
-                pass
-
-    return rows
+    return list(iter_json_dataset(root_dir, max_samples, workers))
@@ -0,0 +1,141 @@
+"""
+Load CROHME label graph (.lg) files into RelationNode graphs.
+
+The structure comes from the object-level .lg file (see ink/lg.py), the ink
+from the InkML file of the same name: only its <trace> elements and truth
+annotation are read, the MathML and traceGroups are skipped. Objects refer to
+strokes by InkML trace id; symLG files, whose objects carry MathML ids
+instead, are matched against the InkML traceGroups by their annotationXML href.
+
+Directories are loaded on a process pool, in sorted file order.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ink.inkml import InkmlProcessor
+from ink.lg import build_relation_graph, read_lg
+from ink.nodes.nodes_factory import get_undefined_node_from_trace_groups
+from ink.preprocess import PreProcessor
+from ink.traces.trace_group import TraceGroup
+from inktree.io import save_inktree
+
+
+def _trace_groups(lg, proc: InkmlProcessor) -> dict:
+    """object id → TraceGroup, from stroke ids or (symLG) traceGroup hrefs."""
+    traces = proc.extract_traces().traces
+    by_id = {trace.inkml_id: trace for trace in traces}
+    groups = {}
+    for object_id, (label, strokes) in lg.objects.items():
+        if not strokes or not all(s.isdigit() for s in strokes):
+            break
+        groups[object_id] = TraceGroup([by_id[int(s)] for s in strokes if int(s) in by_id],
+                                       label=label, math_annotation=object_id)
+    else:
+        return groups
+    return {tg.math_annotation: tg for tg in proc.group_traces_by_trace_groups(TraceGroup(traces))
+            if tg.math_annotation in lg.objects}
+
+
+def load_lg_sample(lg_path, inkml_path, print_errors=False, scale=True, interpolate=True,
+                   keep_undefined=False) -> tuple | None:
+    """Load one .lg + .inkml pair. Returns (graph, LaTeX label) or None."""
+    name = os.path.basename(lg_path)
+    try:
+        lg = read_lg(lg_path)
+        proc = InkmlProcessor(inkml_path)
+        trace_groups = _trace_groups(lg, proc)
+    except Exception as e:
+        if print_errors:
+            print(f"[lg_loader] Error loading {name}: {e}")
+        return None
+
+    for trace_group in trace_groups.values():
+        trace_group.remove_empty_traces()
+    missing = [i for i in lg.objects if len(trace_groups.get(i, ())) == 0]
+    if missing:
+        if print_errors:
+            print(f"[lg_loader] No ink for objects {missing} in {name}")
+        return None
+
+    if scale:
+        PreProcessor.scale_formula(list(trace_groups.values()))
+    if interpolate:
+        PreProcessor.interpolate_trace_groups(list(trace_groups.values()), target_length=20)
+
+    label = (proc.get_annotations().get("truth") or "").strip().strip("$").strip()
+    try:
+        graph = build_relation_graph(lg, trace_groups)
+        if graph is None:
+            raise ValueError("no unique root object")
+        if len(graph.get_all_trace_groups()) != len(lg.objects):
+            raise ValueError("ambiguous relations leave symbols unconnected")
+    except (KeyError, ValueError) as e:
+        if print_errors:
+            print(f"[lg_loader] Error building graph for {name}: {e}")
+        if not keep_undefined:
+            return None
+        graph = get_undefined_node_from_trace_groups([trace_groups[i] for i in lg.objects], latex=label)
+
+    graph.fix()
+    return graph, label or graph.latex()
+
+
+def load_lg_file(lg_path, inkml_path, print_errors=False, scale=True, interpolate=True,
+                 keep_undefined=False):
+    """Load one .lg + .inkml pair into a graph (None on failure), like ink.graph.load_inkml_file."""
+    sample = load_lg_sample(lg_path, inkml_path, print_errors, scale, interpolate, keep_undefined)
+    return sample[0] if sample is not None else None
+
+
+def find_lg_pairs(lg_dir, inkml_dir=None) -> list[tuple[Path, Path]]:
+    """
+    Pair every .lg file below lg_dir with the .inkml file of the same stem
+    below inkml_dir (default: lg_dir). Unpaired .lg files are skipped.
+    """
+    lg_dir = Path(lg_dir)
+    inkml_files = {p.stem: p for p in Path(inkml_dir or lg_dir).rglob("*.inkml")}
+    return [(p, inkml_files[p.stem]) for p in sorted(lg_dir.rglob("*.lg")) if p.stem in inkml_files]
+
+
+def _load_chunk(args) -> list:
+    pairs, kwargs = args
+    return [load_lg_sample(lg_path, inkml_path, **kwargs) for lg_path, inkml_path in pairs]
+
+
+def load_lg_directory(lg_dir, inkml_dir=None, workers: int = None, chunk_size: int = 64,
+                      **kwargs) -> list[tuple]:
+    """
+    Load all .lg files of a directory tree as (graph, label) pairs.
+
+    Parameters
+    ----------
+    lg_dir:     Directory searched recursively for .lg files.
+    inkml_dir:  Directory holding the matching .inkml files (default: lg_dir).
+    workers:    Worker processes (None: CPU count, 0: in this process).
+    chunk_size: Files per work item.
+    kwargs:     print_errors / scale / interpolate / keep_undefined, as for
+                load_inkml_file.
+
+    Returns
+    -------
+    Samples in sorted file order; files that fail to load are left out.
+    """
+    pairs = find_lg_pairs(lg_dir, inkml_dir)
+    chunks = [(pairs[i:i + chunk_size], kwargs) for i in range(0, len(pairs), chunk_size)]
+    if workers == 0:
+        results = map(_load_chunk, chunks)
+        return [s for chunk in results for s in chunk if s is not None]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [s for chunk in pool.map(_load_chunk, chunks) for s in chunk if s is not None]
+
+
+def convert_lg_directory(lg_dir, out_path, inkml_dir=None, workers: int = None, **kwargs) -> int:
+    """Load a .lg directory (see load_lg_directory) into an InkTree file. Returns the sample count."""
+    samples = load_lg_directory(lg_dir, inkml_dir, workers=workers, **kwargs)
+    save_inktree([g for g, _ in samples], out_path, labels=[label for _, label in samples])
+    return len(samples)
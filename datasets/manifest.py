@@ -0,0 +1,186 @@
+"""
+Sample-count manifests of the raw dataset sources.
+
+Counting samples means parsing the sources (every JSON file, the whole
+Unipen archive, the Detexify dump), so the counts are kept in one JSON
+manifest per source under data/manifests/:
+
+  {"version": 1, "source": "iamondb", "root": "/.../data/Iamondb Dataset",
+   "files": [{"path": "a/b.json", "size": 1234, "mtime_ns": ..., "samples": 4}, ...]}
+
+A file is counted again only when its size or mtime changed; new and
+changed files are counted on a process pool and removed files are dropped,
+so later runs only stat the files. Sizes and counts are then plain lookups:
+
+  source_manifest("iamondb").samples
+  source_manifest("unipen").size
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datasets.detexify_loader import count_detexify
+from datasets.json_loader import count_json_file, get_json_files
+from datasets.unipen_loader import UNIPEN_TGZ, count_unipen_segments
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+MANIFEST_DIR = DATA_DIR / "manifests"
+MANIFEST_VERSION = 1
+
+
+class Manifest:
+    """
+    Files of one source with their size, mtime and sample count.
+
+    files: list of {"path", "size", "mtime_ns", "samples"}, path relative
+           to root, in sorted path order
+    """
+
+    def __init__(self, source: str, root: Path, files: list):
+        self.source = source
+        self.root = Path(root)
+        self.files = files
+
+    def __len__(self):
+        return len(self.files)
+
+    def __repr__(self):
+        return f"Manifest({self.source!r}, {len(self.files)} files, {self.samples} samples, {self.size} bytes)"
+
+    @property
+    def samples(self) -> int:
+        return sum(entry["samples"] for entry in self.files)
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self.files)
+
+    @property
+    def paths(self) -> list[Path]:
+        return [self.root / entry["path"] for entry in self.files]
+
+    def to_dict(self) -> dict:
+        return {"version": MANIFEST_VERSION, "source": self.source, "root": str(self.root), "files": self.files}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Manifest":
+        return cls(d["source"], Path(d["root"]), d["files"])
+
+
+def _existing(*paths) -> list[Path]:
+    return [p for p in paths if p.exists()]
+
+
+def _json_files(root: Path) -> list[Path]:
+    return get_json_files(root) if root.exists() else []
+
+
+def _detexify_files(root: Path) -> list[Path]:
+    return _existing(root / "detexify.sql")
+
+
+def _unipen_files(root: Path) -> list[Path]:
+    return _existing(UNIPEN_TGZ)
+
+
+# source → (root, root → files, file → sample count); counters run in worker processes
+SOURCES = {
+    "deepwriting": (DATA_DIR / "Deepwriting Dataset", _json_files, count_json_file),
+    "iamondb": (DATA_DIR / "Iamondb Dataset", _json_files, count_json_file),
+    "detexify": (DATA_DIR, _detexify_files, count_detexify),
+    "unipen": (DATA_DIR, _unipen_files, count_unipen_segments),
+}
+
+
+def _count_files(counter, paths: list[Path], workers: int) -> list[int]:
+    if workers == 0 or len(paths) <= 1:
+        return [counter(p) for p in paths]
+    n_workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(counter, paths, chunksize=max(1, len(paths) // (4 * n_workers))))
+
+
+def _read_manifest(path: Path) -> Manifest | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            d = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(d, dict) or d.get("version") != MANIFEST_VERSION:
+        return None
+    return Manifest.from_dict(d)
+
+
+def _write_manifest(manifest: Manifest, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest.to_dict(), f, indent=1)
+    os.replace(tmp, path)
+
+
+def build_manifest(
+    source: str,
+    root: Path,
+    paths: list[Path],
+    counter,
+    workers: int = None,
+    refresh: bool = False,
+    manifest_dir: Path = None,
+) -> Manifest:
+    """
+    Bring the manifest of a source up to date and return it.
+
+    Parameters
+    ----------
+    source:       Manifest name (file <manifest_dir>/<source>.json).
+    root:         Directory the stored paths are relative to.
+    paths:        Current files of the source.
+    counter:      File → sample count; must be picklable (module level).
+    workers:      Worker processes for counting (None: CPU count, 0: in this process).
+    refresh:      Count every file again, ignoring the stored counts.
+    manifest_dir: Directory of the manifest files (default: data/manifests).
+
+    Returns
+    -------
+    The Manifest; it is rewritten only if a file was added, changed or removed.
+    """
+    root = Path(root)
+    manifest_path = Path(manifest_dir or MANIFEST_DIR) / f"{source}.json"
+    stored = None if refresh else _read_manifest(manifest_path)
+    known = {}
+    if stored is not None and stored.root == root:
+        known = {entry["path"]: entry for entry in stored.files}
+
+    entries, stale = [], []
+    for p in sorted(Path(p) for p in paths):
+        st = p.stat()
+        rel = p.relative_to(root).as_posix()
+        entry = known.get(rel)
+        if entry is None or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            entry = {"path": rel, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "samples": None}
+            stale.append(entry)
+        entries.append(entry)
+
+    counts = _count_files(counter, [root / entry["path"] for entry in stale], workers)
+    for entry, count in zip(stale, counts):
+        entry["samples"] = count
+
+    manifest = Manifest(source, root, entries)
+    if stored is None or stale or len(entries) != len(known):
+        _write_manifest(manifest, manifest_path)
+    return manifest
+
+
+def source_manifest(source: str, workers: int = None, refresh: bool = False) -> Manifest:
+    """Up-to-date manifest of one of SOURCES (see build_manifest)."""
+    if source not in SOURCES:
+        raise KeyError(f"Unknown source {source!r}; expected one of {sorted(SOURCES)}")
+    root, list_files, counter = SOURCES[source]
+    return build_manifest(source, root, list_files(root), counter, workers=workers, refresh=refresh)
@@ -14,8 +14,13 @@ Directory layout (data/MathWriting+/):
 """
 
 import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datasets.catalog import catalog_files
+
 
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _MW_ROOT = _PROJECT_ROOT / "data" / "MathWriting+"
@@ -25,28 +30,31 @@ class MathWritingFileManager:
     """Locate InkML files in the MathWriting+ directory tree."""
 
     @staticmethod
-    def _get_files(split: str) -> list[str]:
+    def _get_files(split: str, sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        """Sorted .inkml files of a split from its cached catalog (datasets/catalog.py),
+        or a deterministic sample of sample_n of them for the seed. refresh
+        re-stats files that may have been edited in place."""
         split_dir = _MW_ROOT / split
         if not split_dir.is_dir():
             raise FileNotFoundError(f"MathWriting+ split directory not found: {split_dir}")
-        return sorted(str(p) for p in split_dir.glob("*.inkml"))
+        return catalog_files([split_dir], sample_n=sample_n, seed=seed, refresh=refresh)
 
     @staticmethod
-    def get_test_files() -> list[str]:
-        return MathWritingFileManager._get_files("Test")
+    def get_test_files(sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        return MathWritingFileManager._get_files("Test", sample_n, seed, refresh)
 
     @staticmethod
-    def get_val_files() -> list[str]:
-        return MathWritingFileManager._get_files("Val")
+    def get_val_files(sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        return MathWritingFileManager._get_files("Val", sample_n, seed, refresh)
 
     @staticmethod
-    def get_train_files() -> list[str]:
-        return MathWritingFileManager._get_files("Train")
+    def get_train_files(sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        return MathWritingFileManager._get_files("Train", sample_n, seed, refresh)
 
     @staticmethod
-    def get_symbol_files() -> list[str]:
-        return MathWritingFileManager._get_files("Symbols")
+    def get_symbol_files(sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        return MathWritingFileManager._get_files("Symbols", sample_n, seed, refresh)
 
     @staticmethod
-    def get_synthetic_files() -> list[str]:
-        return MathWritingFileManager._get_files("Synthetic")
+    def get_synthetic_files(sample_n: int = None, seed: int = 0, refresh: bool = False) -> list[str]:
+        return MathWritingFileManager._get_files("Synthetic", sample_n, seed, refresh)
@@ -0,0 +1,212 @@
+"""
+One entry point for every dataset: open_dataset(name, split).
+
+  ds = open_dataset("crohme", "2023test")
+  len(ds), ds[0], [label for _, label in ds]
+
+Each (name, split) returns an InkTreeSequence (inktree/sequence.py), a lazy
+sequence of (graph, label) samples backed by an InkTree file in data/inktree/:
+
+  1. an existing converted file of the split is used as is;
+  2. otherwise the source is parsed once with its streaming loader and the
+     samples are written to data/inktree/<slug>.inktree.jsonl.gz, which
+     step 1 picks up on every later call. Processes opening the same
+     uncached split together (e.g. DDP ranks) each convert it under their
+     own temporary name and the last rename wins; run the conversion once
+     up front to avoid the repeated work.
+
+Labels are the LaTeX of the graph (ink.latex.latex_many), "" where it
+cannot be serialised.
+"""
+
+import os
+import sys
+from itertools import islice
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ink.latex import latex_many
+from inktree.io import INKTREE_SUFFIX, write_inktree
+from inktree.sequence import InkTreeSequence
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+INKTREE_DIR = DATA_DIR / "inktree"
+
+_LABEL_CHUNK = 256
+
+
+class DatasetSpec:
+    """
+    A registered split.
+
+    slugs:  InkTree file stems in INKTREE_DIR, preferred first; the first is
+            also the name of the cache written from the source.
+    source: () → iterable of root RelationNodes, parsed from the original format.
+    """
+
+    def __init__(self, name: str, split: str, slugs: list, source):
+        self.name = name
+        self.split = split
+        self.slugs = slugs
+        self.source = source
+
+    def __repr__(self):
+        return f"DatasetSpec({self.name!r}, {self.split!r})"
+
+
+_REGISTRY: dict = {}   # (name, split) → DatasetSpec
+
+
+def register(name: str, split: str, slugs: list, source):
+    """Register (or replace) a split; see DatasetSpec."""
+    _REGISTRY[(name, split)] = DatasetSpec(name, split, list(slugs), source)
+
+
+def list_datasets() -> list[tuple[str, str]]:
+    """All registered (name, split) pairs."""
+    return sorted(_REGISTRY)
+
+
+def _spec(name: str, split: str = None) -> DatasetSpec:
+    if split is None:
+        splits = [s for n, s in _REGISTRY if n == name]
+        if len(splits) != 1:
+            raise KeyError(f"Dataset {name!r} needs a split, one of {sorted(splits)}" if splits
+                           else f"Unknown dataset {name!r}")
+        split = splits[0]
+    spec = _REGISTRY.get((name, split))
+    if spec is None:
+        splits = sorted(s for n, s in _REGISTRY if n == name)
+        raise KeyError(f"Unknown split {split!r} of {name!r}; expected one of {splits}" if splits
+                       else f"Unknown dataset {name!r}")
+    return spec
+
+
+def dataset_path(name: str, split: str = None) -> Path | None:
+    """The existing InkTree file backing a split, or None if it has not been converted."""
+    for slug in _spec(name, split).slugs:
+        path = INKTREE_DIR / f"{slug}{INKTREE_SUFFIX}"
+        if path.exists():
+            return path
+    return None
+
+
+def _labelled(graphs):
+    """(graph, LaTeX label) pairs, serialised a chunk at a time."""
+    graphs = iter(graphs)
+    while chunk := list(islice(graphs, _LABEL_CHUNK)):
+        yield from zip(chunk, latex_many(chunk, fallback=""))
+
+
+def open_dataset(name: str, split: str = None, rebuild: bool = False) -> InkTreeSequence:
+    """
+    Open a registered split as a lazy sequence of (graph, label) samples.
+
+    Parameters
+    ----------
+    name:    Dataset name (see list_datasets()).
+    split:   Split name; may be left out for datasets with a single split.
+    rebuild: Parse the source again and overwrite the cached InkTree file.
+
+    Raises KeyError for unknown names / splits; source loaders raise
+    FileNotFoundError if the original data is missing.
+    """
+    spec = _spec(name, split)
+    path = None if rebuild else dataset_path(spec.name, spec.split)
+    if path is None:
+        path = INKTREE_DIR / f"{spec.slugs[0]}{INKTREE_SUFFIX}"
+        write_inktree(_labelled(spec.source()), path)
+    return InkTreeSequence(path)
+
+
+# ── sources ───────────────────────────────────────────────────────────────────
+
+def _inkml_graphs(get_files):
+    def source():
+        from ink.graph import load_inkml_file
+        for f in get_files():
+            graph = load_inkml_file(f)
+            if graph is not None:
+                yield graph
+    return source
+
+
+def _register_crohme():
+    from datasets.crohme import CrohmeFileManager, InkML_path
+
+    splits = {
+        "2023test": (["crohme_2023test"], CrohmeFileManager.get_2023test_files),
+        "2019test": (["crohme_2019test"], CrohmeFileManager.get_2019test_files),
+        "2016test": (["crohme_2016test", "crohme_2016val"], CrohmeFileManager.get_2016test_files),
+        "2023val": (["crohme_2023val"], lambda: CrohmeFileManager.get_files_from_paths(
+            [os.path.join(InkML_path, "val", "CROHME2023_val")])),
+        "real_train": (["crohme_real_train"], CrohmeFileManager.get_real_train_files),
+        "val": (["crohme_val"], CrohmeFileManager.get_val_files),
+        "test": (["crohme_test"], CrohmeFileManager.get_test_files),
+    }
+    for split, (slugs, get_files) in splits.items():
+        register("crohme", split, slugs, _inkml_graphs(get_files))
+
+
+def _register_mathwriting():
+    from datasets.mathwriting import MathWritingFileManager
+
+    # benchmark_multi.py writes sampled mwplus_train / mwplus_synthetic files,
+    # so the full splits are cached under their own names
+    splits = {
+        "test": (["mwplus_test"], MathWritingFileManager.get_test_files),
+        "val": (["mwplus_val"], MathWritingFileManager.get_val_files),
+        "symbols": (["mwplus_symbols"], MathWritingFileManager.get_symbol_files),
+        "train": (["mwplus_train_full"], MathWritingFileManager.get_train_files),
+        "synthetic": (["mwplus_synthetic_full"], MathWritingFileManager.get_synthetic_files),
+    }
+    for split, (slugs, get_files) in splits.items():
+        register("mathwriting", split, slugs, _inkml_graphs(get_files))
+
+
+def _json_graphs(dirname: str):
+    def source():
+        from datasets.json_loader import iter_json_dataset
+        root = DATA_DIR / dirname
+        if not root.is_dir():
+            raise FileNotFoundError(f"JSON dataset directory not found: {root}")
+        return iter_json_dataset(root)
+    return source
+
+
+def _deepwriting_npz(split: str):
+    def source():
+        from datasets.deepwriting_loader import load_deepwriting
+        return load_deepwriting(split)
+    return source
+
+
+def _iamondo_words():
+    from datasets.iamondb_loader import get_iamondb_files, iter_iamondb_words
+    files = get_iamondb_files()
+    if not files:
+        raise FileNotFoundError("No IAMonDo InkML files found in data/IAMonDo-db-1.0/")
+    return iter_iamondb_words(files)
+
+
+def _detexify_nodes():
+    from datasets.detexify_loader import iter_detexify_nodes
+    return iter_detexify_nodes()
+
+
+def _unipen_nodes():
+    from datasets.unipen_loader import iter_unipen
+    return iter_unipen()
+
+
+_register_crohme()
+_register_mathwriting()
+register("deepwriting", "all", ["deepwriting", "deep_writing"], _json_graphs("Deepwriting Dataset"))
+register("deepwriting", "training", ["deepwriting_training"], _deepwriting_npz("training"))
+register("deepwriting", "validation", ["deepwriting_validation"], _deepwriting_npz("validation"))
+register("iamondb", "all", ["iamondb"], _json_graphs("Iamondb Dataset"))
+register("iamondo", "all", ["iamondo"], _iamondo_words)
+register("detexify", "all", ["detexify"], _detexify_nodes)
+register("unipen", "all", ["unipen"], _unipen_nodes)
@@ -8,9 +8,15 @@ The archive contains:
 In the archive the segment files appear FIRST (~21 K files, ~4 MB total) and
 the include files appear AFTER them (~7.8 K files, ~490 MB uncompressed).
 A single forward-streaming pass:
-  1. buffers all segment file contents in memory (tiny, ~4 MB)
+  1. parses all segment files as they stream by (tiny, ~4 MB)
   2. caches all include file contents in memory (~490 MB raw text)
-  then processes the buffered segments against the include cache.
+  then processes the parsed segments against the include cache. Each include
+  is parsed once, into packed arrays, however many segment files use it, and
+  dropped after the last segment file using it.
+
+With a memory_budget, step 2 instead copies only the referenced includes to
+an uncompressed temporary spill file, and includes are parsed from there on
+demand into a size-bounded LRU cache.
 
 This avoids any backward gzip seeks (which would require re-decompressing
 from the start of the archive and would make random access O(archive_size)
@@ -21,10 +27,16 @@ Returns one SymbolNode per character segment.
 """
 
 import re
+import shutil
 import sys
 import tarfile
+import tempfile
+from collections import Counter, OrderedDict
+from contextlib import ExitStack
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from ink.traces.trace import Trace
@@ -54,8 +66,8 @@ def _parse_segment_dat(content: str):
     return include_path, segments
 
 
-def _parse_include_dat(content: str) -> list[list[tuple[int, int]]]:
-    """Parse stroke data from a Unipen include file. Returns list of strokes."""
+def _parse_include_lines(content: str) -> list[list[tuple[int, int]]]:
+    """Parse stroke data from a Unipen include file line by line. Returns list of strokes."""
     strokes = []
     current = []
     recording = False
@@ -76,84 +88,245 @@ def _parse_include_dat(content: str) -> list[list[tuple[int, int]]]:
     return strokes
 
 
-def load_unipen(max_samples: int = None) -> list[SymbolNode]:
-    """Load Unipen tgz archive → list of SymbolNode.
+# characters that str.splitlines() / str.strip() treat as line breaks or
+# blanks beyond \n, \r, space and tab (in latin-1 text)
+_ODD_SPACE = re.compile('[\x0b\x0c\x1c-\x1f\x85\xa0]')
+_PEN_MARK = re.compile(r'^[ \t]*\.PEN_(DOWN|UP)[ \t]*$', re.M)
+_POINT_LINE = re.compile(r'^[ \t]*(-?\d+) (-?\d+)[ \t]*$', re.M)
+# a block of only "x y" lines (and blank lines) that np.fromstring reads as is
+_POINT_BLOCK = re.compile(r'(?:[ \t]*(?:-?[0-9]{1,18} -?[0-9]{1,18}[ \t]*)?\n)*'
+                          r'[ \t]*(?:-?[0-9]{1,18} -?[0-9]{1,18}[ \t]*)?')
+
+
+def _block_points(block: str) -> np.ndarray:
+    """(n, 2) int64 points of the "x y" lines of a pen-down block."""
+    if not _POINT_BLOCK.fullmatch(block):
+        values = [int(v) for point in _POINT_LINE.findall(block) for v in point]
+        return np.array(values, dtype=np.int64).reshape(-1, 2)
+    if not block.strip():
+        return np.empty((0, 2), dtype=np.int64)
+    return np.fromstring(block, dtype=np.int64, sep=' ').reshape(-1, 2)
+
 
-    Uses a single forward-streaming pass through the gzip archive:
-      • Segment files (first in archive, ~4 MB total) are buffered in memory.
-      • Include files (later in archive, ~490 MB uncompressed) are cached as
-        raw text.
-    After the pass the buffered segments are processed against the cache.
+def _pack(strokes) -> tuple[np.ndarray, np.ndarray]:
+    """Strokes → (points (N, 2) int64, offsets (S + 1,) int64)."""
+    offsets = np.zeros(len(strokes) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in strokes], out=offsets[1:])
+    if not strokes:
+        return np.empty((0, 2), dtype=np.int64), offsets
+    return np.concatenate([np.asarray(s, dtype=np.int64).reshape(-1, 2) for s in strokes]), offsets
+
+
+def _parse_include_dat(content: str) -> tuple[np.ndarray, np.ndarray]:
     """
-    if not UNIPEN_TGZ.exists():
-        raise FileNotFoundError(f"Unipen archive not found: {UNIPEN_TGZ}")
+    Parse stroke data from a Unipen include file.
 
-    # Buffer segment file content (small: ~21 K × ~200 B = ~4 MB)
-    seg_buffer: list[tuple[str, str]] = []   # (member.name, raw_text)
-    # Cache include file content (large: ~7.8 K × ~62 KB avg = ~490 MB)
-    include_cache: dict[str, str] = {}       # member.name → raw_text
+    Returns the strokes packed as (points, offsets): points is an (N, 2)
+    int64 array of (x, -y), stroke k is points[offsets[k]:offsets[k + 1]].
+    The .PEN_DOWN / .PEN_UP lines are found with one regex search and the
+    numbers of each block are converted in bulk; the result is that of
+    _parse_include_lines().
+    """
+    if _ODD_SPACE.search(content):
+        return _pack(_parse_include_lines(content))
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    marks = list(_PEN_MARK.finditer(content))
+    strokes = []
+    current = None   # points of the last pen-down block
+    for k, mark in enumerate(marks):
+        if mark.group(1) == 'DOWN':
+            end = marks[k + 1].start() if k + 1 < len(marks) else len(content)
+            current = _block_points(content[mark.end():end])
+        elif current is not None and len(current):
+            strokes.append(current)
+    if marks and marks[-1].group(1) == 'DOWN' and len(current):
+        strokes.append(current)
+    points, offsets = _pack(strokes)
+    points[:, 1] *= -1   # invert Y
+    return points, offsets
 
-    with tarfile.open(str(UNIPEN_TGZ), 'r:gz') as tar:
-        for member in tar:
-            if not member.isfile() or not member.name.endswith('.dat'):
-                continue
 
-            raw = tar.extractfile(member)
-            if raw is None:
-                continue
-            text = raw.read().decode('latin1', errors='ignore')
+class _StrokeCache:
+    """
+    LRU of parsed includes. An entry is dropped after its last use (uses:
+    include name → number of get() calls to expect) and, with a byte budget,
+    when the cache grows beyond it.
+    """
 
-            if '/include/' in member.name:
-                include_cache[member.name] = text
-            elif '/data/' in member.name and '/include/' not in member.name:
-                seg_buffer.append((member.name, text))
+    def __init__(self, load, uses: dict, budget: int = None):
+        self.load = load
+        self.uses = uses
+        self.budget = budget
+        self.entries = OrderedDict()   # include name → (strokes, size)
+        self.size = 0
 
-    # Process buffered segment files using the cached include data
-    nodes: list[SymbolNode] = []
-    for seg_name, content in seg_buffer:
-        if max_samples is not None and len(nodes) >= max_samples:
-            break
+    def get(self, name: str):
+        self.uses[name] -= 1
+        last = self.uses[name] <= 0
+        entry = self.entries.pop(name, None) if last else self.entries.get(name)
+        if entry is not None:
+            if last:
+                self.size -= entry[1]
+            else:
+                self.entries.move_to_end(name)
+            return entry[0]
+        strokes = self.load(name)
+        if last:
+            return strokes
+        size = sum(a.nbytes for a in strokes)
+        self.entries[name] = (strokes, size)
+        self.size += size
+        if self.budget is None:
+            return strokes
+        # the include just parsed always stays
+        while self.size > self.budget and len(self.entries) > 1:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+        return strokes
 
-        include_rel, segments = _parse_segment_dat(content)
-        if not include_rel or not segments:
+
+def _dat_members(tar):
+    for member in tar:
+        if not member.isfile() or not member.name.endswith('.dat'):
             continue
+        raw = tar.extractfile(member)
+        if raw is not None:
+            yield member.name, raw
 
-        base_prefix = seg_name.rsplit('/data/', 1)[0]
-        include_name = f"{base_prefix}/include/{include_rel}"
 
-        inc_content = include_cache.get(include_name)
-        if inc_content is None:
-            continue
+def _spill(raw, spill) -> tuple[int, int]:
+    """Copy a tar member to the spill file. Returns its (offset, length) there."""
+    offset = spill.tell()
+    shutil.copyfileobj(raw, spill)
+    return offset, spill.tell() - offset
+
+
+def _scan_archive(tgz_path: Path, spill=None):
+    """
+    One forward pass over the archive.
 
-        strokes = _parse_include_dat(inc_content)
-        if not strokes:
+    Returns (segment files, includes, uses): segment files as (include name,
+    [(start, end, label)]) in archive order, includes as name → raw text, or
+    with a spill file name → (offset, length) of the referenced includes
+    copied there, and uses as include name → number of segment files naming it.
+    """
+    seg_files = []
+    includes = {}
+    referenced, unreferenced = Counter(), set()
+    with tarfile.open(str(tgz_path), 'r:gz') as tar:
+        for name, raw in _dat_members(tar):
+            if '/include/' in name:
+                if spill is None:
+                    includes[name] = raw.read().decode('latin1', errors='ignore')
+                elif name in referenced:
+                    includes[name] = _spill(raw, spill)
+                else:
+                    unreferenced.add(name)
+            elif '/data/' in name:
+                include_rel, segments = _parse_segment_dat(raw.read().decode('latin1', errors='ignore'))
+                if not include_rel or not segments:
+                    continue
+                base_prefix = name.rsplit('/data/', 1)[0]
+                include_name = f"{base_prefix}/include/{include_rel}"
+                seg_files.append((include_name, segments))
+                referenced[include_name] += 1
+
+    # includes stored ahead of the segment file naming them need a second pass
+    late = unreferenced & referenced.keys()
+    if late:
+        with tarfile.open(str(tgz_path), 'r:gz') as tar:
+            for name, raw in _dat_members(tar):
+                if name in late:
+                    includes[name] = _spill(raw, spill)
+    return seg_files, includes, referenced
+
+
+def _segment_nodes(segments, strokes):
+    points, offsets = strokes
+    n_strokes = len(offsets) - 1
+    for start_idx, end_idx, label in segments:
+        if end_idx >= n_strokes:
             continue
+        traces = []
+        for i, k in enumerate(range(start_idx, end_idx + 1)):
+            pts = points[offsets[k]:offsets[k + 1]]
+            x = pts[:, 0].tolist()
+            y = pts[:, 1].tolist()
+            if x:
+                traces.append(Trace(x, y, inkml_id=i))
+        if traces:
+            tg = TraceGroup(traces=traces, label=label)
+            yield SymbolNode(trace_group=tg)
+
 
-        for start_idx, end_idx, label in segments:
-            if max_samples is not None and len(nodes) >= max_samples:
-                break
-            if end_idx >= len(strokes):
+def iter_unipen(max_samples: int = None, memory_budget: int = None, spill_dir=None,
+                tgz_path: Path = None):
+    """
+    Stream one SymbolNode per CHARACTER segment of the Unipen archive.
+
+    Parameters
+    ----------
+    max_samples:   Stop after this many nodes.
+    memory_budget: None keeps all include files in memory, as raw text
+                   (~490 MB) until each is parsed, and the parsed strokes
+                   until the last segment file using them. Otherwise only
+                   the includes referenced by a segment file are copied,
+                   uncompressed, to a temporary spill file, and parsed on
+                   demand into an LRU cache of at most about this many bytes.
+    spill_dir:     Directory of the spill file (default: the system temp dir).
+    tgz_path:      Archive to read (default: UNIPEN_TGZ).
+    """
+    tgz_path = Path(tgz_path) if tgz_path is not None else UNIPEN_TGZ
+    if not tgz_path.exists():
+        raise FileNotFoundError(f"Unipen archive not found: {tgz_path}")
+    if max_samples is not None and max_samples <= 0:
+        return
+
+    with ExitStack() as stack:
+        if memory_budget is None:
+            seg_files, includes, uses = _scan_archive(tgz_path)
+
+            def load(name):
+                # parsed once: the raw text is no longer needed
+                return _parse_include_dat(includes.pop(name))
+            cache = _StrokeCache(load, uses)
+        else:
+            spill = stack.enter_context(tempfile.TemporaryFile(dir=spill_dir))
+            seg_files, includes, uses = _scan_archive(tgz_path, spill)
+
+            def load(name):
+                offset, length = includes[name]
+                spill.seek(offset)
+                return _parse_include_dat(spill.read(length).decode('latin1', errors='ignore'))
+            cache = _StrokeCache(load, uses, memory_budget)
+
+        available = set(includes)
+        count = 0
+        for include_name, segments in seg_files:
+            if include_name not in available:
                 continue
-            stroke_block = strokes[start_idx: end_idx + 1]
-            traces = []
-            for i, pts in enumerate(stroke_block):
-                x = [p[0] for p in pts]
-                y = [p[1] for p in pts]
-                if x:
-                    traces.append(Trace(x, y, inkml_id=i))
-            if traces:
-                tg = TraceGroup(traces=traces, label=label)
-                nodes.append(SymbolNode(trace_group=tg))
+            strokes = cache.get(include_name)
+            if len(strokes[1]) == 1:
+                continue
+            for node in _segment_nodes(segments, strokes):
+                yield node
+                count += 1
+                if max_samples is not None and count >= max_samples:
+                    return
+
 
-    return nodes
+def load_unipen(max_samples: int = None, memory_budget: int = None, spill_dir=None) -> list[SymbolNode]:
+    """Load Unipen tgz archive → list of SymbolNode (see iter_unipen)."""
+    return list(iter_unipen(max_samples, memory_budget, spill_dir))
 
 
-def count_unipen_segments() -> int:
+def count_unipen_segments(tgz_path: Path = None) -> int:
     """Count raw CHARACTER segments declared in Unipen segment files."""
-    if not UNIPEN_TGZ.exists():
+    tgz_path = Path(tgz_path) if tgz_path is not None else UNIPEN_TGZ
+    if not tgz_path.exists():
         return 0
     total = 0
-    with tarfile.open(str(UNIPEN_TGZ), 'r:gz') as tar:
+    with tarfile.open(str(tgz_path), 'r:gz') as tar:
         for member in tar:
             if not member.isfile() or not member.name.endswith('.dat'):
                 continue
@@ -2,3 +2,8 @@ from ink.traces.trace import Trace
 from ink.traces.trace_group import TraceGroup
 from ink.nodes.relation_node import RelationNode
 from ink.graph import load_inkml_file, load_inkml_files
+from ink.latex import latex_many
+from ink.hashing import graph_hashes
+from ink.slt import symbol_layout_tree
+from ink.mathml import write_mathml
+from ink.spatial import spatial_index
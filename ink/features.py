@@ -0,0 +1,139 @@
+"""
+Pairwise geometric features of the symbols of a relation graph.
+
+For a graph with N symbols (the objects of its Symbol Layout Tree, see
+ink/slt.py) pair_features() returns an (N·N, F) float32 matrix with one row
+per ordered pair (i, j), row i·N + j, and an int8 vector with the relation
+of the SLT edge i → j (index into LABELS, 0 = no edge). All features are
+computed at once by broadcasting over the packed (N, 4) bounding boxes.
+
+Boxes are (left, y_min, right, y_max) with y growing downwards (InkML), so a
+positive dy means j lies below i. Distances are divided by the median symbol
+height of the graph unless normalize=False; ratios are scale-free.
+"""
+
+import numpy as np
+
+from ink.slt import RELATIONS, symbol_layout_tree
+
+LABELS = ("NoRelation",) + RELATIONS
+LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
+
+FEATURE_NAMES = (
+    "dx_center",         # centre of j − centre of i
+    "dy_center",
+    "distance",          # centre distance
+    "angle_sin",         # direction i → j of the centres
+    "angle_cos",
+    "dx_left",           # left edge of j − left edge of i
+    "dx_right",
+    "dy_top",
+    "dy_bottom",
+    "h_gap",             # left of j − right of i (negative: overlap)
+    "v_gap",             # top of j − bottom of i
+    "overlap_x",         # intersection width / smaller width
+    "overlap_y",         # intersection height / smaller height
+    "iou",               # box intersection over union
+    "log_width_ratio",   # log(width j / width i)
+    "log_height_ratio",
+    "log_area_ratio",
+)
+
+# relative floor for box sizes, so dots and lines keep finite ratios
+_SIZE_EPS = 1e-2
+
+
+def symbol_boxes(nodes: list) -> np.ndarray:
+    """(N, 4) bounding boxes of nodes owning ink; NaN rows for empty symbols."""
+    traces = [t for node in nodes for t in node.trace_group.traces]
+    counts = np.array([sum(len(t.x) for t in node.trace_group.traces) for node in nodes], dtype=np.int64)
+    boxes = np.full((len(nodes), 4), np.nan)
+    if not counts.sum():
+        return boxes
+    xs = np.concatenate([np.asarray(t.x, dtype=np.float64) for t in traces])
+    ys = np.concatenate([np.asarray(t.y, dtype=np.float64) for t in traces])
+    filled = counts > 0
+    starts = (np.cumsum(counts) - counts)[filled]
+    boxes[filled] = np.column_stack((
+        np.minimum.reduceat(xs, starts),
+        np.minimum.reduceat(ys, starts),
+        np.maximum.reduceat(xs, starts),
+        np.maximum.reduceat(ys, starts),
+    ))
+    return boxes
+
+
+def box_features(boxes: np.ndarray, normalize: bool = True) -> np.ndarray:
+    """(N·N, F) pairwise features of packed boxes, row i·N + j for the pair (i, j)."""
+    boxes = np.asarray(boxes, dtype=np.float64)
+    n = len(boxes)
+    if n == 0:
+        return np.empty((0, len(FEATURE_NAMES)), dtype=np.float32)
+    x0, y0, x1, y1 = boxes.T
+    width, height = x1 - x0, y1 - y0
+
+    scale = 1.0
+    if normalize:
+        heights = height[height > 0]
+        if len(heights):
+            scale = float(np.median(heights))
+    eps = _SIZE_EPS * scale
+    width, height = np.maximum(width, eps), np.maximum(height, eps)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+
+    def delta(a, b=None):
+        """a[j] − b[i] over all pairs as an (N, N) array."""
+        return a[None, :] - (a if b is None else b)[:, None]
+
+    dx, dy = delta(cx), delta(cy)
+    distance = np.hypot(dx, dy)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        angle_sin = np.where(distance > 0, dy / distance, 0.0)
+        angle_cos = np.where(distance > 0, dx / distance, 0.0)
+
+    inter_w = np.clip(np.minimum(x1[None, :], x1[:, None]) - np.maximum(x0[None, :], x0[:, None]), 0, None)
+    inter_h = np.clip(np.minimum(y1[None, :], y1[:, None]) - np.maximum(y0[None, :], y0[:, None]), 0, None)
+    area = width * height
+    intersection = inter_w * inter_h
+    iou = intersection / (area[None, :] + area[:, None] - intersection)
+
+    features = np.stack((
+        dx / scale,
+        dy / scale,
+        distance / scale,
+        angle_sin,
+        angle_cos,
+        delta(x0) / scale,
+        delta(x1) / scale,
+        delta(y0) / scale,
+        delta(y1) / scale,
+        delta(x0, x1) / scale,
+        delta(y0, y1) / scale,
+        inter_w / np.minimum(width[None, :], width[:, None]),
+        inter_h / np.minimum(height[None, :], height[:, None]),
+        iou,
+        delta(np.log(width)),
+        delta(np.log(height)),
+        delta(np.log(area)),
+    ), axis=-1)
+    return features.reshape(n * n, len(FEATURE_NAMES)).astype(np.float32)
+
+
+def relation_labels(slt) -> np.ndarray:
+    """(N·N,) int8 LABELS index of the SLT edge i → j for every pair."""
+    n = len(slt.objects)
+    labels = np.zeros(n * n, dtype=np.int8)
+    for i, j, relation in slt.edges:
+        labels[i * n + j] = LABEL_INDEX[relation]
+    return labels
+
+
+def pair_features(root, normalize: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return (features, labels) for all ordered symbol pairs of a graph.
+
+    features: (N·N, len(FEATURE_NAMES)) float32, row i·N + j
+    labels:   (N·N,) int8 index into LABELS of the relation i → j
+    """
+    slt = symbol_layout_tree(root)
+    return box_features(symbol_boxes(slt.objects), normalize=normalize), relation_labels(slt)
@@ -0,0 +1,116 @@
+"""
+Canonical hashes of relation graphs.
+
+Two 128-bit BLAKE2b digests are computed per node in a single post-order
+traversal and cached on the nodes (see RelationNode.invalidate_cache):
+
+  structure hash – node types, symbol labels and child order
+  ink hash       – structure hash + stroke coordinates quantised to `quantum`
+
+Digests are stable across processes and Python versions (unlike hash()),
+so they can be stored, compared between dataset splits and used as dict
+keys for O(1) equality, set membership and grouping.
+
+Only the child-management methods invalidate cached digests. Labels
+changed in place (trace_group.label = ..., set_label()) and ink edited in
+place on trace groups are not tracked: call clear_cache() on the graph
+after such edits, or both digests stay stale.
+"""
+
+import hashlib
+from collections import defaultdict
+
+import numpy as np
+
+# default quantisation step for ink hashes (InkTree stores 4 decimals)
+INK_QUANTUM = 1e-3
+
+_DIGEST_SIZE = 16
+_NONE_DIGEST = bytes(_DIGEST_SIZE)  # placeholder for missing (None) children
+
+
+def _has_hashes(node, ink_key) -> bool:
+    cache = node._cache
+    return cache is not None and "structure_hash" in cache and ink_key in cache
+
+
+def _update_with_ink(hasher, trace_group, quantum: float):
+    traces = trace_group.traces
+    if not traces:
+        return
+    # one quantisation call per group: [k, len_1, ..., len_k] + [x..., y...]
+    lengths = [len(traces)] + [len(trace.x) for trace in traces]
+    values = [v for trace in traces for v in trace.x]
+    values.extend(v for trace in traces for v in trace.y)
+    hasher.update(np.asarray(lengths, dtype=np.int64).tobytes())
+    hasher.update(np.rint(np.asarray(values, dtype=np.float64) / quantum).astype(np.int64).tobytes())
+
+
+def graph_hashes(root, quantum: float = INK_QUANTUM) -> tuple[bytes, bytes]:
+    """
+    Return (structure_hash, ink_hash) of a graph, hashing only uncached subtrees.
+
+    Call root.clear_cache() first after relabelling or moving ink in place.
+    """
+    ink_key = ("ink_hash", quantum)
+    if not _has_hashes(root, ink_key):
+        # pre-order walk that stops at already hashed subtrees
+        order, stack = [], [root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if not _has_hashes(node, ink_key):
+                stack.extend(c for c in node.children if c is not None)
+
+        for node in reversed(order):
+            if _has_hashes(node, ink_key):
+                continue
+            tg = node.trace_group
+            structure = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+            structure.update(type(node).__name__.encode())
+            structure.update(b"\0")
+            if tg is not None and tg.label is not None:
+                structure.update(str(tg.label).encode())
+            structure.update(b"\0")
+            children = [c._cache if c is not None else None for c in node.children]
+            for cache in children:
+                structure.update(cache["structure_hash"] if cache is not None else _NONE_DIGEST)
+            structure_hash = structure.digest()
+
+            ink = hashlib.blake2b(structure_hash, digest_size=_DIGEST_SIZE)
+            if tg is not None:
+                _update_with_ink(ink, tg, quantum)
+            for cache in children:
+                ink.update(cache[ink_key] if cache is not None else _NONE_DIGEST)
+
+            if node._cache is None:
+                node._cache = {}
+            node._cache["structure_hash"] = structure_hash
+            node._cache[ink_key] = ink.digest()
+
+    return root._cache["structure_hash"], root._cache[ink_key]
+
+
+def structure_hash(root) -> bytes:
+    """Digest of node types + labels; equal for graphs with identical structure."""
+    return graph_hashes(root)[0]
+
+
+def ink_hash(root, quantum: float = INK_QUANTUM) -> bytes:
+    """Digest of structure + quantised ink; equal for graphs with identical content."""
+    return graph_hashes(root, quantum)[1]
+
+
+def graphs_equal(a, b, ink: bool = False, quantum: float = INK_QUANTUM) -> bool:
+    """Compare two graphs by structure (or structure + ink) via their cached digests."""
+    i = 1 if ink else 0
+    return graph_hashes(a, quantum)[i] == graph_hashes(b, quantum)[i]
+
+
+def group_graphs(graphs, ink: bool = False, quantum: float = INK_QUANTUM) -> dict[bytes, list[int]]:
+    """Group graph indices by structure hash (or ink hash if ink=True)."""
+    i = 1 if ink else 0
+    groups = defaultdict(list)
+    for idx, graph in enumerate(graphs):
+        groups[graph_hashes(graph, quantum)[i]].append(idx)
+    return dict(groups)
@@ -1,14 +1,7 @@
 import xml.etree.ElementTree as ET
 
-import numpy as np
-
+from ink.lg import build_relation_graph, read_lg
 from ink.nodes.node_utils import finalize_graph
-from ink.nodes.frac_node import FracNode
-from ink.nodes.row_node import RowNode
-from ink.nodes.sqrt_node import SqrtNode
-from ink.nodes.sub_node import SubNode
-from ink.nodes.sup_node import SupNode
-from ink.nodes.symbol_node import SymbolNode
 from ink.nodes.nodes_factory import create_relation_node, get_undefined_node_from_trace_groups
 from ink.traces.trace import Trace
 from ink.traces.trace_group import TraceGroup
@@ -175,60 +168,23 @@ class InkmlProcessor:
         return relation_graph
 
     def get_relation_graph_from_sym_lg(self, trace_groups, sym_lg_path):
-        sym_lg = np.genfromtxt(sym_lg_path, delimiter=", ", dtype=str)
-        objects = sym_lg[sym_lg[:, 0] == 'O'][:, [1, 4]]
-        relations = sym_lg[sym_lg[:, 0] == 'R'][:, 1:4]
-
-        origin_id = next((id for id, relation_str in objects if relation_str == "O"), None)
+        lg = read_lg(sym_lg_path)
+        # symLG files mark the origin object with the path "O" in the first stroke column
+        origin_id = next((id for id, (_, strokes) in lg.objects.items() if strokes[:1] == ["O"]), None)
         if origin_id is None:
             print(f"Error: Origin trace group not found in file {self.file_path}")
             return None
 
-        origin_tg = next((tg for tg in trace_groups if tg.math_annotation == origin_id), None)
-        if origin_tg is None:
+        tg_by_id = {tg.math_annotation: tg for tg in trace_groups}
+        if origin_id not in tg_by_id:
             print(f"Error: Origin trace group not found in file {self.file_path}")
             return None
+        if any(id_1 not in tg_by_id or id_2 not in tg_by_id for id_1, id_2, _ in lg.relations):
+            print(f"Error: Trace group not found in file {self.file_path}")
+            return None
 
-        tg_relations = []
-        for id_1, id_2, relation in relations:
-            tg1 = next((tg for tg in trace_groups if tg.math_annotation == id_1), None)
-            tg2 = next((tg for tg in trace_groups if tg.math_annotation == id_2), None)
-            if tg1 is None or tg2 is None:
-                print(f"Error: Trace group not found in file {self.file_path}")
-                return None
-            tg_relations.append((tg1, tg2, relation))
-
-        return InkmlProcessor.create_node(origin_tg, tg_relations)
-
-    @staticmethod
-    def create_node(trace_group, tg_relations):
-        relation_partners_and_types = []
-        for relation in tg_relations:
-            if relation[0].math_annotation == trace_group.math_annotation:
-                relation_partners_and_types.append(({"partner": relation[1], "type": relation[2]}))
-
-        above_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Above"]
-        below_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Below"]
-        sub_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Sub"]
-        sup_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Sup"]
-        right_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Right"]
-        inside_node = [relation["partner"] for relation in relation_partners_and_types if relation["type"] == "Inside"]
-
-        this_node = SymbolNode(trace_group=trace_group)
-        if len(above_node) == 1 and len(below_node) == 1 and trace_group.label == "-":
-            above_node = InkmlProcessor.create_node(above_node[0], tg_relations)
-            below_node = InkmlProcessor.create_node(below_node[0], tg_relations)
-            this_node = FracNode(children=[above_node, below_node], trace_group=trace_group)
-        if len(inside_node) == 1 and trace_group.label == "\\sqrt":
-            inside_node = InkmlProcessor.create_node(inside_node[0], tg_relations)
-            this_node = SqrtNode(children=[inside_node], trace_group=trace_group)
-        if len(sub_node) == 1:
-            sub_node = InkmlProcessor.create_node(sub_node[0], tg_relations)
-            this_node = SubNode(children=[this_node, sub_node])
-        if len(sup_node) == 1:
-            sup_node = InkmlProcessor.create_node(sup_node[0], tg_relations)
-            this_node = SupNode(children=[this_node, sup_node])
-        if len(right_node) == 1:
-            right_node = InkmlProcessor.create_node(right_node[0], tg_relations)
-            this_node = RowNode(children=[this_node, right_node])
-        return this_node
+        try:
+            return build_relation_graph(lg, tg_by_id, root_id=origin_id)
+        except (KeyError, ValueError) as e:
+            print(f"Error: Invalid label graph in file {self.file_path}: {e}")
+            return None
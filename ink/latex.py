@@ -0,0 +1,100 @@
+"""
+Token-stream LaTeX serialisation for relation graphs.
+
+RowNode.latex() hands the LaTeX tokens of its children to join_row_tokens(),
+which in one left-to-right pass
+  - rewrites matching bracket pairs to \\left ... \\right,
+  - merges spelled-out function names (s i n → \\sin, ...),
+  - collapses runs of "." / "\\cdot" into \\ldots / \\cdots.
+
+latex_many() serialises a batch of graphs. With memoize=True every subtree
+result is stored on its node (see RelationNode.cached_latex) and reused by
+later memoized calls until the node or one of its descendants is mutated
+through the child-management methods; after direct attribute edits call
+clear_cache(). Plain latex() never reads these results.
+"""
+
+# spelled-out function names merged into a single operator token
+_FUNCTIONS = {
+    ("s", "i", "n"): "\\sin",
+    ("c", "o", "s"): "\\cos",
+    ("l", "o", "g"): "\\log",
+    ("l", "i", "m"): "\\lim",
+    ("t", "a", "n"): "\\tan",
+}
+_FUNCTION_HEADS = {name[0] for name in _FUNCTIONS}
+
+# bracket token → stack index (0: {, 1: [, 2: ()
+_OPENING = {"\\{": 0, "[": 1, "(": 2}
+_CLOSING = {"\\}": 0, "]": 1, ")": 2}
+
+# repeated token → replacement for every complete group of three
+_RUNS = {".": "\\ldots", "\\cdot": "\\cdots"}
+
+
+def join_row_tokens(tokens: list) -> str:
+    """Join the LaTeX tokens of a row in a single linear pass."""
+    out = []
+    stacks = ([], [], [])
+    n = len(tokens)
+    i = 0
+    while i < n:
+        token = tokens[i]
+
+        if token in _FUNCTION_HEADS and i + 2 < n:
+            function = _FUNCTIONS.get((token, tokens[i + 1], tokens[i + 2]))
+            if function is not None:
+                out.append(function)
+                i += 3
+                continue
+
+        if token in _OPENING:
+            stacks[_OPENING[token]].append(len(out))
+            out.append(token)
+        elif token in _CLOSING:
+            stack = stacks[_CLOSING[token]]
+            if stack:
+                opening = stack.pop()
+                out[opening] = "\\left" + out[opening]
+                out.append("\\right" + token)
+            else:
+                out.append(token)
+        elif token in _RUNS:
+            j = i + 1
+            while j < n and tokens[j] == token:
+                j += 1
+            groups, rest = divmod(j - i, 3)
+            out.extend([_RUNS[token]] * groups)
+            out.extend([token] * rest)
+            i = j
+            continue
+        else:
+            out.append(token)
+        i += 1
+
+    return " ".join(out)
+
+
+def latex_many(graphs, memoize: bool = False, fallback: str = None) -> list[str]:
+    """
+    Serialise a batch of graphs to LaTeX.
+
+    Parameters
+    ----------
+    graphs:   Iterable of root RelationNode objects.
+    memoize:  Store every subtree result on its node so that repeated
+              memoized calls (logging, evaluation, ...) only serialise
+              mutated subtrees. Call clear_cache() on graphs edited through
+              direct attribute assignment.
+    fallback: If not None, returned for graphs whose serialisation raises
+              instead of propagating the exception.
+    """
+    results = []
+    for graph in graphs:
+        try:
+            results.append(graph.cached_latex() if memoize else graph.latex())
+        except Exception:
+            if fallback is None:
+                raise
+            results.append(fallback)
+    return results
@@ -0,0 +1,173 @@
+"""
+CROHME label graph (.lg) parsing and graph construction.
+
+An object-level label graph lists symbols and the relations between them:
+
+  O, <object id>, <label>, <weight>, <stroke id>, <stroke id>, ...
+  R, <parent id>, <child id>, <relation>, <weight>     (EO is read as R)
+
+parse_lg() reads these lines into hash maps in one pass, and
+build_relation_graph() turns the edges into a RelationNode graph in linear
+time without recursion. Relations are interpreted as in ink/slt.py:
+
+  Right            next node of the row
+  Above + Below    fraction (bar labelled "-")
+  Inside (+ Above) \\sqrt radicand (and root index)
+  Below (+ Above)  under (and over) limits of any other symbol
+  Sub / Sup        scripts of a symbol (both: SubSupNode)
+
+Edges are only followed where they are unambiguous (one edge of each kind
+per object); other edges are ignored, so their targets are left out.
+"""
+
+from ink.nodes.frac_node import FracNode
+from ink.nodes.root_node import RootNode
+from ink.nodes.row_node import RowNode
+from ink.nodes.sqrt_node import SqrtNode
+from ink.nodes.sub_node import SubNode
+from ink.nodes.sub_sup_node import SubSupNode
+from ink.nodes.sup_node import SupNode
+from ink.nodes.symbol_node import SymbolNode
+from ink.nodes.under_node import UnderNode
+from ink.nodes.under_over_node import UnderOverNode
+
+# LG spellings of labels that clash with the file syntax
+_LABEL_ALIASES = {"COMMA": ","}
+
+
+class LabelGraph:
+    """
+    Objects and relations of a label graph.
+
+    objects:   object id → (label, [stroke ids]) in file order
+    relations: list of (parent id, child id, relation) in file order
+    """
+
+    def __init__(self, objects: dict, relations: list):
+        self.objects = objects
+        self.relations = relations
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __repr__(self):
+        return f"LabelGraph({len(self.objects)} objects, {len(self.relations)} relations)"
+
+    def root_id(self):
+        """The only object that is no relation target, else None."""
+        targets = {child for _, child, _ in self.relations}
+        roots = [i for i in self.objects if i not in targets]
+        return roots[0] if len(roots) == 1 else None
+
+
+def parse_lg(text: str) -> LabelGraph:
+    """Parse the O / R (EO) lines of a label graph; other lines are skipped."""
+    objects, relations = {}, []
+    for line in text.splitlines():
+        if not line or line[0] not in "OER":
+            continue
+        fields = [f.strip() for f in line.split(",")]
+        kind = fields[0]
+        if kind == "O" and len(fields) >= 3:
+            label = _LABEL_ALIASES.get(fields[2], fields[2])
+            objects[fields[1]] = (label, fields[4:])
+        elif kind in ("R", "EO") and len(fields) >= 4:
+            relations.append((fields[1], fields[2], fields[3]))
+    return LabelGraph(objects, relations)
+
+
+def read_lg(path) -> LabelGraph:
+    with open(path, encoding="utf-8", errors="replace") as fh:
+        return parse_lg(fh.read())
+
+
+def _follow(edges: dict, relation: str):
+    targets = edges.get(relation)
+    return targets[0] if targets is not None and len(targets) == 1 else None
+
+
+def build_relation_graph(lg: LabelGraph, trace_groups: dict, root_id=None):
+    """
+    Build the RelationNode graph of a label graph.
+
+    Parameters
+    ----------
+    lg:           Parsed label graph.
+    trace_groups: object id → TraceGroup of the symbol.
+    root_id:      Object starting the main baseline (default: lg.root_id()).
+
+    Returns the root node, or None if there is no root. Raises KeyError for
+    objects without trace group and ValueError if the followed edges do not
+    form a tree.
+    """
+    if root_id is None:
+        root_id = lg.root_id()
+    if root_id is None:
+        return None
+
+    out = {}  # object id → relation → [child ids]
+    for parent, child, relation in lg.relations:
+        out.setdefault(parent, {}).setdefault(relation, []).append(child)
+
+    # decide which edges are followed, then order objects parents-first
+    layout = {}  # object id → (kind, {role: child id})
+    order, seen, stack = [], set(), [root_id]
+    while stack:
+        i = stack.pop()
+        if i in seen:
+            raise ValueError(f"Object {i} is reached twice")
+        seen.add(i)
+        order.append(i)
+        edges = out.get(i, {})
+        label = lg.objects[i][0] if i in lg.objects else None
+        above, below = _follow(edges, "Above"), _follow(edges, "Below")
+        inside = _follow(edges, "Inside")
+        roles = {}
+        if label == "-" and above is not None and below is not None:
+            kind = "frac"
+            roles.update(numer=above, denom=below)
+        elif label == "\\sqrt" and inside is not None:
+            kind = "sqrt" if above is None else "root"
+            roles.update(inner=inside, index=above)
+        else:
+            kind = "symbol"
+            roles.update(under=below, over=above if below is not None else None)
+        roles.update(sub=_follow(edges, "Sub"), sup=_follow(edges, "Sup"), right=_follow(edges, "Right"))
+        roles = {role: child for role, child in roles.items() if child is not None}
+        layout[i] = (kind, roles)
+        stack.extend(reversed(list(roles.values())))
+
+    # children come after their parent in `order`: build bottom-up
+    element = {}
+
+    def row(i):
+        nodes = []
+        while i is not None:
+            nodes.append(element[i])
+            i = layout[i][1].get("right")
+        return nodes[0] if len(nodes) == 1 else RowNode(children=nodes)
+
+    for i in reversed(order):
+        kind, roles = layout[i]
+        trace_group = trace_groups[i]
+        if kind == "frac":
+            node = FracNode(children=[row(roles["numer"]), row(roles["denom"])], trace_group=trace_group)
+        elif kind == "sqrt":
+            node = SqrtNode(children=[row(roles["inner"])], trace_group=trace_group)
+        elif kind == "root":
+            node = RootNode(children=[row(roles["inner"]), row(roles["index"])], trace_group=trace_group)
+        else:
+            node = SymbolNode(trace_group=trace_group)
+            if "over" in roles:
+                node = UnderOverNode(children=[node, row(roles["under"]), row(roles["over"])])
+            elif "under" in roles:
+                node = UnderNode(children=[node, row(roles["under"])])
+        if "sub" in roles and "sup" in roles:
+            node = SubSupNode(children=[node, row(roles["sub"]), row(roles["sup"])])
+        elif "sub" in roles:
+            node = SubNode(children=[node, row(roles["sub"])])
+        elif "sup" in roles:
+            node = SupNode(children=[node, row(roles["sup"])])
+        element[i] = node
+
+    return row(root_id)
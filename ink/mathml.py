@@ -0,0 +1,181 @@
+"""
+Streaming MathML serialisation for relation graphs.
+
+write_mathml() emits the Presentation MathML of a graph as text in one
+iterative traversal, without building an xml.etree tree. With the default
+flat_rows=False the markup is identical to ElementTree.tostring() of
+get_math_ml(), including the right-nested CROHME-style rows
+
+  <mrow>a<mrow>+<mrow>b ... </mrow></mrow></mrow>
+
+while flat_rows=True writes every row as a single <mrow> with all children.
+Node types without a get_math_ml() are written as follows: LineNode as
+<mline> (as read by nodes_factory), NoisyNode as its base relation (noise
+strokes have no place in the formula).
+
+Symbols, fraction bars and radicals carry an xml:id taken from `ids`
+(node → id) if given, else from trace_group.math_annotation.
+"""
+
+import io
+from xml.sax.saxutils import escape, quoteattr
+
+from ink.nodes.any_relation_node import AnyRelationNode
+from ink.nodes.frac_node import FracNode
+from ink.nodes.lines_node import LineNode
+from ink.nodes.noisy_node import NoisyNode
+from ink.nodes.placeholder_node import PlaceholderNode
+from ink.nodes.root_node import RootNode
+from ink.nodes.row_node import RowNode
+from ink.nodes.sqrt_node import SqrtNode
+from ink.nodes.sub_node import SubNode
+from ink.nodes.sub_sup_node import SubSupNode
+from ink.nodes.sup_node import SupNode
+from ink.nodes.symbol_node import SymbolNode, _operators
+from ink.nodes.under_node import UnderNode
+from ink.nodes.under_over_node import UnderOverNode
+
+MATHML_NAMESPACE = "http://www.w3.org/1998/Math/MathML"
+
+# node type → element whose children are the node's children in order
+_SIMPLE_TAGS = {
+    SubSupNode: "msubsup",
+    UnderNode: "munder",
+    UnderOverNode: "munderover",
+    AnyRelationNode: "any",
+    LineNode: "mline",
+}
+# nodes with an own symbol (xml:id) whose children are written in order
+_ID_TAGS = {
+    FracNode: "mfrac",
+    SqrtNode: "msqrt",
+    RootNode: "mroot",
+}
+
+
+def _open(tag: str, xml_id=None) -> str:
+    if xml_id is None:
+        return f"<{tag}>"
+    return f"<{tag} xml:id={quoteattr(str(xml_id))}>"
+
+
+def _xml_id(node, ids):
+    if ids is not None:
+        return ids.get(node)
+    tg = node.trace_group
+    return tg.math_annotation if tg is not None else None
+
+
+_symbol_markup = {}  # label → (tag, escaped text)
+
+
+def _symbol(node, ids) -> str:
+    label = node.get_label()
+    markup = _symbol_markup.get(label)
+    if markup is None:
+        if label.isdigit():
+            tag = "mn"
+        elif label in _operators:
+            tag = "mo"
+        else:
+            tag = "mi"
+        markup = _symbol_markup[label] = (tag, escape(label))
+    tag, text = markup
+    return f"{_open(tag, _xml_id(node, ids))}{text}</{tag}>"
+
+
+def _tokens(node, flat_rows: bool, ids) -> list:
+    """Markup of one node as a list of strings and child nodes, in output order."""
+    node_type = type(node)
+    children = [c for c in node.children if c is not None]
+
+    if node_type in _SIMPLE_TAGS:
+        tag = _SIMPLE_TAGS[node_type]
+        return [f"<{tag}>", *children, f"</{tag}>"]
+
+    if node_type in _ID_TAGS:
+        tag = _ID_TAGS[node_type]
+        return [_open(tag, _xml_id(node, ids)), *children, f"</{tag}>"]
+
+    if node_type is RowNode:
+        if flat_rows or len(children) <= 2:
+            return ["<mrow>", *children, "</mrow>"]
+        # right-nested: every middle child opens a new <mrow> holding the rest
+        tokens = ["<mrow>", children[0]]
+        for child in children[1:-1]:
+            tokens += ["<mrow>", child]
+        tokens.append(children[-1])
+        tokens.append("</mrow>" * (len(children) - 1))
+        return tokens
+
+    if node_type is SubNode:
+        base, sub = node.get_base(), node.get_local_sub()
+        tag = "munder" if isinstance(base, SymbolNode) and base.get_label() == "\\lim" else "msub"
+        return [f"<{tag}>", base, sub, f"</{tag}>"]
+
+    if node_type is SupNode:
+        base, sup = node.get_base(), node.get_local_sup()
+        if isinstance(base, SubNode):
+            return ["<msubsup>", base.get_base(), base.get_local_sub(), sup, "</msubsup>"]
+        return ["<msup>", base, sup, "</msup>"]
+
+    if node_type is NoisyNode:
+        return [node.base_relation] if node.base_relation is not None else []
+
+    if node_type is PlaceholderNode:
+        return ["<mi>□</mi>"]
+
+    if isinstance(node, SymbolNode):
+        return [_symbol(node, ids)]
+
+    raise TypeError(f"No MathML for node type {node_type.__name__}")
+
+
+def write_mathml(root, out, flat_rows: bool = False, ids: dict = None, namespace: bool = True):
+    """
+    Write the MathML of a graph to a text stream (anything with .write()).
+
+    Parameters
+    ----------
+    root:      Root RelationNode.
+    out:       Text file or buffer.
+    flat_rows: Write each row as one <mrow> instead of nested binary rows.
+    ids:       Optional node → xml:id mapping (default: math_annotation).
+    namespace: Wrap in <math xmlns="...MathML">; False writes the bare element.
+
+    Raises TypeError for node types without a MathML form.
+    """
+    parts = [f'<math xmlns="{MATHML_NAMESPACE}">'] if namespace else []
+    stack = [root] if root is not None else []
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+            continue
+        if type(item) is SymbolNode:
+            parts.append(_symbol(item, ids))
+            continue
+        tokens = _tokens(item, flat_rows, ids)
+        # leading markup is written right away, the rest waits on the stack
+        k = 0
+        while k < len(tokens) and isinstance(tokens[k], str):
+            parts.append(tokens[k])
+            k += 1
+        stack.extend(reversed(tokens[k:]))
+    if namespace:
+        parts.append("</math>")
+    out.write("".join(parts))
+
+
+def mathml_string(root, flat_rows: bool = False, ids: dict = None, namespace: bool = True) -> str:
+    """write_mathml() into a string."""
+    buffer = io.StringIO()
+    write_mathml(root, buffer, flat_rows=flat_rows, ids=ids, namespace=namespace)
+    return buffer.getvalue()
+
+
+def write_annotation_xml(root, out, flat_rows: bool = False, ids: dict = None):
+    """Write an InkML <annotationXML> element holding the graph's MathML."""
+    out.write('<annotationXML encoding="Content-MathML">')
+    write_mathml(root, out, flat_rows=flat_rows, ids=ids)
+    out.write("</annotationXML>")
@@ -3,7 +3,7 @@ Fallback node used when no structured relation graph could be parsed from InkML.
 Filter these out with node.contains_undefined_relations().
 """
 
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 import xml.etree.cElementTree as ET
 
 
@@ -59,6 +59,7 @@ class AnyRelationNode(RelationNode):
             latex=self.pre_defined_latex,
         )
 
+    @memoized_latex
     def latex(self):
         return "" if self.pre_defined_latex is None else self.pre_defined_latex.replace("$", "")
 
@@ -1,6 +1,6 @@
 from ink.nodes.any_relation_node import AnyRelationNode
 from ink.nodes.placeholder_node import PlaceholderNode
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.sub_node import beautified_subs
 from ink.nodes.sup_node import beautified_sups
 from ink.nodes.symbol_node import SymbolNode
@@ -21,6 +21,7 @@ class FracNode(RelationNode):
             raise ValueError("FracNode can only have two children")
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for i, c in enumerate(self.children):
             if c is None or c is node or c.is_empty():
                 self.children[i] = None
@@ -78,6 +79,7 @@ class FracNode(RelationNode):
                 return beautified_sups[numer] + beautified_frac_symbol + beautified_subs[denom]
         return f"{numer}/{denom}"
 
+    @memoized_latex
     def latex(self):
         above = self.get_above()
         below = self.get_below()
@@ -103,6 +105,7 @@ class FracNode(RelationNode):
         return mfrac
 
     def fill_placeholders(self):
+        self.invalidate_cache()
         if len(self.children) < 2:
             self.children += [None] * (2 - len(self.children))
         for i in range(2):
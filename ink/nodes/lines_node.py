@@ -1,4 +1,4 @@
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 
 
 class LineNode(RelationNode):
@@ -45,5 +45,6 @@ class LineNode(RelationNode):
     def copy(self, parent=None):
         return LineNode(parent=parent, children=[c.copy(parent=self) for c in self.children])
 
+    @memoized_latex
     def latex(self):
         return "\n".join(c.latex() for c in self.children)
@@ -2,7 +2,7 @@
 NoisyNode wraps a clean formula graph alongside stray stroke symbols (noise).
 """
 
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.symbol_node import SymbolNode
 
 
@@ -13,6 +13,7 @@ class NoisyNode(RelationNode):
         self.base_relation = base_relation
         self.noise_nodes = noise_nodes
 
+    @memoized_latex
     def latex(self):
         return self.base_relation.latex()
 
@@ -42,6 +43,7 @@ class NoisyNode(RelationNode):
         self.noise_nodes = [c for c in self.children[1:] if isinstance(c, SymbolNode)]
 
     def remove_node(self, node):
+        self.invalidate_cache()
         if node in self.noise_nodes:
             self.noise_nodes = [n for n in self.noise_nodes if n is not node]
             self.set_children(([self.base_relation] if self.base_relation else []) + self.noise_nodes)
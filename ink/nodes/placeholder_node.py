@@ -1,4 +1,4 @@
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 import xml.etree.cElementTree as ET
 
 
@@ -6,6 +6,7 @@ class PlaceholderNode(RelationNode):
     def __init__(self, trace_group=None, parent=None):
         super().__init__(trace_group=trace_group, parent=parent, children=[])
 
+    @memoized_latex
     def latex(self):
         return "{}"
 
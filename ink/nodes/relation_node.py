@@ -1,7 +1,34 @@
+import functools
+import threading
+
+from ink.hashing import INK_QUANTUM, graph_hashes
+from ink.spatial import LEAF_SIZE, spatial_index
 from ink.traces.trace_group import TraceGroup
 
 
+# set while cached_latex() runs: only then does latex() read the node caches,
+# so a plain latex() call never returns a stale result
+_latex_memo = threading.local()
+
+
+def memoized_latex(latex):
+    """Serve latex() from the node cache, during cached_latex() only."""
+    @functools.wraps(latex)
+    def wrapper(self):
+        cache = self._cache
+        if cache is not None and getattr(_latex_memo, "active", False):
+            if "latex" in cache:
+                return cache["latex"]
+            if "latex_error" in cache:
+                raise cache["latex_error"]
+        return latex(self)
+    return wrapper
+
+
 class RelationNode:
+    # per-node memo (latex, ...); dropped by invalidate_cache() on mutation
+    _cache = None
+
     def __init__(self, parent=None, trace_group=None, children=None):
         self.parent = parent
         self.trace_group: TraceGroup = trace_group
@@ -18,16 +45,19 @@ class RelationNode:
     # ── child management ────────────────────────────────────────────────────
 
     def set_children(self, children):
+        self.invalidate_cache()
         self.children = []
         for child in children:
             self.add_child(child)
 
     def add_child(self, child):
+        self.invalidate_cache()
         if child is not None:
             child.parent = self
         self.children.append(child)
 
     def replace_child(self, old_child, new_child):
+        self.invalidate_cache()
         self.children = [new_child if c is old_child else c for c in self.children]
         if new_child is not None:
             new_child.parent = self
@@ -39,6 +69,7 @@ class RelationNode:
         if self.parent is not None:
             self.parent.replace_child(self, node)
         else:
+            self.invalidate_cache()
             self.__class__ = node.__class__
             self.trace_group = node.trace_group
             self.parent = None
@@ -47,6 +78,7 @@ class RelationNode:
             self.set_children(node.children)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         self.set_children([c for c in self.children if c is not node])
         for child in self.children:
             child.remove_node(node)
@@ -60,6 +92,98 @@ class RelationNode:
     def is_empty(self):
         return len(self.children) == 0 or all(c is None or c.is_empty() for c in self.children)
 
+    # ── copying ─────────────────────────────────────────────────────────────
+
+    def cow_copy(self, parent=None):
+        """
+        Structural copy of this subtree that shares the stroke coordinates.
+
+        Nodes, TraceGroups and Trace wrappers are new, so edits through the
+        node, TraceGroup and Trace methods on either side never reach the
+        other: the Trace mutators rebind x / y instead of editing them. Only
+        item assignment into trace.x / .y / .t is seen by both graphs; use
+        copy() for a fully independent graph.
+        """
+        node = object.__new__(type(self))
+        children = [c.cow_copy(parent=node) if c is not None else None for c in self.children]
+        copied = {id(old): new for old, new in zip(self.children, children) if old is not None}
+        for key, value in self.__dict__.items():
+            if key in ("parent", "_cache", "trace_group", "children"):
+                continue
+            if isinstance(value, RelationNode):
+                value = copied.get(id(value), value)
+            elif isinstance(value, list) and value and all(isinstance(v, RelationNode) for v in value):
+                value = [copied.get(id(v), v) for v in value]
+            node.__dict__[key] = value
+        node.parent = parent
+        node.trace_group = self.trace_group.copy(share=True) if self.trace_group is not None else None
+        node.children = children
+        return node
+
+    # ── memoisation ─────────────────────────────────────────────────────────
+
+    def invalidate_cache(self):
+        """Drop memoised results on this node and all of its ancestors."""
+        node = self
+        while node is not None:
+            node._cache = None
+            node = node.parent
+
+    def clear_cache(self):
+        """Drop memoised results on the whole subtree (after direct attribute edits)."""
+        for node in self.get_all_nodes():
+            node._cache = None
+
+    def cached_latex(self):
+        """
+        latex() with the result of every subtree memoised on its node.
+
+        The memo is dropped by the child-management methods on the edited
+        node and its ancestors; after direct attribute edits (e.g.
+        trace_group.label = ...) call clear_cache() first. Plain latex()
+        never reads the memo.
+        """
+        if self._cache is not None and "latex" in self._cache:
+            return self._cache["latex"]
+        # pre-order walk, then children before parents so that each latex()
+        # call reuses the results of its children
+        order, stack = [], [c for c in self.children if c is not None]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(c for c in node.children if c is not None)
+        _latex_memo.active = True
+        try:
+            for node in reversed(order):
+                if node._cache is None:
+                    node._cache = {}
+                if "latex" in node._cache or "latex_error" in node._cache:
+                    continue
+                try:
+                    node._cache["latex"] = node.latex()
+                except Exception as e:
+                    # raised again if (and only if) an ancestor needs this subtree
+                    node._cache["latex_error"] = e
+            latex = self.latex()
+        finally:
+            _latex_memo.active = False
+        if self._cache is None:
+            self._cache = {}
+        self._cache["latex"] = latex
+        return latex
+
+    def structure_hash(self) -> bytes:
+        """Canonical digest of node types + labels, cached (see ink.hashing)."""
+        return graph_hashes(self)[0]
+
+    def ink_hash(self, quantum: float = INK_QUANTUM) -> bytes:
+        """Canonical digest of structure + quantised ink, cached (see ink.hashing)."""
+        return graph_hashes(self, quantum)[1]
+
+    def spatial_index(self, leaf_size: int = LEAF_SIZE):
+        """R-tree over the symbol boxes of this subtree, cached (see ink.spatial)."""
+        return spatial_index(self, leaf_size)
+
     # ── navigation ──────────────────────────────────────────────────────────
 
     def get_right(self, child_node=None):
@@ -139,6 +263,7 @@ class RelationNode:
     def as_pretty_formula(self):
         return f"undef: {[c.as_pretty_formula() for c in self.children]}"
 
+    @memoized_latex
     def latex(self):
         return None
 
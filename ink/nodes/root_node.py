@@ -1,6 +1,6 @@
 from ink.nodes.any_relation_node import AnyRelationNode
 from ink.nodes.placeholder_node import PlaceholderNode
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.sqrt_node import SqrtNode
 from ink.nodes.symbol_node import SymbolNode
 import xml.etree.cElementTree as ET
@@ -22,6 +22,7 @@ class RootNode(RelationNode):
             raise ValueError("Root node can only have two children")  # no occurrence found
 
     def remove_node(self, node):
+        self.invalidate_cache()
         self.children = [child if child != node and not (child is None or child.is_empty()) else None for child in self.children]
         for child in self.children:
             if child is not None: child.remove_node(node)
@@ -73,6 +74,7 @@ class RootNode(RelationNode):
         if under == "4": return f"∜{base}"
         return f"√[{under}]{base}"
 
+    @memoized_latex
     def latex(self):
         above = self.get_above()
         below = self.get_below()
@@ -90,6 +92,7 @@ class RootNode(RelationNode):
         return mroot
 
     def fill_placeholders(self):
+        self.invalidate_cache()
         if len(self.children) < 1:
             self.children.append(None)
         if self.children[0] is None:
@@ -1,4 +1,5 @@
-from ink.nodes.relation_node import RelationNode
+from ink.latex import join_row_tokens
+from ink.nodes.relation_node import RelationNode, memoized_latex
 import xml.etree.cElementTree as ET
 
 # usually len of 2 or 1, but can be more
@@ -46,63 +47,9 @@ class RowNode(RelationNode):
     def as_pretty_formula(self):
         return "".join([child.as_pretty_formula() for child in self.children])
 
+    @memoized_latex
     def latex(self):
-        tokenized = [child.latex() for child in self.children]
-        index_stacks = [[] for _ in range(3)] # 0: {, 1: [, 2: (
-        for i, token in enumerate(tokenized):
-            if token == "\\{": index_stacks[0].append(i)
-            elif token in ["[", "("]: index_stacks["{[(".index(token)].append(i)
-            elif token in ["\\}", "]", ")"]:
-                if token == "\\}": index_stack = index_stacks[0]
-                else: index_stack = index_stacks["}])".index(token)]
-                if len(index_stack) > 0:
-                    opening_index = index_stack.pop()
-                else:
-                    continue
-                if token == "\\}":
-                    tokenized[opening_index] = "\\left\\{"
-                    tokenized[i] = "\\right\\}"
-                else:
-                    tokenized[opening_index] = "\\left" + tokenized[opening_index]
-                    tokenized[i] = "\\right" + tokenized[i]
-        # convert s i n to \\sin, c o s to \\cos, l o g to \\log, l i m to \\lim, t a n to \\tan
-        for i, token0 in enumerate(tokenized):
-            if i + 2 < len(tokenized):
-                token1 = tokenized[i + 1]
-                token2 = tokenized[i + 2]
-                if token0 == "s" and token1 == "i" and token2 == "n":
-                    tokenized = tokenized[:i] + ["\\sin"] + tokenized[i + 3:]
-                elif token0 == "c" and token1 == "o" and token2 == "s":
-                    tokenized = tokenized[:i] + ["\\cos"] + tokenized[i + 3:]
-                elif token0 == "l" and token1 == "o" and token2 == "g":
-                    tokenized = tokenized[:i] + ["\\log"] + tokenized[i + 3:]
-                elif token0 == "l" and token1 == "i" and token2 == "m":
-                    tokenized = tokenized[:i] + ["\\lim"] + tokenized[i + 3:]
-                elif token0 == "t" and token1 == "a" and token2 == "n":
-                    tokenized = tokenized[:i] + ["\\tan"] + tokenized[i + 3:]
-        # merge repetitive dot tokens into ellipsis operators
-        def _collapse_runs(tokens, target: str, replacement: str):
-            collapsed = []
-            i = 0
-            while i < len(tokens):
-                if tokens[i] != target:
-                    collapsed.append(tokens[i])
-                    i += 1
-                    continue
-                j = i
-                while j < len(tokens) and tokens[j] == target:
-                    j += 1
-                run = j - i
-                while run >= 3:
-                    collapsed.append(replacement)
-                    run -= 3
-                collapsed.extend([target] * run)
-                i = j
-            return collapsed
-
-        tokenized = _collapse_runs(tokenized, ".", "\\ldots")
-        tokenized = _collapse_runs(tokenized, "\\cdot", "\\cdots")
-        return " ".join(tokenized)
+        return join_row_tokens([child.latex() for child in self.children])
 
     def fix(self):
         for child in self.children:
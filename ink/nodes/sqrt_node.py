@@ -1,5 +1,5 @@
 from ink.nodes.any_relation_node import AnyRelationNode
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.row_node import RowNode
 from ink.nodes.symbol_node import SymbolNode
 import xml.etree.cElementTree as ET
@@ -12,6 +12,7 @@ class SqrtNode(RelationNode):
     def add_child(self, child):
         # correct sqrts: some have two children, this is weird af use mrow as single child instead
         # => now every root has exactly one child
+        self.invalidate_cache()
         if len(self.children) == 1:
             children = self.children
             self.children = []
@@ -21,6 +22,7 @@ class SqrtNode(RelationNode):
             super(SqrtNode, self).add_child(child)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         self.children = [child if child is not None and child != node and not child.is_empty() else None for child in self.children]
         for child in self.children:
             if child is not None: child.remove_node(node)
@@ -64,6 +66,7 @@ class SqrtNode(RelationNode):
             base = "{" + base + "}"
         return f"√{base}"
 
+    @memoized_latex
     def latex(self):
         below = self.get_below()
         below_latex = "{⠀}" if below is None or isinstance(below, AnyRelationNode) else below.latex()
@@ -1,4 +1,5 @@
-from ink.nodes.relation_node import RelationNode
+from ink.latex import join_row_tokens
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.symbol_node import SymbolNode
 import xml.etree.cElementTree as ET
 
@@ -12,6 +13,25 @@ beautified_subs = {
 }
 
 
+def script_latex(node):
+    """LaTeX of a base/script operand; anything but a single symbol is braced."""
+    return node.latex() if isinstance(node, SymbolNode) else f"{{{node.latex()}}}"
+
+
+def sub_latex(base, sub, as_built=False):
+    """
+    base_{sub} without building a temporary SubNode (which would re-parent both).
+
+    as_built applies the comma/period-to-row correction of SubNode.add_child, for
+    callers that render what SubNode(children=[base, sub]) would have become.
+    """
+    if as_built and sub.trace_group is not None and sub.trace_group.label in [",", "."]:
+        return join_row_tokens([base.latex(), sub.latex()])
+    if base is None:
+        return f"{{⠀}}_{script_latex(sub)}"
+    return f"{script_latex(base)}_{script_latex(sub)}"
+
+
 class SubNode(RelationNode):
     def __init__(self, parent=None, children=None):
         super().__init__(parent=parent, children=children)
@@ -30,6 +50,7 @@ class SubNode(RelationNode):
             self._to_row()
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for c in self.children:
             if c is not None:
                 c.remove_node(node)
@@ -92,14 +113,9 @@ class SubNode(RelationNode):
             sub = "{" + sub + "}"
         return f"{base}_{sub}"
 
+    @memoized_latex
     def latex(self):
-        sub = self.get_local_sub()
-        sub_latex = sub.latex() if isinstance(sub, SymbolNode) else f"{{{sub.latex()}}}"
-        base = self.get_base()
-        if base is None:
-            return f"{{⠀}}_{sub_latex}"
-        base_latex = base.latex() if isinstance(base, SymbolNode) else f"{{{base.latex()}}}"
-        return f"{base_latex}_{sub_latex}"
+        return sub_latex(self.get_base(), self.get_local_sub())
 
     def fix(self):
         if not self.children:
@@ -1,10 +1,15 @@
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.row_node import RowNode
-from ink.nodes.sub_node import SubNode
+from ink.nodes.sub_node import SubNode, script_latex, sub_latex
 from ink.nodes.sup_node import SupNode
 import xml.etree.cElementTree as ET
 
 
+def sub_sup_latex(base, sub, sup):
+    """{base_{sub}}^{sup}, as SupNode(SubNode(base, sub), sup) would render it."""
+    return f"{{{sub_latex(base, sub, as_built=True)}}}^{script_latex(sup)}"
+
+
 # always 3 children
 #   1. base: usually one symbol, there is one exception in validation dataset
 #   2. sub
@@ -19,6 +24,7 @@ class SubSupNode(RelationNode):
             super(SubSupNode, self).add_child(child)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for child in self.children:
             child.remove_node(node)
         for i, child in enumerate(self.children):
@@ -102,8 +108,9 @@ class SubSupNode(RelationNode):
             sup_text = "{" + sup_text + "}"
         return f"{base}_{sub_text}^{sup_text}"
 
+    @memoized_latex
     def latex(self):
-        return SupNode(children=[SubNode(children=[self.get_base(), self.get_local_sub()]), self.get_local_sup()]).latex()
+        return sub_sup_latex(self.get_base(), self.get_local_sub(), self.get_local_sup())
 
     def fix(self):
         for child in self.children:
@@ -116,6 +123,7 @@ class SubSupNode(RelationNode):
         avg_sub_child = sum([tg.get_center()[1] for tg in child1_tgs]) / len(child1_tgs)
         avg_sup_child = sum([tg.get_center()[1] for tg in child2_tgs]) / len(child2_tgs)
         if avg_sub_child < avg_sup_child:  # sub is above sup
+            self.invalidate_cache()
             self.children[1] = sup_child  # sub
             self.children[2] = sub_child  # sup
         if isinstance(self.get_base(), RowNode):
@@ -1,4 +1,4 @@
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.nodes.symbol_node import SymbolNode
 import xml.etree.cElementTree as ET
 
@@ -22,6 +22,7 @@ class SupNode(RelationNode):
             super().add_child(child)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for c in self.children:
             if c is not None:
                 c.remove_node(node)
@@ -84,6 +85,7 @@ class SupNode(RelationNode):
             sup = "{" + sup + "}"
         return f"{base}^{sup}"
 
+    @memoized_latex
     def latex(self):
         sup = self.get_local_sup()
         sup_latex = sup.latex() if isinstance(sup, SymbolNode) else f"{{{sup.latex()}}}"
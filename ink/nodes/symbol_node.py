@@ -1,7 +1,7 @@
 import json
 import pathlib
 
-from ink.nodes.relation_node import RelationNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
 from ink.traces.trace_group import TraceGroup
 import xml.etree.cElementTree as ET
 
@@ -36,6 +36,9 @@ _inline_beautified = {
 }
 beautified_symbols = {**LATEX_TO_UNICODE, **_inline_beautified}
 
+# Label aliases normalised when a SymbolNode is created
+label_aliases = {'<': '\\lt', '>': '\\gt'}
+
 # LaTeX normalisation applied at output time (display aliases → canonical form)
 latex_replacements = {
     '\\gt': '>',
@@ -69,11 +72,8 @@ class SymbolNode(RelationNode):
     def __init__(self, trace_group: TraceGroup, parent=None):
         super().__init__(parent=parent, trace_group=trace_group, children=[])
         # Normalise common label aliases on ingestion
-        if trace_group is not None:
-            if trace_group.label == "<":
-                trace_group.label = "\\lt"
-            elif trace_group.label == ">":
-                trace_group.label = "\\gt"
+        if trace_group is not None and trace_group.label in label_aliases:
+            trace_group.label = label_aliases[trace_group.label]
 
     def get_base(self):
         return self
@@ -106,6 +106,7 @@ class SymbolNode(RelationNode):
         label = self.get_label()
         return beautified_symbols.get(label, label)
 
+    @memoized_latex
     def latex(self):
         label = self.get_label()
         return latex_replacements.get(label, label)
@@ -1,5 +1,5 @@
-from ink.nodes.relation_node import RelationNode
-from ink.nodes.sub_node import SubNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
+from ink.nodes.sub_node import sub_latex
 import xml.etree.cElementTree as ET
 
 # munder:
@@ -14,6 +14,7 @@ class UnderNode(RelationNode):
         super(UnderNode, self).add_child(child)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for child in self.children:
             child.remove_node(node)
         for i, child in enumerate(self.children):
@@ -55,8 +56,9 @@ class UnderNode(RelationNode):
     def as_pretty_formula(self):
         return f"{self.children[0].as_pretty_formula()}[{self.children[1].as_pretty_formula()}]"
 
+    @memoized_latex
     def latex(self):
-        return SubNode(children=[self.get_base(), self.children[1]]).latex()
+        return sub_latex(self.get_base(), self.children[1], as_built=True)
 
     def get_math_ml(self):
         munder = ET.Element("munder")
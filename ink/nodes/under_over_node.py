@@ -1,5 +1,6 @@
-from ink.nodes.relation_node import RelationNode
-from ink.nodes.sub_sup_node import SubSupNode
+from ink.nodes.relation_node import RelationNode, memoized_latex
+from ink.nodes.sub_node import sub_latex
+from ink.nodes.sub_sup_node import sub_sup_latex
 from ink.nodes.sup_node import SupNode
 from ink.nodes.under_node import UnderNode
 import xml.etree.cElementTree as ET
@@ -18,6 +19,7 @@ class UnderOverNode(RelationNode):
             super(UnderOverNode, self).add_child(child)
 
     def remove_node(self, node):
+        self.invalidate_cache()
         for child in self.children:
             child.remove_node(node)
         for i, child in enumerate(self.children):
@@ -76,10 +78,11 @@ class UnderOverNode(RelationNode):
         if len(self.children) == 2:
             self.replace_with_node(UnderNode(parent=self.parent, children=[self.children[0], self.children[1]]))
 
+    @memoized_latex
     def latex(self):
         if len(self.children) == 2:
-            return UnderNode(parent=self.parent, children=[self.children[0], self.children[1]]).latex()
-        return SubSupNode(children=[self.get_base(), self.children[1], self.children[2]]).latex()
+            return sub_latex(self.children[0], self.children[1], as_built=True)
+        return sub_sup_latex(self.get_base(), self.children[1], self.children[2])
 
     def get_math_ml(self):
         munderover = ET.Element("munderover")
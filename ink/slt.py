@@ -0,0 +1,169 @@
+"""
+Symbol Layout Tree (SLT) export for relation graphs.
+
+An SLT has one object per symbol (every node that owns a trace group:
+symbols, fraction bars, radicals) and labelled edges between objects in the
+CROHME label-graph vocabulary:
+
+  Right   next symbol on the same baseline (rows)
+  Sup     superscript          Sub    subscript
+  Above   numerator, over-limit, root index
+  Below   denominator, under-limit, next line of a LineNode
+  Inside  radicand
+
+Edges of scripts and limits start at the last symbol of the base baseline,
+edges of fractions and radicals at the bar / radical symbol. Children of
+AnyRelationNode and noise symbols are exported as objects without edges.
+"""
+
+from ink.nodes.any_relation_node import AnyRelationNode
+from ink.nodes.frac_node import FracNode
+from ink.nodes.lines_node import LineNode
+from ink.nodes.noisy_node import NoisyNode
+from ink.nodes.placeholder_node import PlaceholderNode
+from ink.nodes.root_node import RootNode
+from ink.nodes.row_node import RowNode
+from ink.nodes.sqrt_node import SqrtNode
+from ink.nodes.sub_node import SubNode
+from ink.nodes.sub_sup_node import SubSupNode
+from ink.nodes.sup_node import SupNode
+from ink.nodes.under_node import UnderNode
+from ink.nodes.under_over_node import UnderOverNode
+
+RELATIONS = ("Right", "Sup", "Sub", "Above", "Below", "Inside")
+
+# node type → (relation, child index) edges from the node's own symbol
+_OWN_SYMBOL_EDGES = {
+    FracNode: (("Above", 0), ("Below", 1)),
+    SqrtNode: (("Inside", 0),),
+    RootNode: (("Inside", 0), ("Above", 1)),
+}
+
+# node type → (relation, child index) edges from the base (child 0)
+_BASE_EDGES = {
+    SubNode: (("Sub", 1),),
+    SupNode: (("Sup", 1),),
+    SubSupNode: (("Sub", 1), ("Sup", 2)),
+    UnderNode: (("Below", 1),),
+    UnderOverNode: (("Below", 1), ("Above", 2)),
+}
+
+
+class SymbolLayoutTree:
+    """
+    Objects and edges of a relation graph.
+
+    objects: list of nodes owning a symbol, in document order
+    edges:   list of (parent index, child index, relation) into `objects`
+    """
+
+    def __init__(self, objects: list, edges: list):
+        self.objects = objects
+        self.edges = edges
+
+    def __len__(self):
+        return len(self.objects)
+
+    def __repr__(self):
+        return f"SymbolLayoutTree({len(self.objects)} objects, {len(self.edges)} edges)"
+
+    def labels(self) -> list:
+        return [node.trace_group.label for node in self.objects]
+
+    def named_edges(self) -> list:
+        """Edges as (parent label, child label, relation) tuples."""
+        labels = self.labels()
+        return [(labels[i], labels[j], relation) for i, j, relation in self.edges]
+
+    def to_lg(self) -> str:
+        """
+        Serialise as a CROHME object-level label graph (.lg) string.
+
+        Object ids are the MathML ids of the trace groups if present, otherwise
+        `<label>_<n>`; stroke ids are the InkML trace ids if present, otherwise
+        the stroke's index in document order.
+        """
+        lines = []
+        ids = []
+        label_counts = {}
+        stroke_index = 0
+        for node in self.objects:
+            tg = node.trace_group
+            label = "COMMA" if tg.label == "," else str(tg.label)  # LG files are comma separated
+            object_id = tg.math_annotation
+            if object_id is None:
+                label_counts[label] = label_counts.get(label, 0) + 1
+                object_id = f"{label}_{label_counts[label]}"
+            ids.append(object_id)
+            strokes = []
+            for trace in tg.traces:
+                strokes.append(str(trace.inkml_id if trace.inkml_id is not None else stroke_index))
+                stroke_index += 1
+            lines.append(", ".join(["O", object_id, label, "1.0"] + strokes))
+        for i, j, relation in self.edges:
+            lines.append(f"R, {ids[i]}, {ids[j]}, {relation}, 1.0")
+        return "\n".join(lines) + "\n"
+
+
+def symbol_layout_tree(root) -> SymbolLayoutTree:
+    """Build the SLT of a relation graph in one iterative post-order pass."""
+    objects, edges = [], []
+    index = {}   # id(node) → object index, for nodes owning a symbol
+    spans = {}   # id(node) → (head object, tail object) on its main baseline
+
+    if root is None:
+        return SymbolLayoutTree(objects, edges)
+
+    # pre-order assigns object indices in document order
+    order, stack = [], [root]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        if node.trace_group is not None and not isinstance(node, PlaceholderNode):
+            index[id(node)] = len(objects)
+            objects.append(node)
+        stack.extend(c for c in reversed(node.children) if c is not None)
+
+    def span(child):
+        return spans.get(id(child), (None, None)) if child is not None else (None, None)
+
+    def link(source, child, relation):
+        target = span(child)[0]
+        if source is not None and target is not None:
+            edges.append((source, target, relation))
+
+    for node in reversed(order):
+        children = node.children
+        node_type = type(node)
+        own = index.get(id(node))
+
+        if node_type in _OWN_SYMBOL_EDGES:
+            for relation, i in _OWN_SYMBOL_EDGES[node_type]:
+                if i < len(children):
+                    link(own, children[i], relation)
+            spans[id(node)] = (own, own)
+        elif node_type in _BASE_EDGES:
+            head, tail = span(children[0] if children else None)
+            for relation, i in _BASE_EDGES[node_type]:
+                if i < len(children):
+                    link(tail, children[i], relation)
+            spans[id(node)] = (head, tail)
+        elif node_type is RowNode or node_type is LineNode:
+            # rows chain tail → head (Right), lines chain head → head (Below)
+            spans_of_children = [s for s in map(span, children) if s[0] is not None]
+            for (prev_head, prev_tail), (head, _) in zip(spans_of_children, spans_of_children[1:]):
+                if node_type is RowNode:
+                    edges.append((prev_tail, head, "Right"))
+                else:
+                    edges.append((prev_head, head, "Below"))
+            if spans_of_children:
+                spans[id(node)] = (spans_of_children[0][0], spans_of_children[-1][1])
+        elif node_type is NoisyNode:
+            spans[id(node)] = span(node.base_relation)
+        elif node_type is AnyRelationNode:
+            spans[id(node)] = span(children[0]) if len(children) == 1 else (None, None)
+        elif own is not None:
+            spans[id(node)] = (own, own)
+
+    edges.sort()
+    return SymbolLayoutTree(objects, edges)
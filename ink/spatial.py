@@ -0,0 +1,215 @@
+"""
+Spatial index over the symbols of a relation graph.
+
+SpatialIndex packs the bounding boxes of all nodes owning ink (symbols,
+fraction bars, radicals) into a static R-tree with Sort-Tile-Recursive
+leaves. Every level is a pair of NumPy arrays (boxes, child ranges), so a
+query descends the tree with one vectorised overlap test per level:
+
+  overlap(region)              symbols whose box intersects a region
+  knn(point, k)                k nearest symbols (best-first search)
+  neighbours(node, direction)  symbols in a direction of a symbol, nearest first
+
+spatial_index(root) builds the index lazily and caches it on the root node;
+it is dropped by the same mutation hooks as the other memoised results. Ink
+edited in place is not tracked; call root.clear_cache() after such edits.
+
+Coordinates follow InkML: y grows downwards, so "above" means smaller y.
+Boxes are (left, y_min, right, y_max).
+"""
+
+import heapq
+import math
+
+import numpy as np
+
+LEAF_SIZE = 8
+
+# direction → (dx, dy) with y growing downwards
+DIRECTIONS = {
+    "right": (1, 0),
+    "left": (-1, 0),
+    "above": (0, -1),
+    "below": (0, 1),
+    "above_right": (1, -1),
+    "below_right": (1, 1),
+    "above_left": (-1, -1),
+    "below_left": (-1, 1),
+}
+
+
+def _box(trace_group) -> tuple:
+    xs = [v for trace in trace_group.traces for v in trace.x]
+    ys = [v for trace in trace_group.traces for v in trace.y]
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def _overlaps(boxes: np.ndarray, region) -> np.ndarray:
+    x0, y0, x1, y1 = region
+    return (boxes[:, 0] <= x1) & (boxes[:, 2] >= x0) & (boxes[:, 1] <= y1) & (boxes[:, 3] >= y0)
+
+
+def _min_distances(boxes: np.ndarray, x: float, y: float) -> np.ndarray:
+    dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0.0)
+    dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0.0)
+    return np.hypot(dx, dy)
+
+
+def _expand(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the ranges [start, end) without a Python loop."""
+    counts = ends - starts
+    if not len(counts):
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+    return np.arange(counts.sum()) + offsets
+
+
+class SpatialIndex:
+    """STR-packed R-tree over the bounding boxes of a list of nodes."""
+
+    def __init__(self, nodes: list, leaf_size: int = LEAF_SIZE):
+        self.nodes = [n for n in nodes if n.trace_group is not None
+                      and any(len(t.x) for t in n.trace_group.traces)]
+        self.leaf_size = leaf_size
+        self.boxes = np.array([_box(n.trace_group) for n in self.nodes], dtype=np.float64).reshape(-1, 4)
+        self._position = {id(n): i for i, n in enumerate(self.nodes)}
+
+        # Sort-Tile-Recursive order: vertical slabs by centre x, then centre y within a slab
+        n = len(self.nodes)
+        centers = (self.boxes[:, :2] + self.boxes[:, 2:]) / 2
+        by_x = np.argsort(centers[:, 0], kind="stable")
+        slab = max(1, math.ceil(math.sqrt(max(n, 1) / leaf_size))) * leaf_size
+        order = [s[np.argsort(centers[s, 1], kind="stable")] for s in np.split(by_x, range(slab, n, slab))]
+        self.order = np.concatenate(order) if n else np.empty(0, dtype=np.int64)
+
+        # levels[0] groups items (in STR order), levels[i] groups the nodes of levels[i - 1]
+        self.levels = []
+        level_boxes = self.boxes[self.order]
+        while len(level_boxes):
+            starts = np.arange(0, len(level_boxes), leaf_size)
+            ends = np.minimum(starts + leaf_size, len(level_boxes))
+            parents = np.column_stack((
+                np.minimum.reduceat(level_boxes[:, 0], starts),
+                np.minimum.reduceat(level_boxes[:, 1], starts),
+                np.maximum.reduceat(level_boxes[:, 2], starts),
+                np.maximum.reduceat(level_boxes[:, 3], starts),
+            ))
+            self.levels.append((parents, starts, ends))
+            if len(parents) == 1:
+                break
+            level_boxes = parents
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def index_of(self, node) -> int:
+        """Position of a node in self.nodes / self.boxes."""
+        return self._position[id(node)]
+
+    def center(self, i: int) -> tuple:
+        x0, y0, x1, y1 = self.boxes[i]
+        return (x0 + x1) / 2, (y0 + y1) / 2
+
+    # ── queries ──────────────────────────────────────────────────────────────
+
+    def overlap_indices(self, region) -> np.ndarray:
+        """Indices of boxes intersecting region = (x0, y0, x1, y1), ascending."""
+        if not self.levels:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.zeros(1, dtype=np.int64)
+        for boxes, starts, ends in reversed(self.levels):
+            hit = candidates[_overlaps(boxes[candidates], region)]
+            candidates = _expand(starts[hit], ends[hit])
+        items = self.order[candidates]
+        return np.sort(items[_overlaps(self.boxes[items], region)])
+
+    def overlap(self, region) -> list:
+        """Nodes whose bounding box intersects region = (x0, y0, x1, y1)."""
+        return [self.nodes[i] for i in self.overlap_indices(region)]
+
+    def knn_indices(self, point, k: int = 1, exclude=()) -> list:
+        """Indices of the k boxes nearest to point (box distance, 0 inside a box)."""
+        if not self.levels:
+            return []
+        x, y = point
+        exclude = set(exclude)
+        top = len(self.levels) - 1
+        # entries: (distance, level, index); level -1 are items
+        heap = [(0.0, top, 0)]
+        result = []
+        while heap and len(result) < k:
+            distance, level, i = heapq.heappop(heap)
+            if level == -1:
+                if i not in exclude:
+                    result.append(i)
+                continue
+            _, starts, ends = self.levels[level]
+            children = np.arange(starts[i], ends[i])
+            if level == 0:
+                items = self.order[children]
+                for d, item in zip(_min_distances(self.boxes[items], x, y).tolist(), items.tolist()):
+                    heapq.heappush(heap, (d, -1, item))
+            else:
+                child_boxes = self.levels[level - 1][0][children]
+                for d, child in zip(_min_distances(child_boxes, x, y).tolist(), children.tolist()):
+                    heapq.heappush(heap, (d, level - 1, child))
+        return result
+
+    def knn(self, point, k: int = 1) -> list:
+        """The k nodes nearest to a point (any (x, y) sequence or array) or to a node's box centre."""
+        if not (np.ndim(point) == 1 and len(point) == 2):
+            i = self.index_of(point)
+            return [self.nodes[j] for j in self.knn_indices(self.center(i), k, exclude=(i,))]
+        return [self.nodes[j] for j in self.knn_indices(point, k)]
+
+    def neighbour_indices(self, i: int, direction: str, k: int = None,
+                          max_distance: float = math.inf, slack: float = 0.5) -> list:
+        """
+        Indices of boxes in a direction of box i, nearest centre first.
+
+        A candidate's centre must lie beyond box i's centre along every
+        non-zero axis of the direction; along a zero axis its box must overlap
+        box i's extent widened by `slack` times the box size on each side.
+        """
+        dx, dy = DIRECTIONS[direction]
+        x0, y0, x1, y1 = self.boxes[i]
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        width, height = x1 - x0, y1 - y0
+        reach = max_distance
+        region = (
+            cx if dx > 0 else (cx - reach if dx < 0 else x0 - slack * width),
+            cy if dy > 0 else (cy - reach if dy < 0 else y0 - slack * height),
+            cx + reach if dx > 0 else (cx if dx < 0 else x1 + slack * width),
+            cy + reach if dy > 0 else (cy if dy < 0 else y1 + slack * height),
+        )
+        candidates = self.overlap_indices(region)
+        centers = (self.boxes[candidates, :2] + self.boxes[candidates, 2:]) / 2
+        keep = candidates != i
+        if dx:
+            keep &= (centers[:, 0] - cx) * dx > 0
+        if dy:
+            keep &= (centers[:, 1] - cy) * dy > 0
+        candidates, centers = candidates[keep], centers[keep]
+        distances = np.hypot(centers[:, 0] - cx, centers[:, 1] - cy)
+        within = distances <= max_distance
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind="stable")[:k]
+        return candidates[order].tolist()
+
+    def neighbours(self, node, direction: str, k: int = None,
+                   max_distance: float = math.inf, slack: float = 0.5) -> list:
+        """Nodes in `direction` (see DIRECTIONS) of a node, nearest first."""
+        indices = self.neighbour_indices(self.index_of(node), direction, k, max_distance, slack)
+        return [self.nodes[j] for j in indices]
+
+
+def spatial_index(root, leaf_size: int = LEAF_SIZE) -> SpatialIndex:
+    """The SpatialIndex of a graph, built on first use and cached on the root."""
+    key = ("spatial_index", leaf_size)
+    if root._cache is not None and key in root._cache:
+        return root._cache[key]
+    index = SpatialIndex(root.get_all_nodes_with_trace_groups(), leaf_size=leaf_size)
+    if root._cache is None:
+        root._cache = {}
+    root._cache[key] = index
+    return index
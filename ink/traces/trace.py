@@ -1,4 +1,5 @@
 import math
+import operator
 
 
 class Trace:
@@ -18,12 +19,13 @@ class Trace:
         return result
 
     def __eq__(self, other):
-        if other is None or len(self) != len(other):
+        if other is None or len(self) != len(other) or self.inkml_id != other.inkml_id:
             return False
-        return all([self.x[i] == other.x[i] and self.y[i] == other.y[i] for i in range(len(self.x))]) and self.inkml_id == other.inkml_id
+        # element-wise in C; x/y may be lists or tuples
+        return all(map(operator.eq, self.x, other.x)) and all(map(operator.eq, self.y, other.y))
 
     def __hash__(self):
-        return hash(tuple(self.x + self.y))
+        return hash((tuple(self.x), tuple(self.y)))
 
     def scale(self, dx, dy):
         self.x = [x * dx for x in self.x]
@@ -126,5 +128,9 @@ class Trace:
             next_index += 1
         return next_index
 
-    def copy(self):
+    def copy(self, share=False):
+        # all mutating methods rebind x/y instead of editing in place, so a
+        # shared copy only duplicates coordinates once one side is transformed
+        if share:
+            return Trace(self.x, self.y, t=self.t, inkml_id=self.inkml_id)
         return Trace(list(self.x).copy(), list(self.y).copy(), t=self.t, inkml_id=self.inkml_id)
@@ -123,8 +123,8 @@ class TraceGroup:
     def interpolate(self, target_length):
         [trace.interpolate(target_length) for trace in self.traces]
 
-    def copy(self):
-        new_group = TraceGroup([trace.copy() for trace in self.traces], self.label, self.xml_id, self.math_annotation)
+    def copy(self, share=False):
+        new_group = TraceGroup([trace.copy(share=share) for trace in self.traces], self.label, self.xml_id, self.math_annotation)
         if self.prediction_logits is not None:
             new_group.prediction_logits = self.prediction_logits.copy()
         new_group.label_probability = self.label_probability
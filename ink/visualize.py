@@ -86,7 +86,7 @@ class TraceVisualizer:
 
     @staticmethod
     def plot_relation_graph(relation_graph, plot_arrows=True):
-        relation_graph = relation_graph.copy() # make sure we don't change the original graph
+        relation_graph = relation_graph.cow_copy() # make sure we don't change the original graph
         mask_value = 0
         plt.figure(figsize=(8, 6))
         nodes_with_tgs = relation_graph.get_all_nodes_with_trace_groups()
@@ -150,7 +150,7 @@ class TraceVisualizer:
 
     @staticmethod
     def plot_relation_graph_alt(relation_graph, title, plot_arrows=True):
-        relation_graph = relation_graph.copy()  # make sure we don't change the original graph
+        relation_graph = relation_graph.cow_copy()  # make sure we don't change the original graph
         mask_value = 0
         plt.figure(figsize=(8, 6))
         nodes_with_tgs = relation_graph.get_all_nodes_with_trace_groups()
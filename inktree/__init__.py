@@ -16,7 +16,11 @@ Key design goals vs. InkML + JSONL:
 
 from .encode import encode_graph, encode_graph_sample
 from .decode import decode_graph, decode_graph_sample
-from .io import load_inktree, load_inktree_graphs, save_inktree, INKTREE_VERSION
+from .io import load_inktree, load_inktree_graphs, save_inktree, iter_inktree, write_inktree, INKTREE_VERSION
+from .sequence import InkTreeSequence
+from .dataset import InkTreeIterableDataset, InkTreeMapDataset
+from .collate import collate_batch
+from .sampler import BucketBatchSampler, sample_lengths
 
 __all__ = [
     "encode_graph",
@@ -26,5 +30,13 @@ __all__ = [
     "load_inktree",
     "load_inktree_graphs",
     "save_inktree",
+    "iter_inktree",
+    "write_inktree",
+    "InkTreeSequence",
+    "InkTreeMapDataset",
+    "InkTreeIterableDataset",
+    "collate_batch",
+    "BucketBatchSampler",
+    "sample_lengths",
     "INKTREE_VERSION",
 ]
@@ -0,0 +1,166 @@
+"""
+Collate a batch of ink samples into padded NumPy arrays.
+
+collate_batch() takes graphs, (graph, label) pairs or raw InkTree dicts and
+returns fixed-shape arrays for a model:
+
+  points        (B, T, C) float, channels x, y, pen_up (+ t with time=True)
+  x, y, pen_up  (B, T) views of the points channels (t too with time=True)
+  symbol_index  (B, T) int64, trace group (symbol) of every point, -1 on padding
+  lengths       (B,) int64, points of every sample (after truncation to T)
+  mask          (B, T) bool, True on real points
+  labels        list of labels, for (graph, label) pairs and sample dicts
+
+Points are ordered as get_all_trace_groups() (node stroke groups before their
+children, children in order); symbol_index numbers those groups per sample.
+pen_up is 1 on the last point of every stroke, as in DeepWriting: the pen is
+lifted after that point. With deltas=True, x / y / t hold the offsets from the
+previous point of the sample (the first point keeps its absolute value), so
+the (dx, dy, pen_up) channels match the DeepWriting .npz strokes and
+np.cumsum(points[..., :2], axis=1) restores the coordinates.
+
+The batch array is allocated once and filled with one vectorized scatter of
+the concatenated coordinates; the Python work is per stroke, not per point.
+"""
+
+from itertools import chain, repeat
+
+import numpy as np
+
+
+# raw InkTree node: (stroke list keys, child node keys), in decode_graph() order
+_STROKE_KEYS = {"sym": ("strokes",), "frac": ("bar",), "sqrt": ("strokes",), "root": ("strokes",)}
+_CHILD_KEYS = {
+    "frac": ("numer", "denom"),
+    "sub": ("base", "sub"),
+    "sup": ("base", "sup"),
+    "subsup": ("base", "sub", "sup"),
+    "sqrt": ("inner",),
+    "root": ("inner", "index"),
+    "under": ("base", "under"),
+    "underover": ("base", "under", "over"),
+    "line": (),
+}
+
+
+def _dict_groups(d: dict, out: list) -> list:
+    """Stroke dict lists of a raw InkTree node, one per trace group."""
+    if d is None:
+        return out
+    node_type = d.get("type", "any")
+    for key in _STROKE_KEYS.get(node_type, ()):
+        out.append(d.get(key, []))
+    if node_type == "sym":
+        return out
+    if node_type in _CHILD_KEYS:
+        for key in _CHILD_KEYS[node_type]:
+            _dict_groups(d.get(key), out)
+    else:
+        for c in d.get("children", []):
+            _dict_groups(c, out)
+    return out
+
+
+def _strokes(sample):
+    """(label, [(x, y, t, group index), ...]) of one batch item."""
+    label = None
+    if isinstance(sample, tuple):
+        sample, label = sample
+    if isinstance(sample, dict):
+        if "node" in sample:
+            label = sample.get("label", "")
+            sample = sample["node"]
+        groups = _dict_groups(sample, [])
+        return label, [(s["x"], s["y"], s.get("t"), g) for g, strokes in enumerate(groups) for s in strokes]
+    if sample is None:
+        return label, []
+    groups = sample.get_all_trace_groups()
+    return label, [(tr.x, tr.y, tr.t, g) for g, tg in enumerate(groups) for tr in tg.traces]
+
+
+def _flat(values: list, total: int) -> np.ndarray:
+    return np.fromiter(chain.from_iterable(values), dtype=np.float64, count=total)
+
+
+def collate_batch(batch, max_len: int = None, deltas: bool = False, time: bool = False,
+                  dtype=np.float32) -> dict:
+    """
+    Pad a batch of samples into fixed-shape arrays (see module docstring).
+
+    Parameters
+    ----------
+    batch:   Sequence of RelationNode graphs, (graph, label) pairs, InkTree
+             sample dicts ({"label", "node"}) or InkTree node dicts.
+    max_len: Points per sample T; longer samples are truncated. Default:
+             the longest sample of the batch.
+    deltas:  Store offsets from the previous point instead of coordinates.
+    time:    Add a t channel (NaN for strokes without timestamps).
+    dtype:   Float dtype of points.
+
+    Returns
+    -------
+    dict of arrays; "labels" only if the batch items carry labels.
+    """
+    labels, xs, ys, ts, stroke_groups, stroke_lens, sample_lens = [], [], [], [], [], [], []
+    for sample in batch:
+        label, strokes = _strokes(sample)
+        labels.append(label)
+        n = 0
+        for x, y, t, g in strokes:
+            xs.append(x)
+            ys.append(y)
+            ts.append(t)
+            stroke_groups.append(g)
+            stroke_lens.append(len(x))
+            n += len(x)
+        sample_lens.append(n)
+
+    stroke_lens = np.array(stroke_lens, dtype=np.int64)
+    lengths = np.array(sample_lens, dtype=np.int64)
+    total = int(lengths.sum())
+    B = len(lengths)
+    T = int(lengths.max(initial=0)) if max_len is None else max_len
+
+    # concatenated points of the whole batch, with sample / position of each
+    channels = [_flat(xs, total), _flat(ys, total)]
+    if time:
+        channels.append(_flat((t if t is not None else repeat(np.nan, n) for t, n in zip(ts, stroke_lens)), total))
+    starts = np.zeros(B, dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    sample_id = np.repeat(np.arange(B), lengths)
+    pos = np.arange(total) - starts[sample_id]
+
+    if deltas:
+        first = starts[lengths > 0]
+        for i, v in enumerate(channels):
+            d = np.diff(v, prepend=0.0)
+            d[first] = v[first]
+            channels[i] = d
+
+    pen_up = np.zeros(total)
+    pen_up[np.cumsum(stroke_lens)[stroke_lens > 0] - 1] = 1
+    channels.insert(2, pen_up)
+    symbol_index = np.repeat(np.array(stroke_groups, dtype=np.int64), stroke_lens)
+
+    keep = pos < T
+    sample_id, pos = sample_id[keep], pos[keep]
+    points = np.zeros((B, T, len(channels)), dtype=dtype)
+    points[sample_id, pos] = np.stack(channels, axis=1)[keep]
+    symbols = np.full((B, T), -1, dtype=np.int64)
+    symbols[sample_id, pos] = symbol_index[keep]
+    lengths = np.minimum(lengths, T)
+
+    out = {
+        "points": points,
+        "x": points[..., 0],
+        "y": points[..., 1],
+        "pen_up": points[..., 2],
+        "symbol_index": symbols,
+        "lengths": lengths,
+        "mask": np.arange(T) < lengths[:, None],
+    }
+    if time:
+        out["t"] = points[..., 3]
+    if any(label is not None for label in labels):
+        out["labels"] = labels
+    return out
@@ -0,0 +1,177 @@
+"""
+Training-loop adapters over InkTree files, with no framework dependency.
+
+Both classes follow the PyTorch dataset protocols by duck typing, so they can
+be handed to torch.utils.data.DataLoader as they are, but they import nothing
+from torch:
+
+  InkTreeMapDataset       __len__ / __getitem__ over one file or a shard set
+  InkTreeIterableDataset  __iter__ streaming a shard set, split per worker
+
+`paths` is an InkTree file, a directory of InkTree files (sorted) or a list
+of files; samples are numbered across the files in that order. A sample is
+(graph, label), or the raw InkTree dict with decode=False, and `transform`
+is applied to it inside the worker.
+
+Nothing is opened when a dataset is built: files are read on first access
+in the process that uses them. InkTreeMapDataset.load() decompresses every
+file up front instead, into one buffer per file (see InkTreeSequence), so
+workers forked afterwards share those pages rather than each loading the
+files again.
+"""
+
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from .decode import decode_graph_sample
+from .io import INKTREE_SUFFIX, is_blank_line
+from .sequence import InkTreeSequence
+
+
+def resolve_paths(paths) -> list[Path]:
+    """InkTree files of a file, a directory (sorted) or a list of either."""
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+    files = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            files.extend(sorted(p.glob(f"*{INKTREE_SUFFIX}")))
+        elif p.exists():
+            files.append(p)
+        else:
+            raise FileNotFoundError(f"InkTree file not found: {p}")
+    return files
+
+
+def count_samples(path: Path) -> int:
+    """Number of samples (non-blank lines, see is_blank_line) of an InkTree file, without decoding them."""
+    with gzip.open(path, "rb") as fh:
+        return sum(1 for line in fh if not is_blank_line(line))
+
+
+def worker_shard() -> tuple[int, int]:
+    """
+    (worker_id, num_workers) of the current data-loading worker: taken from
+    torch.utils.data.get_worker_info() when torch is already imported,
+    else (0, 1).
+    """
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        info = torch.utils.data.get_worker_info()
+        if info is not None:
+            return info.id, info.num_workers
+    return 0, 1
+
+
+class InkTreeMapDataset:
+    """
+    Map-style dataset: sample i of the concatenated files.
+
+    Parameters
+    ----------
+    paths:     InkTree file, directory or list of files.
+    transform: Called on every sample before it is returned.
+    decode:    Return (graph, label) samples; False returns the raw InkTree dicts.
+    """
+
+    def __init__(self, paths, transform=None, decode: bool = True):
+        self.paths = resolve_paths(paths)
+        self.transform = transform
+        self.decode = decode
+        self._files = [InkTreeSequence(p) for p in self.paths]
+        self._offsets = None   # (files + 1,) first global index of every file
+
+    def __repr__(self):
+        return f"InkTreeMapDataset({len(self.paths)} files)"
+
+    def load(self) -> "InkTreeMapDataset":
+        """Decompress every file now (before forking workers that should share them)."""
+        for f in self._files:
+            f.load()
+        self._index()
+        return self
+
+    def _index(self) -> np.ndarray:
+        if self._offsets is None:
+            counts = [len(f) if f.loaded else count_samples(f.path) for f in self._files]
+            self._offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+            np.cumsum(counts, out=self._offsets[1:])
+        return self._offsets
+
+    def __len__(self):
+        return int(self._index()[-1])
+
+    def __getitem__(self, index: int):
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError(f"index {index} out of range for {n} samples")
+        index %= n
+        k = int(np.searchsorted(self._offsets, index, side="right")) - 1
+        local = index - int(self._offsets[k])
+        f = self._files[k]
+        sample = f[local] if self.decode else f.raw(local)
+        return self.transform(sample) if self.transform is not None else sample
+
+
+class InkTreeIterableDataset:
+    """
+    Iterable dataset streaming a shard set, each worker reading its part.
+
+    With at least as many files as workers, every worker streams whole files
+    (file k goes to worker k % num_workers) and opens only those. With fewer
+    files, every worker streams all files and takes every num_workers-th
+    sample, parsing only its own lines.
+
+    Parameters
+    ----------
+    paths:       InkTree file, directory or list of files.
+    transform:   Called on every sample before it is yielded.
+    decode:      Yield (graph, label) samples; False yields the raw InkTree dicts.
+    worker_id,
+    num_workers: Fixed shard of this dataset; by default taken from
+                 worker_shard() when iteration starts.
+    """
+
+    def __init__(self, paths, transform=None, decode: bool = True,
+                 worker_id: int = None, num_workers: int = None):
+        self.paths = resolve_paths(paths)
+        self.transform = transform
+        self.decode = decode
+        self.worker_id = worker_id
+        self.num_workers = num_workers
+
+    def __repr__(self):
+        return f"InkTreeIterableDataset({len(self.paths)} files)"
+
+    def _shard(self) -> tuple[int, int]:
+        if self.num_workers is not None:
+            return self.worker_id or 0, self.num_workers
+        return worker_shard()
+
+    def _lines(self, worker_id: int, num_workers: int):
+        if len(self.paths) >= num_workers:
+            for path in self.paths[worker_id::num_workers]:
+                with gzip.open(path, "rb") as fh:
+                    yield from (line for line in fh if not is_blank_line(line))
+            return
+        i = 0
+        for path in self.paths:
+            with gzip.open(path, "rb") as fh:
+                for line in fh:
+                    if is_blank_line(line):
+                        continue
+                    if i % num_workers == worker_id:
+                        yield line
+                    i += 1
+
+    def __iter__(self):
+        worker_id, num_workers = self._shard()
+        for line in self._lines(worker_id, num_workers):
+            sample = json.loads(line)
+            if self.decode:
+                sample = decode_graph_sample(sample)
+            yield self.transform(sample) if self.transform is not None else sample
@@ -0,0 +1,417 @@
+"""
+Exact and near-duplicate detection across InkTree files.
+
+Each shard (.inktree.jsonl.gz file) is streamed line by line in a worker
+process and reduced to two compact per-sample signatures; decoded samples
+are never kept in memory:
+
+  exact key  – 128-bit BLAKE2b digest of the ink (all strokes in document
+               order, coordinates at the stored COORD_DECIMALS precision).
+               Labels and structure are ignored, so the same ink annotated
+               differently in two datasets still collides. Samples without
+               any points have no ink to compare and are never matched.
+  MinHash    – `num_perm` uint32 minima over shingles of the ink after
+               bounding-box normalisation, arc-length resampling and
+               quantisation to a `grid` × `grid` lattice.
+
+Near duplicates are found with banded locality-sensitive hashing: the
+MinHash signature is cut into `bands` bands, every band is reduced to one
+uint64 and sorted, and only samples sharing a band value are compared.
+Memory is O(N) fixed-size arrays rather than O(N²) comparisons.
+
+Earlier files in the input list take precedence: within an exact or near
+duplicate cluster the first sample is kept and the rest are dropped, so
+list test splits before train splits to remove leaked training samples.
+"""
+
+import gzip
+import hashlib
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .io import INKTREE_SUFFIX
+from .schema import COORD_DECIMALS
+
+_DIGEST_SIZE = 16
+_HASH_SEED = 0x1F2E3D4C
+
+# child keys that hold nodes, in document order (see schema.py)
+_NODE_KEYS = ("base", "numer", "denom", "inner", "index", "sub", "sup", "under", "over")
+_STROKE_KEYS = ("strokes", "bar")
+
+
+# ── per-sample signatures ──────────────────────────────────────────────────────
+
+def sample_strokes(node: dict) -> list:
+    """Return all stroke dicts of an InkTree node dict in document order."""
+    strokes = []
+    stack = [node]
+    while stack:
+        d = stack.pop()
+        if not isinstance(d, dict):
+            continue
+        for key in _STROKE_KEYS:
+            strokes.extend(d.get(key, ()))
+        children = [d[key] for key in _NODE_KEYS if d.get(key) is not None]
+        children.extend(d.get("children", ()))
+        stack.extend(reversed(children))
+    return strokes
+
+
+def exact_key(strokes: list) -> bytes:
+    """Digest of the ink at the stored coordinate precision."""
+    hasher = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    scale = 10 ** COORD_DECIMALS
+    lengths = [len(strokes)] + [len(s["x"]) for s in strokes]
+    values = [v for s in strokes for v in s["x"]]
+    values.extend(v for s in strokes for v in s["y"])
+    hasher.update(np.asarray(lengths, dtype=np.int64).tobytes())
+    hasher.update(np.rint(np.asarray(values, dtype=np.float64) * scale).astype(np.int64).tobytes())
+    return hasher.digest()
+
+
+def ink_shingles(strokes: list, grid: int = 16, points_per_unit: int = 32, k: int = 3) -> np.ndarray:
+    """
+    Quantised shingles of the ink as unique uint64 codes.
+
+    The ink is translated/scaled into the unit square (aspect kept), every
+    stroke is resampled to `points_per_unit` points per unit of arc length,
+    snapped to a `grid` lattice and deduplicated; each run of `k` consecutive
+    lattice cells within a stroke (the last cell repeated k-1 times as an end
+    marker) becomes one shingle. All strokes are processed in one batch.
+    """
+    lengths = np.asarray([len(s["x"]) for s in strokes], dtype=np.int64)
+    lengths = lengths[lengths > 0]
+    if not len(lengths):
+        return np.empty(0, dtype=np.uint64)
+    x = np.asarray([v for s in strokes for v in s["x"]], dtype=np.float64)
+    y = np.asarray([v for s in strokes for v in s["y"]], dtype=np.float64)
+    stroke = np.repeat(np.arange(len(lengths)), lengths)
+    min_x, min_y = x.min(), y.min()
+    extent = max(x.max() - min_x, y.max() - min_y) or 1.0
+    x = (x - min_x) / extent
+    y = (y - min_y) / extent
+
+    # arc length within each stroke, strokes laid out on one increasing axis
+    step = np.hypot(np.diff(x, prepend=x[0]), np.diff(y, prepend=y[0]))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    step[starts] = 0.0
+    arc = np.cumsum(step)
+    arc -= np.repeat(arc[starts], lengths)
+    stroke_length = np.maximum.reduceat(arc, starts)
+    spacing = stroke_length.max() + 1.0
+    offset = stroke * spacing
+
+    # resample: n_s points evenly spaced along every stroke
+    counts = (stroke_length * points_per_unit).astype(np.int64) + 1
+    target_stroke = np.repeat(np.arange(len(counts)), counts)
+    rank = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    fraction = rank / np.maximum(counts - 1, 1)[target_stroke]
+    at = fraction * stroke_length[target_stroke] + target_stroke * spacing
+    x = np.interp(at, arc + offset, x)
+    y = np.interp(at, arc + offset, y)
+
+    cells = (np.minimum((x * grid).astype(np.int64), grid - 1) * grid
+             + np.minimum((y * grid).astype(np.int64), grid - 1))
+    keep = np.concatenate(([True], (cells[1:] != cells[:-1]) | (target_stroke[1:] != target_stroke[:-1])))
+    cells, cell_stroke = cells[keep], target_stroke[keep]
+
+    # pad every stroke with k-1 copies of its last cell
+    ends = np.flatnonzero(np.append(cell_stroke[1:] != cell_stroke[:-1], True)) + 1
+    pad = np.repeat(ends, k - 1)
+    cells = np.insert(cells, pad, cells[pad - 1])
+    cell_stroke = np.insert(cell_stroke, pad, cell_stroke[pad - 1])
+
+    # base-(grid²) positional code of every window of k cells within a stroke
+    n = len(cells) - k + 1
+    codes = np.zeros(n, dtype=np.int64)
+    for i in range(k):
+        codes = codes * (grid * grid) + cells[i:i + n]
+    codes = codes[cell_stroke[:n] == cell_stroke[k - 1:]]
+    return np.unique(codes).astype(np.uint64)
+
+
+def _minhash_params(num_perm: int) -> tuple:
+    rng = np.random.default_rng(_HASH_SEED)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+def minhash(shingles: np.ndarray, params: tuple) -> np.ndarray:
+    """MinHash signature (uint32) of a shingle set using multiply-shift hashing."""
+    a, b = params
+    with np.errstate(over="ignore"):
+        hashed = (a * shingles[None, :] + b) >> np.uint64(32)
+    return hashed.min(axis=1).astype(np.uint32)
+
+
+# ── shard scanning ─────────────────────────────────────────────────────────────
+
+def scan_shard(path, num_perm: int = 64, grid: int = 16, min_shingles: int = 8) -> dict:
+    """
+    Stream one InkTree file and compute the signatures of every sample.
+
+    Returns a dict with the sample labels, exact keys (N × 16 bytes), MinHash
+    signatures (N × num_perm uint32), a mask of samples with any points
+    (the others take part in no duplicate detection) and a mask of samples
+    with enough ink (>= min_shingles shingles) to take part in
+    near-duplicate detection.
+    """
+    params = _minhash_params(num_perm)
+    labels, keys, signatures, has_ink, eligible = [], [], [], [], []
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            sample = json.loads(line)
+            strokes = sample_strokes(sample.get("node"))
+            shingles = ink_shingles(strokes, grid=grid)
+            labels.append(sample.get("label", ""))
+            keys.append(exact_key(strokes))
+            has_ink.append(any(len(s["x"]) for s in strokes))
+            eligible.append(has_ink[-1] and len(shingles) >= min_shingles)
+            signatures.append(minhash(shingles, params) if len(shingles)
+                              else np.full(num_perm, np.iinfo(np.uint32).max, dtype=np.uint32))
+    return {
+        "path": str(path),
+        "labels": labels,
+        "keys": np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(-1, _DIGEST_SIZE),
+        "signatures": np.asarray(signatures, dtype=np.uint32).reshape(-1, num_perm),
+        "has_ink": np.asarray(has_ink, dtype=bool),
+        "eligible": np.asarray(eligible, dtype=bool),
+    }
+
+
+# ── index ──────────────────────────────────────────────────────────────────────
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        root = i
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[i] != root:
+            self.parent[i], i = root, self.parent[i]
+        return root
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        # the smaller id (earlier file / line) becomes the representative
+        if ri < rj:
+            self.parent[rj] = ri
+        elif rj < ri:
+            self.parent[ri] = rj
+
+
+def _equal_runs(values: np.ndarray):
+    """Yield index arrays of entries sharing a value (runs of length > 1)."""
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_values[1:] != sorted_values[:-1])))
+    ends = np.append(starts[1:], len(values))
+    for start, end in zip(starts, ends):
+        if end - start > 1:
+            yield np.sort(order[start:end])
+
+
+def _band_values(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """Reduce each band of every signature to a single uint64 (N × bands)."""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    banded = signatures[:, :bands * rows].reshape(n, bands, rows).astype(np.uint64)
+    values = np.zeros((n, bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(rows):
+            values = values * np.uint64(0x100000001B3) ^ banded[:, :, r]
+    return values
+
+
+def find_duplicates(
+    paths: list,
+    threshold: float = 0.8,
+    num_perm: int = 64,
+    bands: int = 16,
+    grid: int = 16,
+    min_shingles: int = 8,
+    max_bucket: int = 256,
+    workers: int = None,
+) -> dict:
+    """
+    Find exact and near-duplicate samples across InkTree files.
+
+    Parameters
+    ----------
+    paths:        InkTree files; earlier files win when choosing what to keep.
+    threshold:    Minimum estimated Jaccard similarity of the shingle sets for
+                  two samples to count as near duplicates.
+    num_perm:     MinHash signature length.
+    bands:        Number of LSH bands (num_perm // bands rows each). More bands
+                  find more candidates at lower similarity.
+    grid:         Quantisation lattice size for the shingles.
+    min_shingles: Samples with less ink (e.g. a single dot or dash) are only
+                  checked for exact duplicates.
+    max_bucket:   LSH buckets larger than this are compared against their
+                  first member only instead of pairwise.
+    workers:      Number of processes for scanning shards (None: CPU count).
+
+    Returns
+    -------
+    Dict with "files", "exact" and "near" groups (lists of sample refs), the
+    per-file "drop" sets and summary counts. A sample ref is
+    {"file": index, "line": sample index, "label": str}.
+    """
+    paths = [Path(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(
+            scan_shard, paths,
+            [num_perm] * len(paths), [grid] * len(paths), [min_shingles] * len(paths),
+        ))
+
+    sizes = [len(s["labels"]) for s in shards]
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    n = int(offsets[-1])
+    labels = [label for s in shards for label in s["labels"]]
+    keys = np.concatenate([s["keys"] for s in shards]) if n else np.empty((0, _DIGEST_SIZE), np.uint8)
+    signatures = np.concatenate([s["signatures"] for s in shards]) if n else np.empty((0, num_perm), np.uint32)
+    has_ink = np.concatenate([s["has_ink"] for s in shards]) if n else np.empty(0, bool)
+    eligible = np.concatenate([s["eligible"] for s in shards]) if n else np.empty(0, bool)
+    del shards
+
+    def ref(i: int) -> dict:
+        file = int(np.searchsorted(offsets, i, side="right") - 1)
+        return {"file": file, "line": int(i - offsets[file]), "label": labels[i]}
+
+    # exact duplicates: sort the 128-bit keys as two uint64 columns; samples
+    # without points all share one key and are left out
+    exact = _UnionFind(n)
+    key_words = keys.view(np.uint64).reshape(n, 2)
+    order = np.flatnonzero(has_ink)
+    order = order[np.lexsort((key_words[order, 1], key_words[order, 0]))]
+    same = np.all(key_words[order[1:]] == key_words[order[:-1]], axis=1)
+    for a, b in zip(order[:-1][same], order[1:][same]):
+        exact.union(int(a), int(b))
+
+    # near duplicates: LSH candidates verified on the full signature
+    near = _UnionFind(n)
+    candidates = np.flatnonzero(eligible)
+    band_values = _band_values(signatures[candidates], bands)
+    checked = set()
+    for band in range(band_values.shape[1]):
+        for run in _equal_runs(band_values[:, band]):
+            members = candidates[run]
+            if len(members) > max_bucket:
+                pairs = ((members[0], j) for j in members[1:])
+            else:
+                pairs = ((members[i], j) for i in range(len(members)) for j in members[i + 1:])
+            for i, j in pairs:
+                i, j = int(i), int(j)
+                if (i, j) in checked or exact.find(i) == exact.find(j):
+                    continue
+                checked.add((i, j))
+                if np.count_nonzero(signatures[i] == signatures[j]) >= threshold * num_perm:
+                    near.union(i, j)
+
+    def clusters(uf: _UnionFind) -> dict:
+        groups = {}
+        for i in range(n):
+            root = uf.find(i)
+            if root != i:
+                groups.setdefault(root, [root]).append(i)
+        return groups
+
+    exact_groups = clusters(exact)
+    # near clusters are formed over exact-cluster representatives
+    for root, members in exact_groups.items():
+        for i in members[1:]:
+            near.union(root, i)
+    near_groups = {root: members for root, members in clusters(near).items()
+                   if len({exact.find(i) for i in members}) > 1}
+
+    drop = [set() for _ in paths]
+    for members in list(exact_groups.values()) + list(near_groups.values()):
+        for i in members[1:]:
+            r = ref(i)
+            drop[r["file"]].add(r["line"])
+
+    cross_file = Counter()
+    for members in list(exact_groups.values()) + list(near_groups.values()):
+        keep_file = ref(members[0])["file"]
+        for i in members[1:]:
+            other = ref(i)["file"]
+            if other != keep_file:
+                cross_file[(keep_file, other)] += 1
+
+    return {
+        "files": [{"path": str(p), "samples": size, "dropped": len(d)}
+                  for p, size, d in zip(paths, sizes, drop)],
+        "exact": [[ref(i) for i in members] for members in exact_groups.values()],
+        "near": [[ref(i) for i in members] for members in near_groups.values()],
+        "cross_file": [{"kept": a, "dropped": b, "count": c} for (a, b), c in sorted(cross_file.items())],
+        "drop": drop,
+        "summary": {
+            "samples": n,
+            "no_ink": int(n - np.count_nonzero(has_ink)),
+            "exact_groups": len(exact_groups),
+            "near_groups": len(near_groups),
+            "dropped": sum(len(d) for d in drop),
+            "label_conflicts": sum(
+                len({labels[i] for i in members}) > 1 for members in exact_groups.values()
+            ),
+        },
+    }
+
+
+# ── output ─────────────────────────────────────────────────────────────────────
+
+def _filter_shard(path, out_path, drop) -> int:
+    written = 0
+    with gzip.open(path, "rt", encoding="utf-8") as src, gzip.open(out_path, "wt", encoding="utf-8") as dst:
+        index = 0
+        for line in src:
+            if not line.strip():
+                continue
+            if index not in drop:
+                dst.write(line if line.endswith("\n") else line + "\n")
+                written += 1
+            index += 1
+    return written
+
+
+def write_filtered(result: dict, out_dir, workers: int = None) -> list:
+    """
+    Copy every input file to out_dir without the dropped samples.
+
+    Lines are copied verbatim (no decode/re-encode). Returns the written paths.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = [Path(f["path"]) for f in result["files"]]
+    out_paths = [out_dir / p.name for p in paths]
+    if len(set(out_paths)) != len(out_paths):
+        raise ValueError("input files must have distinct names to be written to one directory")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(_filter_shard, paths, out_paths, result["drop"]))
+    return out_paths
+
+
+def write_report(result: dict, out_path) -> Path:
+    """Write the duplicate report (everything but the drop sets) as JSON."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    report = {k: v for k, v in result.items() if k != "drop"}
+    with open(out_path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    return out_path
+
+
+def find_inktree_files(directory) -> list:
+    """All InkTree files below a directory, sorted by path."""
+    return sorted(Path(directory).rglob(f"*{INKTREE_SUFFIX}"))
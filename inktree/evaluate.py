@@ -0,0 +1,154 @@
+"""
+CROHME-style evaluation of predicted against reference relation graphs.
+
+Both graphs are reduced to Symbol Layout Trees (ink/slt.py). Symbols are
+identified by the set of their strokes (coordinates quantised to
+`quantum`), so predictions may segment and order symbols freely; edges are
+identified by (parent strokes, child strokes, relation). Every comparison is
+a set intersection over these keys.
+
+Metrics (micro-averaged over all samples):
+
+  expression_rate  – fraction of samples whose symbols, labels and
+                     relations all match
+  structure_rate   – as above but ignoring symbol labels
+  symbol_seg_*     – precision / recall / F1 of symbol segmentation
+  symbol_cls_*     – … of segmentation + label
+  relation_*       – … of labelled edges
+"""
+
+import json
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from ink.slt import symbol_layout_tree
+
+from .decode import decode_graph_sample
+from .io import iter_aligned_chunks
+
+DEFAULT_QUANTUM = 1e-3
+
+
+def slt_keys(root, quantum: float = DEFAULT_QUANTUM) -> tuple[set, set, set]:
+    """
+    Return the (segmentation, symbol, relation) key sets of a graph.
+
+    segmentation: {stroke set}
+    symbol:       {(stroke set, label)}
+    relation:     {(parent stroke set, child stroke set, relation)}
+    """
+    slt = symbol_layout_tree(root)
+    traces = [node.trace_group.traces for node in slt.objects]
+
+    # quantise all coordinates of the sample at once, then slice per stroke
+    lengths = [len(t.x) + len(t.y) for group in traces for t in group]
+    values = [v for group in traces for t in group for v in (*t.x, *t.y)]
+    quantised = np.rint(np.asarray(values, dtype=np.float64) / quantum).astype(np.int64).tolist()
+    keys, start = [], 0
+    for length in lengths:
+        keys.append(tuple(quantised[start:start + length]))
+        start += length
+
+    strokes, k = [], 0
+    for group in traces:
+        strokes.append(frozenset(keys[k:k + len(group)]))
+        k += len(group)
+    labels = slt.labels()
+    segments = set(strokes)
+    symbols = set(zip(strokes, labels))
+    relations = {(strokes[i], strokes[j], relation) for i, j, relation in slt.edges}
+    return segments, symbols, relations
+
+
+def compare_graphs(prediction, reference, quantum: float = DEFAULT_QUANTUM) -> Counter:
+    """Match counts of one prediction/reference pair (see evaluate_graphs)."""
+    counts = Counter(samples=1)
+    if prediction is None or reference is None:
+        if reference is not None:
+            ref_seg, ref_sym, ref_rel = slt_keys(reference, quantum)
+            counts.update(ref_seg=len(ref_seg), ref_sym=len(ref_sym), ref_rel=len(ref_rel))
+        return counts
+
+    pred_seg, pred_sym, pred_rel = slt_keys(prediction, quantum)
+    ref_seg, ref_sym, ref_rel = slt_keys(reference, quantum)
+    counts.update(
+        pred_seg=len(pred_seg), ref_seg=len(ref_seg), hit_seg=len(pred_seg & ref_seg),
+        pred_sym=len(pred_sym), ref_sym=len(ref_sym), hit_sym=len(pred_sym & ref_sym),
+        pred_rel=len(pred_rel), ref_rel=len(ref_rel), hit_rel=len(pred_rel & ref_rel),
+    )
+    structure = pred_seg == ref_seg and pred_rel == ref_rel
+    counts["structure_correct"] += structure
+    counts["expression_correct"] += structure and pred_sym == ref_sym
+    return counts
+
+
+def _f_scores(counts: Counter, key: str) -> dict:
+    hit, pred, ref = counts[f"hit_{key}"], counts[f"pred_{key}"], counts[f"ref_{key}"]
+    precision = hit / pred if pred else 0.0
+    recall = hit / ref if ref else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
+
+
+def summarize(counts: Counter) -> dict:
+    """Turn accumulated match counts into rates and F-scores."""
+    n = counts["samples"]
+    return {
+        "samples": n,
+        "expression_rate": counts["expression_correct"] / n if n else 0.0,
+        "structure_rate": counts["structure_correct"] / n if n else 0.0,
+        "symbol_seg": _f_scores(counts, "seg"),
+        "symbol_cls": _f_scores(counts, "sym"),
+        "relation": _f_scores(counts, "rel"),
+    }
+
+
+def evaluate_graphs(predictions, references, quantum: float = DEFAULT_QUANTUM) -> dict:
+    """
+    Evaluate aligned lists of predicted and reference graphs.
+
+    A prediction of None counts as an empty (wrong) prediction.
+    """
+    counts = Counter()
+    for prediction, reference in zip(predictions, references, strict=True):
+        counts.update(compare_graphs(prediction, reference, quantum))
+    return summarize(counts)
+
+
+def _evaluate_lines(args) -> Counter:
+    pred_lines, ref_lines, quantum = args
+    counts = Counter()
+    for pred_line, ref_line in zip(pred_lines, ref_lines):
+        prediction = decode_graph_sample(json.loads(pred_line))[0] if pred_line.strip() else None
+        reference = decode_graph_sample(json.loads(ref_line))[0]
+        counts.update(compare_graphs(prediction, reference, quantum))
+    return counts
+
+
+def evaluate_files(
+    pred_path: Path,
+    ref_path: Path,
+    workers: int = None,
+    chunk_size: int = 256,
+    quantum: float = DEFAULT_QUANTUM,
+) -> dict:
+    """
+    Evaluate an InkTree prediction file against a reference file.
+
+    Samples are aligned by line; an empty line in the prediction file is an
+    empty prediction. Chunks of `chunk_size` line pairs are decoded and
+    scored on `workers` processes (None: CPU count, 0: in this process).
+    """
+    chunks = ((preds, refs, quantum) for preds, refs in iter_aligned_chunks(pred_path, ref_path, chunk_size))
+    counts = Counter()
+    if workers == 0:
+        for chunk in chunks:
+            counts.update(_evaluate_lines(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_counts in pool.map(_evaluate_lines, chunks):
+                counts.update(chunk_counts)
+    return summarize(counts)
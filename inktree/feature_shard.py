@@ -0,0 +1,146 @@
+"""
+Stream pairwise symbol features (ink/features.py) of an InkTree file to disk.
+
+write_feature_shard() writes one directory per input file:
+
+  features.npy  (rows, F) float32, the pair_features() rows of all samples
+  labels.npy    (rows,) int8 relation index into ink.features.LABELS
+  offsets.npy   (samples + 1,) int64, rows of sample k are offsets[k]:offsets[k + 1]
+
+Samples are decoded and featurised in chunks on a process pool, and rows are
+appended to the .npy files in file order with only a few chunks in flight,
+so memory does not grow with the file size. The arrays can be opened with
+np.load(..., mmap_mode="r").
+"""
+
+import gzip
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from ink.features import FEATURE_NAMES, pair_features
+
+from .decode import decode_graph_sample
+
+# fixed width of the row count in the .npy header, so it can be patched in place
+_SHAPE_DIGITS = 20
+
+
+class _NpyStream:
+    """Append rows to a .npy file whose length is only known at the end."""
+
+    def __init__(self, path: Path, dtype, row_shape: tuple = ()):
+        self.fh = open(path, "wb")
+        self.dtype = np.dtype(dtype)
+        self.row_shape = tuple(row_shape)
+        self.rows = 0
+        self._write_header()
+
+    def _write_header(self):
+        shape = f"({self.rows:>{_SHAPE_DIGITS}d}," + "".join(f" {d}," for d in self.row_shape) + ")"
+        header = f"{{'descr': {self.dtype.str!r}, 'fortran_order': False, 'shape': {shape}, }}"
+        # magic + version + 2-byte length + header, padded to a multiple of 64 bytes
+        header += " " * (-(len(header) + 11) % 64) + "\n"
+        self.fh.write(b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1"))
+
+    def append(self, rows: np.ndarray):
+        rows = np.ascontiguousarray(rows, dtype=self.dtype)
+        self.fh.write(rows.tobytes())
+        self.rows += len(rows)
+
+    def close(self):
+        self.fh.seek(0)
+        self._write_header()
+        self.fh.close()
+
+
+def _featurize(args) -> tuple:
+    lines, normalize = args
+    features, labels, counts = [], [], []
+    for line in lines:
+        graph, _ = decode_graph_sample(json.loads(line))
+        x, y = pair_features(graph, normalize=normalize)
+        features.append(x)
+        labels.append(y)
+        counts.append(len(y))
+    if not lines:
+        return np.empty((0, len(FEATURE_NAMES)), np.float32), np.empty(0, np.int8), counts
+    return np.concatenate(features), np.concatenate(labels), counts
+
+
+def _chunks(path: Path, chunk_size: int, normalize: bool):
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines = []
+        for line in fh:
+            if not line.strip():
+                continue
+            lines.append(line)
+            if len(lines) == chunk_size:
+                yield lines, normalize
+                lines = []
+        if lines:
+            yield lines, normalize
+
+
+def _results(chunks, workers: int):
+    """_featurize() over chunks in order, with at most 2 × workers chunks in flight."""
+    if workers == 0:
+        yield from map(_featurize, chunks)
+        return
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_featurize, chunk))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_feature_shard(
+    path: Path,
+    out_dir: Path,
+    workers: int = None,
+    chunk_size: int = 256,
+    normalize: bool = True,
+) -> dict:
+    """
+    Featurise every sample of an InkTree file into a shard directory.
+
+    Parameters
+    ----------
+    path:       Input .inktree.jsonl.gz file.
+    out_dir:    Output directory (features.npy, labels.npy, offsets.npy).
+    workers:    Worker processes (None: CPU count, 0: in this process).
+    chunk_size: Samples per work item.
+    normalize:  Divide distances by the median symbol height of each sample.
+
+    Returns
+    -------
+    {"samples": ..., "rows": ...}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    chunks = _chunks(Path(path), chunk_size, normalize)
+
+    features = _NpyStream(out_dir / "features.npy", np.float32, (len(FEATURE_NAMES),))
+    labels = _NpyStream(out_dir / "labels.npy", np.int8)
+    counts = []
+    try:
+        for x, y, c in _results(chunks, workers):
+            features.append(x)
+            labels.append(y)
+            counts.extend(c)
+    finally:
+        features.close()
+        labels.close()
+
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    np.save(out_dir / "offsets.npy", offsets)
+    return {"samples": len(counts), "rows": int(offsets[-1])}
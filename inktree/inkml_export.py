@@ -0,0 +1,225 @@
+"""
+Export relation graphs / InkTree files to CROHME-style InkML.
+
+Each sample becomes one <ink> document with
+
+  - the LaTeX ground truth (<annotation type="truth">$...$</annotation>),
+  - the MathML of the graph in an <annotationXML> block (ink/mathml.py),
+  - one <trace> per stroke ("x y[ t], ..." with exact float repr),
+  - a "Segmentation" <traceGroup> with one nested <traceGroup> per symbol
+    (label, <traceView>s, <annotationXML href> pointing at the MathML xml:id).
+
+Documents are rendered as text without ElementTree and parse back through
+InkmlProcessor (load_inkml_file(..., scale=False, interpolate=False)) into
+an equivalent graph. Graphs with undefined relations (AnyRelationNode) are
+written without MathML, which InkmlProcessor reads back as an undefined
+graph over the same symbols; noise symbols of a NoisyNode keep their
+traceGroup but are not referenced from the MathML.
+"""
+
+import gzip
+import io
+import json
+import tarfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+from ink.mathml import write_annotation_xml
+from ink.nodes.placeholder_node import PlaceholderNode
+
+from .decode import decode_graph_sample
+from .io import INKTREE_SUFFIX
+
+INKML_NAMESPACE = "http://www.w3.org/2003/InkML"
+
+
+def _symbol_nodes(root) -> list:
+    """Nodes owning a trace group, in document order."""
+    nodes, stack = [], [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if node.trace_group is not None and not isinstance(node, PlaceholderNode):
+            nodes.append(node)
+        stack.extend(c for c in reversed(node.children) if c is not None)
+    return nodes
+
+
+def _xml_ids(nodes: list) -> dict:
+    """node → xml:id, keeping existing MathML ids and numbering the rest per label."""
+    ids, used, counts = {}, set(), {}
+    for node in nodes:
+        existing = node.trace_group.math_annotation
+        if existing is not None and existing not in used:
+            ids[node] = existing
+            used.add(existing)
+    for node in nodes:
+        if node in ids:
+            continue
+        label = str(node.trace_group.label)
+        while True:
+            counts[label] = counts.get(label, 0) + 1
+            candidate = f"{label}_{counts[label]}"
+            if candidate not in used:
+                break
+        ids[node] = candidate
+        used.add(candidate)
+    return ids
+
+
+def _trace_text(trace) -> str:
+    if trace.t is not None and len(trace.t) == len(trace.x):
+        return ", ".join(f"{x!r} {y!r} {t!r}" for x, y, t in zip(trace.x, trace.y, trace.t))
+    return ", ".join(f"{x!r} {y!r}" for x, y in zip(trace.x, trace.y))
+
+
+def write_inkml(graph, out, label: str = None, ui: str = None, flat_rows: bool = False):
+    """
+    Write one graph as an InkML document to a text stream.
+
+    Parameters
+    ----------
+    graph:     Root RelationNode.
+    out:       Text file or buffer.
+    label:     LaTeX ground truth; defaults to graph.latex().
+    ui:        Optional sample name (<annotation type="UI">).
+    flat_rows: Write MathML rows flat instead of right-nested (see ink/mathml.py).
+    """
+    nodes = _symbol_nodes(graph)
+    ids = _xml_ids(nodes)
+    if label is None:
+        label = graph.latex() if graph is not None else ""
+    traces = [trace for node in nodes for trace in node.trace_group.traces]
+    with_time = any(t.t is not None for t in traces)
+
+    out.write(f'<ink xmlns="{INKML_NAMESPACE}">\n')
+    out.write('<traceFormat><channel name="X" type="decimal"/><channel name="Y" type="decimal"/>')
+    if with_time:
+        out.write('<channel name="T" type="decimal"/>')
+    out.write("</traceFormat>\n")
+    out.write(f'<annotation type="truth">{escape("$" + label + "$" if label else "")}</annotation>\n')
+    if ui is not None:
+        out.write(f'<annotation type="UI">{escape(ui)}</annotation>\n')
+    if graph is not None and not graph.contains_undefined_relations():
+        write_annotation_xml(graph, out, flat_rows=flat_rows, ids=ids)
+        out.write("\n")
+
+    parts = []
+    for i, trace in enumerate(traces):
+        parts.append(f'<trace id="{i}">{_trace_text(trace)}</trace>\n')
+
+    # traceGroup ids continue after the trace ids, as in CROHME files
+    group_id = len(traces)
+    parts.append(f'<traceGroup xml:id="{group_id}">\n<annotation type="truth">Segmentation</annotation>\n')
+    trace_index = 0
+    for node in nodes:
+        tg = node.trace_group
+        group_id += 1
+        parts.append(f'<traceGroup xml:id="{group_id}">'
+                     f'<annotation type="truth">{escape(str(tg.label))}</annotation>')
+        for _ in tg.traces:
+            parts.append(f'<traceView traceDataRef="{trace_index}"/>')
+            trace_index += 1
+        parts.append(f"<annotationXML href={quoteattr(str(ids[node]))}/></traceGroup>\n")
+    parts.append("</traceGroup>\n</ink>\n")
+    out.write("".join(parts))
+
+
+def inkml_string(graph, label: str = None, ui: str = None, flat_rows: bool = False) -> str:
+    """write_inkml() into a string."""
+    buffer = io.StringIO()
+    write_inkml(graph, buffer, label=label, ui=ui, flat_rows=flat_rows)
+    return buffer.getvalue()
+
+
+# ── batch export ───────────────────────────────────────────────────────────────
+
+def _render_chunk(args) -> list:
+    """Decode and render (name, document) pairs; write them if out_dir is set."""
+    lines, names, out_dir, flat_rows = args
+    result = []
+    for line, name in zip(lines, names):
+        graph, label = decode_graph_sample(json.loads(line))
+        document = inkml_string(graph, label=label or None, ui=name, flat_rows=flat_rows)
+        if out_dir is not None:
+            with open(Path(out_dir) / f"{name}.inkml", "w", encoding="utf-8") as fh:
+                fh.write(document)
+            result.append(name)
+        else:
+            result.append((name, document))
+    return result
+
+
+def _chunks(path: Path, out_dir, chunk_size: int, flat_rows: bool):
+    stem = path.name.removesuffix(INKTREE_SUFFIX)
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        lines, names, index = [], [], 0
+        for line in fh:
+            if not line.strip():
+                continue
+            lines.append(line)
+            names.append(f"{stem}_{index:06d}")
+            index += 1
+            if len(lines) == chunk_size:
+                yield lines, names, out_dir, flat_rows
+                lines, names = [], []
+        if lines:
+            yield lines, names, out_dir, flat_rows
+
+
+def export_inkml(
+    path: Path,
+    out: Path,
+    archive: bool = False,
+    workers: int = None,
+    chunk_size: int = 256,
+    flat_rows: bool = False,
+) -> int:
+    """
+    Export every sample of an InkTree file to InkML.
+
+    Parameters
+    ----------
+    path:       Input .inktree.jsonl.gz file.
+    out:        Output directory (one <stem>_<index>.inkml per sample) or, with
+                archive=True, a .tar / .tar.gz file holding the same members.
+    archive:    Write a single tar archive instead of individual files.
+    workers:    Worker processes (None: CPU count, 0: in this process).
+    chunk_size: Samples per work item.
+    flat_rows:  Write MathML rows flat instead of right-nested.
+
+    Returns
+    -------
+    The number of exported samples.
+    """
+    path, out = Path(path), Path(out)
+    if archive:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        chunks = _chunks(path, None, chunk_size, flat_rows)
+    else:
+        out.mkdir(parents=True, exist_ok=True)
+        chunks = _chunks(path, str(out), chunk_size, flat_rows)
+
+    def results():
+        if workers == 0:
+            yield from map(_render_chunk, chunks)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from pool.map(_render_chunk, chunks)
+
+    count = 0
+    if not archive:
+        for chunk in results():
+            count += len(chunk)
+        return count
+
+    mode = "w:gz" if out.name.endswith(".gz") else "w"
+    with tarfile.open(out, mode) as tar:
+        for chunk in results():
+            for name, document in chunk:
+                data = document.encode("utf-8")
+                info = tarfile.TarInfo(f"{name}.inkml")
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+                count += 1
+    return count
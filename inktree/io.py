@@ -7,8 +7,11 @@ Each line is a full InkTree sample (version + label + node tree).
 
 import gzip
 import json
+import os
+import secrets
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 from ink.nodes.relation_node import RelationNode
 
@@ -51,6 +54,53 @@ def save_inktree(
     return out_path
 
 
+def write_inktree(samples: Iterable[Tuple[RelationNode, str]], out_path: Path) -> int:
+    """
+    Stream (graph, label) samples into an InkTree file without holding them
+    all in memory. The file is written under a temporary name unique to the
+    call and renamed at the end, so an interrupted write never leaves a
+    truncated file behind, and concurrent writers of the same file (e.g.
+    several training processes) do not clobber each other's output.
+
+    Returns the number of samples written.
+    """
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}-{secrets.token_hex(4)}.tmp")
+    count = 0
+    try:
+        with gzip.open(tmp_path, "xt", encoding="utf-8") as fh:
+            for graph, label in samples:
+                fh.write(json.dumps(encode_graph_sample(graph, label=label), separators=(",", ":")))
+                fh.write("\n")
+                count += 1
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_path, out_path)
+    return count
+
+
+def is_blank_line(line: bytes) -> bool:
+    """
+    Whether a raw line of an InkTree file holds no sample: whitespace only,
+    as str.strip() sees it when the file is read as text.
+    """
+    head = line.lstrip()[:1]
+    if b"!" <= head <= b"~":  # printable ASCII, usually the "{" of a sample
+        return False
+    return not line.decode("utf-8").strip()
+
+
+def iter_inktree(path: Path) -> Iterator[Tuple[RelationNode, str]]:
+    """Stream the (root_node, label) samples of an InkTree file."""
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield decode_graph_sample(json.loads(line))
+
+
 def load_inktree(path: Path) -> List[Tuple[RelationNode, str]]:
     """
     Load an InkTree JSONL.gz file.
@@ -75,3 +125,27 @@ def load_inktree(path: Path) -> List[Tuple[RelationNode, str]]:
 def load_inktree_graphs(path: Path) -> List[RelationNode]:
     """Convenience wrapper: load only the RelationNode graphs (discard labels)."""
     return [g for g, _ in load_inktree(path)]
+
+
+def iter_aligned_chunks(pred_path: Path, ref_path: Path, chunk_size: int = 256) -> Iterator[Tuple[list, list]]:
+    """
+    Stream two line-aligned InkTree files as (prediction lines, reference lines) chunks.
+
+    The reference file defines the samples (blank lines are skipped); a blank
+    line in the prediction file stands for a missing prediction and is kept.
+    Raises ValueError if the files have a different number of samples.
+    """
+    with gzip.open(pred_path, "rt", encoding="utf-8") as pred_fh, \
+            gzip.open(ref_path, "rt", encoding="utf-8") as ref_fh:
+        ref_lines = (line for line in ref_fh if line.strip())
+        pred_lines = (line.rstrip("\n") for line in pred_fh)
+        while True:
+            refs = list(islice(ref_lines, chunk_size))
+            if not refs:
+                if next(pred_lines, "").strip():
+                    raise ValueError(f"{pred_path} has more samples than {ref_path}")
+                return
+            preds = list(islice(pred_lines, len(refs)))
+            if len(preds) != len(refs):
+                raise ValueError(f"{pred_path} has fewer samples than {ref_path}")
+            yield preds, refs
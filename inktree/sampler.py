@@ -0,0 +1,186 @@
+"""
+Length-bucketed batch sampling over InkTree files.
+
+Sample sizes range from single Detexify symbols to multi-line MathWriting+
+formulas, so random batches are mostly padding. BucketBatchSampler groups
+samples of similar length and sizes every batch to a budget of padded points
+(or symbols):
+
+  lengths = sample_lengths("data/inktree/")          # (N, 2) points, symbols
+  sampler = BucketBatchSampler(lengths[:, 0], max_tokens=20000, seed=0)
+  for batch in sampler: ...                          # lists of sample indices
+
+The lengths come from a sidecar next to every InkTree file,
+<file>.lengths.npy: (samples, 2) int64 points / symbols per sample, counted
+from the raw dicts (no graph decoding) the first time and rebuilt when the
+InkTree file is newer. If the sidecar cannot be written (read-only or
+shared data/), the lengths are kept in memory for the process. Indices follow the InkTreeMapDataset numbering of
+the same paths, and the sampler can be passed to DataLoader(batch_sampler=).
+"""
+
+import gzip
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .collate import _dict_groups
+from .dataset import resolve_paths
+from .io import is_blank_line
+
+LENGTHS_SUFFIX = ".lengths.npy"
+
+# InkTree path → (file mtime, lengths) of files whose sidecar could not be written
+_unsaved: dict = {}
+
+
+def _count(sample: dict) -> tuple[int, int]:
+    """(points, symbols) of a raw InkTree sample, symbols as in collate_batch()."""
+    groups = _dict_groups(sample.get("node"), [])
+    return sum(len(s["x"]) for strokes in groups for s in strokes), len(groups)
+
+
+def _sidecar(path: Path) -> Path:
+    return path.with_name(path.name + LENGTHS_SUFFIX)
+
+
+def file_lengths(path, refresh: bool = False) -> np.ndarray:
+    """(samples, 2) int64 point / symbol counts of one InkTree file, from its sidecar."""
+    path = Path(path)
+    sidecar = _sidecar(path)
+    mtime_ns = path.stat().st_mtime_ns
+    if not refresh:
+        if sidecar.exists() and sidecar.stat().st_mtime_ns >= mtime_ns:
+            return np.load(sidecar)
+        unsaved = _unsaved.get(str(path))
+        if unsaved is not None and unsaved[0] == mtime_ns:
+            return unsaved[1]
+
+    with gzip.open(path, "rb") as fh:
+        counts = [_count(json.loads(line)) for line in fh if not is_blank_line(line)]
+    lengths = np.array(counts, dtype=np.int64).reshape(-1, 2)
+    tmp = sidecar.with_name(sidecar.name + ".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            np.save(f, lengths)
+        os.replace(tmp, sidecar)
+    except OSError:
+        # read-only or shared data/: keep the lengths in memory only
+        _unsaved[str(path)] = (mtime_ns, lengths)
+    return lengths
+
+
+def sample_lengths(paths, refresh: bool = False) -> np.ndarray:
+    """
+    (N, 2) int64 point / symbol counts of every sample of an InkTree file,
+    directory or list of files, in InkTreeMapDataset order.
+    """
+    parts = [file_lengths(p, refresh=refresh) for p in resolve_paths(paths)]
+    return np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int64)
+
+
+class BucketBatchSampler:
+    """
+    Batches of sample indices with similar lengths under a padded-size budget.
+
+    Samples are put into geometric length buckets ([1, g), [g, g²), ...).
+    In a bucket every batch holds max_tokens // (longest sample of the
+    bucket) samples, so batch size × padded length stays within max_tokens;
+    a sample longer than max_tokens gets a batch of its own. Every epoch the
+    samples of each bucket and then the batches of all buckets are shuffled
+    with a generator seeded by (seed, epoch), so all ranks draw the same
+    batches; rank r then takes every world_size-th batch.
+
+    Parameters
+    ----------
+    lengths:        (N,) cost of every sample, e.g. sample_lengths(paths)[:, 0].
+    max_tokens:     Budget of batch size × longest sample per batch.
+    max_batch_size: Upper bound on samples per batch.
+    bucket_growth:  Ratio g between bucket boundaries.
+    shuffle:        Shuffle within buckets and the batch order; False keeps
+                    buckets in length order and samples in index order.
+    seed:           Seed of the shuffle, combined with the epoch.
+    rank,
+    world_size:     Distributed shard of this process.
+    drop_last:      Drop the batches left over when their number does not
+                    divide by world_size; default is to repeat batches from
+                    the start so every rank gets the same number.
+    """
+
+    def __init__(self, lengths, max_tokens: int, max_batch_size: int = None, bucket_growth: float = 1.25,
+                 shuffle: bool = True, seed: int = 0, rank: int = 0, world_size: int = 1,
+                 drop_last: bool = False):
+        if bucket_growth <= 1:
+            raise ValueError(f"bucket_growth must be > 1, got {bucket_growth}")
+        if not 0 <= rank < world_size:
+            raise ValueError(f"rank {rank} out of range for world_size {world_size}")
+        self.lengths = np.asarray(lengths, dtype=np.int64)
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.rank = rank
+        self.world_size = world_size
+        self.drop_last = drop_last
+        self.epoch = 0
+
+        bucket = np.floor(np.log(np.maximum(self.lengths, 1)) / np.log(bucket_growth)).astype(np.int64)
+        # samples grouped by bucket (shortest first), index order within a bucket
+        self._order = np.argsort(bucket, kind="stable")
+        edges = np.flatnonzero(np.diff(bucket[self._order])) + 1
+        self._buckets = np.split(np.arange(len(self._order)), edges)
+        self._batch_sizes = []
+        for members in self._buckets:
+            longest = int(self.lengths[self._order[members]].max(initial=1))
+            size = max(1, max_tokens // max(longest, 1))
+            if max_batch_size is not None:
+                size = min(size, max_batch_size)
+            self._batch_sizes.append(size)
+
+    @classmethod
+    def from_paths(cls, paths, max_tokens: int, by: str = "points", **kwargs) -> "BucketBatchSampler":
+        """Sampler over InkTree files, costed by "points" or "symbols" per sample."""
+        column = {"points": 0, "symbols": 1}.get(by)
+        if column is None:
+            raise ValueError(f"by must be 'points' or 'symbols', got {by!r}")
+        return cls(sample_lengths(paths)[:, column], max_tokens, **kwargs)
+
+    def set_epoch(self, epoch: int):
+        """Reshuffle for an epoch (call before iterating, the same on every rank)."""
+        self.epoch = epoch
+
+    def _all_batches(self) -> list[np.ndarray]:
+        rng = np.random.default_rng((self.seed, self.epoch))
+        batches = []
+        for members, size in zip(self._buckets, self._batch_sizes):
+            indices = self._order[members]
+            if self.shuffle:
+                indices = rng.permutation(indices)
+            batches.extend(np.split(indices, range(size, len(indices), size)))
+        if self.shuffle:
+            batches = [batches[i] for i in rng.permutation(len(batches))]
+        return batches
+
+    def _num_batches(self) -> int:
+        total = sum(-(-len(m) // s) for m, s in zip(self._buckets, self._batch_sizes))
+        if self.drop_last:
+            return total // self.world_size
+        return -(-total // self.world_size)
+
+    def __len__(self):
+        return self._num_batches()
+
+    def __iter__(self):
+        batches = self._all_batches()
+        n = self._num_batches()
+        if batches and len(batches) < n * self.world_size:
+            batches = [batches[i % len(batches)] for i in range(n * self.world_size)]
+        for batch in batches[self.rank:n * self.world_size:self.world_size]:
+            yield batch.tolist()
+
+    def padding_ratio(self) -> float:
+        """Real / padded points over this epoch's batches of all ranks (1.0: no padding)."""
+        batches = self._all_batches()
+        padded = sum(len(b) * int(self.lengths[b].max(initial=0)) for b in batches)
+        return float(self.lengths.sum()) / padded if padded else 1.0
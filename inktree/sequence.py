@@ -0,0 +1,96 @@
+"""
+Lazy, read-only sequence view of an InkTree file.
+
+InkTreeSequence gives len(), indexing and iteration over the (graph, label)
+samples of a .inktree.jsonl.gz file without decoding it up front:
+
+  - iteration streams the file and decodes one sample at a time;
+  - len() and indexing decompress the file once into a single bytes buffer
+    with a NumPy array of line offsets, and decode a sample per access.
+
+A single buffer and an offsets array (instead of a list of per-sample
+objects) keep the loaded file in a few large objects, so processes forked
+after loading share its pages instead of copying them.
+"""
+
+import gzip
+import json
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+from .decode import decode_graph_sample
+from .io import is_blank_line, iter_inktree
+
+
+class InkTreeSequence(Sequence):
+    """Samples of an InkTree file as a lazy sequence of (root_node, label)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data = None      # decompressed file
+        self._bounds = None    # (samples, 2) int64 start / end of each non-blank line
+
+    def __repr__(self):
+        size = f"{len(self)} samples" if self.loaded else "not loaded"
+        return f"InkTreeSequence({str(self.path)!r}, {size})"
+
+    def __getstate__(self):
+        # pickled (e.g. to spawned worker processes) without the loaded data
+        return {"path": self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state["path"])
+
+    @property
+    def loaded(self) -> bool:
+        return self._bounds is not None
+
+    def load(self) -> "InkTreeSequence":
+        """Decompress the file now, e.g. before forking workers that should share it."""
+        self._load()
+        return self
+
+    def _load(self):
+        if self._bounds is not None:
+            return
+        with gzip.open(self.path, "rb") as fh:
+            data = fh.read()
+        raw = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(raw == ord("\n"))
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(data)]))
+        keep = ends > starts
+        # a line starting with printable ASCII (the "{" of a sample) is kept;
+        # the others may be whitespace only and are checked one by one
+        first = raw[starts[keep]]
+        for i in np.flatnonzero(keep)[(first < ord("!")) | (first > ord("~"))]:
+            keep[i] = not is_blank_line(data[starts[i]:ends[i]])
+        self._data = data
+        self._bounds = np.stack((starts[keep], ends[keep]), axis=1)
+
+    def __len__(self):
+        self._load()
+        return len(self._bounds)
+
+    def raw(self, index: int) -> dict:
+        """The InkTree sample dict at index, without decoding it into nodes."""
+        self._load()
+        start, end = self._bounds[index]
+        return json.loads(self._data[start:end])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if not -n <= index < n:
+            raise IndexError(f"index {index} out of range for {n} samples")
+        return decode_graph_sample(self.raw(index))
+
+    def __iter__(self):
+        if not self.loaded:
+            yield from iter_inktree(self.path)
+            return
+        for i in range(len(self._bounds)):
+            yield decode_graph_sample(self.raw(i))
@@ -0,0 +1,221 @@
+"""
+Ordered tree edit distance (Zhang–Shasha) between relation graphs.
+
+Trees are flattened once into post-order arrays (labels, leftmost leaf
+descendants, keyroots), either from a RelationNode graph or directly from an
+InkTree node dict, so batch scoring over files never builds node objects.
+
+A node label is (InkTree type, symbol label), e.g. ("sym", "x") or
+("frac", None); only symbols carry a label. Edit costs are numbers or
+callables on labels:
+
+  insert(label) / delete(label)  cost of inserting / deleting one node
+  relabel(a, b)                  cost of turning label a into b (0 if equal)
+
+Callables passed to the batch functions must be picklable (module-level
+functions), since pairs are scored on a process pool.
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from ink.nodes.symbol_node import SymbolNode, label_aliases
+
+from .io import iter_aligned_chunks
+from .schema import NODE_TYPE_TO_SHORT
+
+# InkTree child keys per node type, in RelationNode.children order
+_CHILD_KEYS = {
+    "frac": ("numer", "denom"),
+    "sub": ("base", "sub"),
+    "sup": ("base", "sup"),
+    "subsup": ("base", "sub", "sup"),
+    "sqrt": ("inner",),
+    "root": ("inner", "index"),
+    "under": ("base", "under"),
+    "underover": ("base", "under", "over"),
+}
+
+
+class PostOrderTree:
+    """
+    Post-order arrays of an ordered tree.
+
+    labels:   node labels in post-order
+    leftmost: post-order index of each node's leftmost leaf descendant
+    keyroots: nodes with no ancestor sharing their leftmost leaf, ascending
+    """
+
+    __slots__ = ("labels", "leftmost", "keyroots")
+
+    def __init__(self, labels: list, leftmost: list):
+        self.labels = labels
+        self.leftmost = leftmost
+        last = {}
+        for i, l in enumerate(leftmost):
+            last[l] = i
+        self.keyroots = sorted(last.values())
+
+    def __len__(self):
+        return len(self.labels)
+
+    @classmethod
+    def _build(cls, root, children_of, label_of) -> "PostOrderTree":
+        labels, leftmost = [], []
+        if root is None:
+            return cls(labels, leftmost)
+        # (node, children, next child, leftmost leaf of the node so far)
+        stack = [(root, children_of(root), 0, None)]
+        while stack:
+            node, children, k, first = stack.pop()
+            if k < len(children):
+                stack.append((node, children, k + 1, first))
+                stack.append((children[k], children_of(children[k]), 0, None))
+                continue
+            index = len(labels)
+            labels.append(label_of(node))
+            leftmost.append(index if first is None else first)
+            if stack:
+                parent, siblings, j, parent_first = stack.pop()
+                # the first finished child fixes the parent's leftmost leaf
+                stack.append((parent, siblings, j, leftmost[index] if parent_first is None else parent_first))
+        return cls(labels, leftmost)
+
+    @classmethod
+    def from_graph(cls, root) -> "PostOrderTree":
+        """Flatten a RelationNode graph (None children are skipped)."""
+        def label_of(node):
+            short = NODE_TYPE_TO_SHORT.get(type(node).__name__, "any")
+            return short, node.trace_group.label if isinstance(node, SymbolNode) else None
+        return cls._build(root, lambda n: [c for c in n.children if c is not None], label_of)
+
+    @classmethod
+    def from_dict(cls, node: dict) -> "PostOrderTree":
+        """Flatten an InkTree node dict (the "node" field of a sample)."""
+        def children_of(d):
+            keys = _CHILD_KEYS.get(d.get("type"))
+            if keys is None:
+                return [c for c in d.get("children", ()) if c is not None]
+            return [d[k] for k in keys if d.get(k) is not None]
+
+        def label_of(d):
+            node_type = d.get("type", "any")
+            if node_type != "sym":
+                return node_type, None
+            label = d.get("label", "")
+            return node_type, label_aliases.get(label, label)
+        return cls._build(node, children_of, label_of)
+
+
+def _cost_table(labels: list, cost) -> list:
+    return [cost(label) for label in labels] if callable(cost) else [float(cost)] * len(labels)
+
+
+def tree_edit_distance(a, b, insert=1.0, delete=1.0, relabel=1.0) -> float:
+    """
+    Zhang–Shasha edit distance turning tree a into tree b.
+
+    a, b: RelationNode graphs, InkTree node dicts or PostOrderTree objects.
+    Runs in O(|a|·|b|·min(depth, leaves)²) time and O(|a|·|b|) memory.
+    """
+    a, b = as_post_order(a), as_post_order(b)
+    la, lb = a.labels, b.labels
+    n, m = len(la), len(lb)
+    del_cost = _cost_table(la, delete)
+    ins_cost = _cost_table(lb, insert)
+    if n == 0 or m == 0:
+        return sum(del_cost) + sum(ins_cost)
+
+    if la == lb and a.leftmost == b.leftmost:
+        return 0.0  # identical trees (correct predictions) need no DP
+
+    if callable(relabel):
+        ren = [[relabel(x, y) if x != y else 0.0 for y in lb] for x in la]
+    else:
+        cost = float(relabel)
+        ren = [[0.0 if x == y else cost for y in lb] for x in la]
+
+    lla, llb = a.leftmost, b.leftmost
+    td = [[0.0] * m for _ in range(n)]
+
+    for i in a.keyroots:
+        li = lla[i]
+        rows = i - li + 2
+        for j in b.keyroots:
+            lj = llb[j]
+            cols = j - lj + 2
+            fd = [[0.0] * cols for _ in range(rows)]
+            for x in range(1, rows):
+                fd[x][0] = fd[x - 1][0] + del_cost[li + x - 1]
+            first = fd[0]
+            for y in range(1, cols):
+                first[y] = first[y - 1] + ins_cost[lj + y - 1]
+            for x in range(1, rows):
+                ai = li + x - 1
+                prev, row = fd[x - 1], fd[x]
+                d_cost, ren_a, td_a = del_cost[ai], ren[ai], td[ai]
+                whole_a = lla[ai] == li
+                fd_p = fd[lla[ai] - li]
+                for y in range(1, cols):
+                    bj = lj + y - 1
+                    best = prev[y] + d_cost
+                    cand = row[y - 1] + ins_cost[bj]
+                    if cand < best:
+                        best = cand
+                    if whole_a and llb[bj] == lj:
+                        cand = prev[y - 1] + ren_a[bj]
+                        if cand < best:
+                            best = cand
+                        td_a[bj] = best
+                    else:
+                        cand = fd_p[llb[bj] - lj] + td_a[bj]
+                        if cand < best:
+                            best = cand
+                    row[y] = best
+    return td[n - 1][m - 1]
+
+
+def as_post_order(tree) -> PostOrderTree:
+    """Return tree as a PostOrderTree (graphs and dicts are flattened)."""
+    if isinstance(tree, PostOrderTree):
+        return tree
+    if tree is None or isinstance(tree, dict):
+        return PostOrderTree.from_dict(tree)
+    return PostOrderTree.from_graph(tree)
+
+
+# ── batch ──────────────────────────────────────────────────────────────────────
+
+def _distances(args) -> list:
+    pred_lines, ref_lines, insert, delete, relabel = args
+    result = []
+    for pred_line, ref_line in zip(pred_lines, ref_lines):
+        prediction = json.loads(pred_line).get("node") if pred_line.strip() else None
+        reference = json.loads(ref_line).get("node")
+        result.append(tree_edit_distance(prediction, reference, insert, delete, relabel))
+    return result
+
+
+def tree_edit_distances(
+    pred_path: Path,
+    ref_path: Path,
+    insert=1.0,
+    delete=1.0,
+    relabel=1.0,
+    workers: int = None,
+    chunk_size: int = 256,
+) -> list[float]:
+    """
+    Edit distance of every sample in an InkTree prediction file to the
+    line-aligned sample of a reference file (empty prediction line: empty tree).
+
+    Chunks are scored on `workers` processes (None: CPU count, 0: in this
+    process); the result is in file order.
+    """
+    chunks = ((preds, refs, insert, delete, relabel)
+              for preds, refs in iter_aligned_chunks(pred_path, ref_path, chunk_size))
+    if workers == 0:
+        return [d for chunk in chunks for d in _distances(chunk)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [d for chunk_result in pool.map(_distances, chunks) for d in chunk_result]
@@ -0,0 +1,121 @@
+"""
+Benchmark the DeepWriting .npz segmentation: the vectorized
+datasets.deepwriting_loader._sample_to_row() against the previous per-point
+Python loop, which is kept here as the reference.
+
+Both are run on every sample of the file and the resulting RowNodes are
+checked to be identical (labels, trace ids and coordinates).
+
+Usage (from project root):
+    python scripts/benchmark_deepwriting.py [--split validation] [--repeat 3]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from datasets.deepwriting_loader import DATA_DIR, _sample_to_row
+from ink.nodes.row_node import RowNode
+from ink.nodes.symbol_node import SymbolNode
+from ink.traces.trace import Trace
+from ink.traces.trace_group import TraceGroup
+
+
+def sample_to_row_loop(stroke_data, char_lab, alphabet) -> RowNode | None:
+    """The per-point loop the loader used before vectorization."""
+    if len(stroke_data) == 0:
+        return None
+
+    dx = stroke_data[:, 0].astype(float)
+    dy = stroke_data[:, 1].astype(float)
+    x = np.cumsum(dx)
+    y = np.cumsum(dy)
+    pen_up = stroke_data[:, 2]
+
+    stroke_segs = []
+    seg_x, seg_y, seg_c = [], [], []
+    for i in range(len(x)):
+        seg_x.append(float(x[i]))
+        seg_y.append(float(y[i]))
+        seg_c.append(int(char_lab[i]))
+        if pen_up[i] == 1 or i == len(x) - 1:
+            if seg_x:
+                stroke_segs.append((seg_x, seg_y, seg_c))
+            seg_x, seg_y, seg_c = [], [], []
+
+    char_runs = []
+    for sx, sy, sc in stroke_segs:
+        if not sc:
+            continue
+        majority = Counter(sc).most_common(1)[0][0]
+        if char_runs and char_runs[-1][0] == majority:
+            char_runs[-1][1].append((sx, sy))
+        else:
+            char_runs.append((majority, [(sx, sy)]))
+
+    if not char_runs:
+        return None
+
+    symbols = []
+    trace_id = 0
+    for char_idx, strk_list in char_runs:
+        char_label = alphabet[char_idx] if char_idx < len(alphabet) else ''
+        traces = []
+        for sx, sy in strk_list:
+            traces.append(Trace(sx, sy, inkml_id=trace_id))
+            trace_id += 1
+        if traces:
+            tg = TraceGroup(traces=traces, label=char_label)
+            symbols.append(SymbolNode(trace_group=tg))
+    return RowNode(children=symbols) if symbols else None
+
+
+def _signature(row):
+    if row is None:
+        return None
+    return [(sym.trace_group.label, [(t.inkml_id, list(t.x), list(t.y)) for t in sym.trace_group.traces])
+            for sym in row.children]
+
+
+def _time(fn, samples, alphabet, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = [fn(stroke_data, char_lab, alphabet) for stroke_data, char_lab in samples]
+        best = min(best, time.perf_counter() - start)
+    return rows, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DeepWriting .npz segmentation")
+    parser.add_argument("--split", default="validation", help="training or validation (default: validation)")
+    parser.add_argument("--npz", type=Path, help="Explicit .npz file (overrides --split)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions, best is reported")
+    args = parser.parse_args()
+
+    path = args.npz or DATA_DIR / f"deepwriting_{args.split}.npz"
+    d = np.load(str(path), allow_pickle=True)
+    samples = list(zip(d['strokes'], d['char_labels']))
+    alphabet = list(d['alphabet'])
+    n_points = sum(len(s) for s, _ in samples)
+    print(f"{path.name}: {len(samples)} samples, {n_points} points")
+
+    loop_rows, loop_time = _time(sample_to_row_loop, samples, alphabet, args.repeat)
+    vec_rows, vec_time = _time(_sample_to_row, samples, alphabet, args.repeat)
+
+    mismatches = sum(_signature(a) != _signature(b) for a, b in zip(loop_rows, vec_rows))
+    print(f"  loop        {loop_time:8.3f}s  ({loop_time / max(len(samples), 1) * 1e3:.3f} ms/sample)")
+    print(f"  vectorized  {vec_time:8.3f}s  ({vec_time / max(len(samples), 1) * 1e3:.3f} ms/sample)")
+    print(f"  speedup     {loop_time / vec_time:8.1f}x")
+    print(f"  identical   {'yes' if mismatches == 0 else f'NO ({mismatches} samples differ)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -56,10 +56,12 @@ sys.path.insert(0, str(ROOT))
 
 from datasets.crohme import CrohmeFileManager
 from datasets.mathwriting import MathWritingFileManager
-from datasets.json_loader import load_json_dataset, get_json_files, count_json_samples
-from datasets.detexify_loader import load_detexify, count_detexify
-from datasets.unipen_loader import load_unipen, count_unipen_segments
+from datasets.json_loader import load_json_dataset
+from datasets.detexify_loader import load_detexify
+from datasets.manifest import source_manifest
+from datasets.unipen_loader import load_unipen
 from ink.graph import get_relation_graphs_from_files
+from ink.latex import latex_many
 from inktree import save_inktree, load_inktree_graphs
 
 # ── Config ──────────────────────────────────────────────────────────────────
@@ -108,13 +110,7 @@ def _save_and_load_inktree(graphs, labels, inktree_out: Path) -> tuple[float, in
 
 
 def _make_labels(graphs) -> list[str]:
-    labels = []
-    for g in graphs:
-        try:
-            labels.append(g.latex())
-        except Exception:
-            labels.append("")
-    return labels
+    return latex_many(graphs, fallback="")
 
 
 # ── InkML benchmark (CROHME / MathWriting+) ──────────────────────────────────
@@ -279,9 +275,7 @@ print("-" * 50)
 
 def _get_crohme_2023val_files():
     from datasets.crohme import InkML_path
-    val_dir = os.path.join(InkML_path, "val", "CROHME2023_val")
-    return [os.path.join(val_dir, f) for f in os.listdir(val_dir)
-            if f.endswith(".inkml")]
+    return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "val", "CROHME2023_val")])
 
 
 def _get_crohmeplus_synthetic_files():
@@ -348,9 +342,9 @@ print("-" * 50)
 # DeepWriting (JSON folder hierarchy)
 try:
     dw_root = ROOT / "data" / "Deepwriting Dataset"
-    dw_json_files = get_json_files(dw_root)
-    dw_bytes = sum(f.stat().st_size for f in dw_json_files)
-    dw_total = count_json_samples(dw_root)
+    dw_manifest = source_manifest("deepwriting")
+    dw_bytes = dw_manifest.size
+    dw_total = dw_manifest.samples
 
     def _load_deepwriting():
         return load_json_dataset(dw_root)
@@ -371,9 +365,9 @@ except Exception as e:
 # IAMonDB (JSON folder hierarchy)
 try:
     iam_root = ROOT / "data" / "Iamondb Dataset"
-    iam_json_files = get_json_files(iam_root)
-    iam_bytes = sum(f.stat().st_size for f in iam_json_files)
-    iam_total = count_json_samples(iam_root)
+    iam_manifest = source_manifest("iamondb")
+    iam_bytes = iam_manifest.size
+    iam_total = iam_manifest.samples
 
     def _load_iamondb():
         return load_json_dataset(iam_root)
@@ -395,7 +389,7 @@ except Exception as e:
 try:
     sql_path = ROOT / "data" / "detexify.sql"
     sql_bytes = sql_path.stat().st_size
-    n_detexify = count_detexify()
+    n_detexify = source_manifest("detexify").samples
 
     r = benchmark_original_dataset(
         "Detexify", ".sql",
@@ -414,7 +408,7 @@ except Exception as e:
 try:
     tgz_path = ROOT / "data" / "unipen-CDROM-train_r01_v07.tgz"
     tgz_bytes = tgz_path.stat().st_size
-    n_unipen_raw = count_unipen_segments()
+    n_unipen_raw = source_manifest("unipen").samples
 
     r = benchmark_original_dataset(
         "Unipen", ".tgz",
@@ -4,8 +4,13 @@ Convert CROHME InkML files to the InkTree format.
 Reads all 2023 test InkML files and writes a single
 data/inktree/crohme2023_test.inktree.jsonl.gz file.
 
+With --lg-dir the structure is read from CROHME label graph (.lg) files
+instead of the InkML MathML (datasets/lg_loader.py); only the traces of the
+InkML files are parsed.
+
 Usage:
     python scripts/convert_to_inktree.py [--split {2023test,2019test,2016test}]
+    python scripts/convert_to_inktree.py --lg-dir path/to/LG --inkml-dir path/to/INKML --out out.inktree.jsonl.gz
 """
 
 import argparse
@@ -17,6 +22,7 @@ from pathlib import Path
 from tqdm import tqdm
 
 from datasets.crohme import CrohmeFileManager
+from datasets.lg_loader import convert_lg_directory
 from ink.graph import load_inkml_file
 from inktree.io import save_inktree
 
@@ -53,6 +59,12 @@ def convert(split: str):
     print(f"Saved to {out_path}  ({out_path.stat().st_size / 1024:.1f} KB)")
 
 
+def convert_lg(lg_dir: Path, inkml_dir: Path, out_path: Path, workers: int):
+    print(f"Converting label graphs in {lg_dir} → {out_path}")
+    count = convert_lg_directory(lg_dir, out_path, inkml_dir=inkml_dir, workers=workers)
+    print(f"Saved {count} graphs to {out_path}  ({out_path.stat().st_size / 1024:.1f} KB)")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Convert CROHME InkML to InkTree format")
     parser.add_argument(
@@ -61,8 +73,16 @@ def main():
         default="2023test",
         help="Which dataset split to convert (default: 2023test)",
     )
+    parser.add_argument("--lg-dir", type=Path, help="Convert the .lg files of this directory instead of a split")
+    parser.add_argument("--inkml-dir", type=Path, help="Directory with the matching .inkml files (default: --lg-dir)")
+    parser.add_argument("--out", type=Path, help="Output file for --lg-dir")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --lg-dir (default: CPU count)")
     args = parser.parse_args()
-    convert(args.split)
+    if args.lg_dir is not None:
+        out_path = args.out or OUT_DIR / f"{args.lg_dir.name}.inktree.jsonl.gz"
+        convert_lg(args.lg_dir, args.inkml_dir, out_path, args.workers)
+    else:
+        convert(args.split)
 
 
 if __name__ == "__main__":
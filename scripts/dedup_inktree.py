@@ -0,0 +1,71 @@
+"""
+Find exact and near-duplicate samples across InkTree files.
+
+Files are given in priority order: when two samples are duplicates the one
+from the earlier file is kept. List evaluation splits first so that leaked
+copies are removed from the training data.
+
+Usage (from project root):
+    python scripts/dedup_inktree.py data/inktree/crohme_2023test.inktree.jsonl.gz \\
+        data/inktree/mw_train.inktree.jsonl.gz --out data/inktree_dedup
+    python scripts/dedup_inktree.py --dir data/inktree --report stats/dedup.json
+
+Outputs:
+    stats/dedup.json            (report, --report)
+    <out>/<file name>           (filtered copies, only with --out)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from inktree.dedup import find_duplicates, find_inktree_files, write_filtered, write_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact and near-duplicate detection for InkTree files")
+    parser.add_argument("files", nargs="*", type=Path, help="InkTree files in priority order")
+    parser.add_argument("--dir", type=Path, help="Use all InkTree files below this directory (sorted by path)")
+    parser.add_argument("--report", type=Path, default=ROOT / "stats" / "dedup.json", help="Report JSON path")
+    parser.add_argument("--out", type=Path, help="Write filtered copies of the files to this directory")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Near-duplicate Jaccard threshold (default: 0.8)")
+    parser.add_argument("--num-perm", type=int, default=64, help="MinHash signature length (default: 64)")
+    parser.add_argument("--bands", type=int, default=16, help="LSH bands (default: 16)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    files = list(args.files)
+    if args.dir is not None:
+        files += [p for p in find_inktree_files(args.dir) if p not in files]
+    if not files:
+        parser.error("no input files")
+
+    print(f"Scanning {len(files)} files ...")
+    result = find_duplicates(
+        files,
+        threshold=args.threshold,
+        num_perm=args.num_perm,
+        bands=args.bands,
+        workers=args.workers,
+    )
+
+    summary = result["summary"]
+    print(f"{summary['samples']} samples: {summary['exact_groups']} exact groups "
+          f"({summary['label_conflicts']} with conflicting labels), "
+          f"{summary['near_groups']} near-duplicate groups, {summary['dropped']} to drop, "
+          f"{summary['no_ink']} without ink (kept)")
+    for entry in result["cross_file"]:
+        kept, dropped = result["files"][entry["kept"]], result["files"][entry["dropped"]]
+        print(f"  {Path(dropped['path']).name} ← {Path(kept['path']).name}: {entry['count']}")
+
+    print(f"Report → {write_report(result, args.report)}")
+    if args.out is not None:
+        for path in write_filtered(result, args.out, workers=args.workers):
+            print(f"Filtered → {path}")
+
+
+if __name__ == "__main__":
+    main()
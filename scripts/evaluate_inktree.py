@@ -0,0 +1,47 @@
+"""
+Score predicted relation graphs against a reference InkTree file (CROHME style).
+
+Both files are InkTree JSONL.gz files aligned by line; an empty line in the
+prediction file counts as "no prediction" for that sample.
+
+Usage (from project root):
+    python scripts/evaluate_inktree.py predictions.inktree.jsonl.gz \\
+        data/inktree/crohme_2023test.inktree.jsonl.gz [--out stats/eval.json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from inktree.evaluate import evaluate_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CROHME-style evaluation of InkTree predictions")
+    parser.add_argument("predictions", type=Path)
+    parser.add_argument("reference", type=Path)
+    parser.add_argument("--out", type=Path, help="Write the metrics as JSON")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: none)")
+    args = parser.parse_args()
+
+    result = evaluate_files(args.predictions, args.reference, workers=args.workers)
+
+    print(f"Samples:          {result['samples']}")
+    print(f"Expression rate:  {result['expression_rate'] * 100:.2f}%")
+    print(f"Structure rate:   {result['structure_rate'] * 100:.2f}%")
+    for key, name in (("symbol_seg", "Symbol seg."), ("symbol_cls", "Symbol class."), ("relation", "Relations")):
+        f = result[key]
+        print(f"{name + ':':<17} P {f['precision'] * 100:.2f}  R {f['recall'] * 100:.2f}  F1 {f['f1'] * 100:.2f}")
+
+    if args.out is not None:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2))
+        print(f"Saved to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
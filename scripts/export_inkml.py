@@ -0,0 +1,42 @@
+"""
+Export InkTree files back to CROHME-style InkML.
+
+Writes one <stem>_<index>.inkml per sample into the output directory, or a
+single tar archive with --archive.
+
+Usage (from project root):
+    python scripts/export_inkml.py data/inktree/crohme_2023test.inktree.jsonl.gz --out data/inkml_export/
+    python scripts/export_inkml.py data/inktree/crohme_2023test.inktree.jsonl.gz --out crohme.tar.gz --archive
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from inktree.inkml_export import export_inkml
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export InkTree files to InkML")
+    parser.add_argument("files", nargs="+", type=Path, help="InkTree files")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory (or archive path with --archive)")
+    parser.add_argument("--archive", action="store_true", help="Write one .tar / .tar.gz archive at --out (single input file only)")
+    parser.add_argument("--flat-rows", action="store_true", help="Write MathML rows flat instead of right-nested")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: none)")
+    args = parser.parse_args()
+
+    if args.archive and len(args.files) > 1:
+        parser.error("--archive takes a single input file")
+
+    for path in args.files:
+        start = time.perf_counter()
+        count = export_inkml(path, args.out, archive=args.archive, workers=args.workers, flat_rows=args.flat_rows)
+        print(f"{path.name}: {count} samples → {args.out}  ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
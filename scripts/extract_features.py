@@ -0,0 +1,40 @@
+"""
+Extract pairwise symbol relation features from InkTree files.
+
+Writes one shard directory per input file (features.npy, labels.npy,
+offsets.npy; see inktree/feature_shard.py) for training relation classifiers.
+
+Usage (from project root):
+    python scripts/extract_features.py data/inktree/crohme_train.inktree.jsonl.gz --out data/features/
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from inktree.feature_shard import write_feature_shard
+from inktree.io import INKTREE_SUFFIX
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract pairwise symbol features from InkTree files")
+    parser.add_argument("files", nargs="+", type=Path, help="InkTree files")
+    parser.add_argument("--out", type=Path, required=True, help="Output directory (one shard per input file)")
+    parser.add_argument("--raw", action="store_true", help="Keep distances in ink units instead of symbol heights")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count, 0: none)")
+    args = parser.parse_args()
+
+    for path in args.files:
+        start = time.perf_counter()
+        shard = args.out / path.name.removesuffix(INKTREE_SUFFIX)
+        stats = write_feature_shard(path, shard, workers=args.workers, normalize=not args.raw)
+        print(f"{path.name}: {stats['samples']} samples, {stats['rows']} pairs → {shard}"
+              f"  ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
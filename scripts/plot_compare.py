@@ -80,9 +80,8 @@ def _jsonl_loader(jsonl_path):
 
 
 def _get_crohme_2023val_files():
-    from datasets.crohme import InkML_path
-    val_dir = os.path.join(InkML_path, "val", "CROHME2023_val")
-    return [os.path.join(val_dir, f) for f in os.listdir(val_dir) if f.endswith(".inkml")]
+    from datasets.crohme import CrohmeFileManager, InkML_path
+    return CrohmeFileManager.get_files_from_paths([os.path.join(InkML_path, "val", "CROHME2023_val")])
 
 
 DATASETS = {